@@ -0,0 +1,4 @@
+"""
+Benchmarks for the graphpy library, run from the repository root with
+``python -m benchmarks.<module>``
+"""
@@ -0,0 +1,172 @@
+"""
+Benchmark of the memory used by vertices, edges, and whole graphs
+
+Run from the repository root with ``python -m benchmarks.memory``
+"""
+
+
+from graphpy.edge import UndirectedEdge, DirectedEdge
+from graphpy.vertex import UndirectedVertex, DirectedVertex
+from graphpy.graph import UndirectedGraph, DirectedGraph
+
+import argparse
+import random
+import sys
+import types
+
+
+################################################################################
+#                                                                              #
+#                                 Measurement                                  #
+#                                                                              #
+################################################################################
+
+
+_ATOMIC_TYPES = (type, types.ModuleType, types.FunctionType,
+                 types.BuiltinFunctionType)
+
+
+def _slot_names(obj):
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            yield name
+
+
+def deep_sizeof(obj, exclude=()):
+    """ Number of bytes used by an object and everything it references, each
+        object counted once. Objects in exclude (and what only they reference)
+        are not counted """
+    seen = set(id(o) for o in exclude)
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _ATOMIC_TYPES):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        if hasattr(current, '__dict__'):
+            stack.append(current.__dict__)
+        for name in _slot_names(current):
+            if hasattr(current, name):
+                stack.append(getattr(current, name))
+    return total
+
+
+################################################################################
+#                                                                              #
+#                              Reference Layouts                               #
+#                                                                              #
+################################################################################
+
+
+class _DictLayoutVertex(object):
+    """ Vertex laid out the way vertices were before using __slots__ (an
+        instance __dict__ and an always-allocated attrs dict) """
+
+    def __init__(self, val, attrs=None):
+        self._val = val
+        self._attrs = attrs or {}
+        self._edges = set()
+
+
+class _DictLayoutUndirectedEdge(object):
+    """ Undirected edge laid out the way undirected edges were before using
+        __slots__ (an instance __dict__, an always-allocated attrs dict, and a
+        frozenset of vertices) """
+
+    def __init__(self, vertices, attrs=None):
+        self._vertices = frozenset(vertices)
+        self._attrs = attrs or {}
+        self._is_self_edge = vertices[0] == vertices[1]
+
+
+class _DictLayoutDirectedEdge(object):
+    """ Directed edge laid out the way directed edges were before using
+        __slots__ (an instance __dict__ and an always-allocated attrs dict) """
+
+    def __init__(self, vertices, attrs=None):
+        self._v_from = vertices[0]
+        self._v_to = vertices[1]
+        self._attrs = attrs or {}
+
+
+################################################################################
+#                                                                              #
+#                                  Benchmarks                                  #
+#                                                                              #
+################################################################################
+
+
+def object_footprints(num_objects, weighted):
+    """ Average bytes per vertex and per edge of each layout, not counting the
+        vertices an edge connects or the objects' vals and attr values """
+    rows = []
+    layouts = [('Undirected', UndirectedVertex, UndirectedEdge),
+               ('Undirected (dict layout)', _DictLayoutVertex,
+                _DictLayoutUndirectedEdge),
+               ('Directed', DirectedVertex, DirectedEdge),
+               ('Directed (dict layout)', _DictLayoutVertex,
+                _DictLayoutDirectedEdge)]
+    for name, vertex_cls, edge_cls in layouts:
+        vals = range(1, num_objects + 2)
+        vertices = [vertex_cls(val) for val in vals]
+        edges = [edge_cls((vertices[i], vertices[i + 1]),
+                          attrs={'weight': 1} if weighted else None)
+                 for i in xrange(num_objects)]
+        shared = vertices + vals + [1, 'weight']
+        edge_bytes = deep_sizeof(edges, exclude=shared) - sys.getsizeof(edges)
+        vertex_bytes = (deep_sizeof(vertices, exclude=vals) -
+                        sys.getsizeof(vertices))
+        rows.append((name, 1.0 * vertex_bytes / len(vertices),
+                     1.0 * edge_bytes / num_objects))
+    return rows
+
+
+def graph_footprints(num_vertices, num_edges, weighted, seed):
+    """ Average bytes per edge of whole random graphs """
+    rng = random.Random(seed)
+    rows = []
+    for graph_cls in [UndirectedGraph, DirectedGraph]:
+        g = graph_cls()
+        for v_val in xrange(num_vertices):
+            g.add_vertex(v_val)
+        while g.num_edges < num_edges:
+            v_vals = (rng.randrange(num_vertices), rng.randrange(num_vertices))
+            if not g.has_edge(v_vals):
+                g.add_edge(v_vals, attrs={'weight': 1} if weighted else None)
+        rows.append((graph_cls.__name__, 1.0 * deep_sizeof(g) / num_edges))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--vertices', type=int, default=10000)
+    parser.add_argument('--edges', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for weighted in [False, True]:
+        print "Per-object bytes (%s)" % ('weighted' if weighted
+                                         else 'unweighted')
+        for name, vertex_bytes, edge_bytes in object_footprints(args.edges,
+                                                                weighted):
+            print "    %-30s vertex: %7.1f    edge: %7.1f" % (
+                name, vertex_bytes, edge_bytes)
+
+    print "Per-edge bytes of whole graphs (%s vertices, %s edges)" % (
+        args.vertices, args.edges)
+    for weighted in [False, True]:
+        for name, edge_bytes in graph_footprints(args.vertices, args.edges,
+                                                 weighted, args.seed):
+            print "    %-30s %s: %7.1f" % (
+                name, 'weighted' if weighted else 'unweighted', edge_bytes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Micro-benchmarks comparing the priority queues in graphpy.helpers on their own
+and as the queue used by dijkstra
+
+Run from the repository root with ``python -m benchmarks.queues``
+"""
+
+
+from graphpy.generators import barabasi_albert_graph, grid_graph
+from graphpy.helpers import (PriorityQueue, HeapqPriorityQueue,
+                             PairingPriorityQueue, RadixPriorityQueue,
+                             BucketPriorityQueue)
+
+import argparse
+import functools
+import gc
+import random
+import timeit
+
+
+QUEUES = [PriorityQueue, HeapqPriorityQueue, PairingPriorityQueue,
+          RadixPriorityQueue, BucketPriorityQueue]
+
+
+################################################################################
+#                                                                              #
+#                                  Benchmarks                                  #
+#                                                                              #
+################################################################################
+
+
+def _best_time(run, repeat):
+    """ Seconds taken by the fastest of repeat calls to run """
+    times = []
+    for _ in xrange(repeat):
+        gc.collect()
+        start = timeit.default_timer()
+        run()
+        times.append(timeit.default_timer() - start)
+    return min(times)
+
+
+def _pop_all(queue):
+    while len(queue):
+        queue.pop_min()
+
+
+def build_and_pop_all(queue_cls, priorities):
+    """ Build a queue from every priority at once and pop it empty """
+    data = list(enumerate(priorities))
+    return lambda: _pop_all(queue_cls([(p, i) for i, p in data]))
+
+
+def insert_decrease_and_pop_all(queue_cls, priorities, decreases):
+    """ Insert every priority one at a time, apply decreases (pairs of an item
+        and how much to lower its priority by), and pop the queue empty """
+    def run():
+        queue = queue_cls()
+        for item, priority in enumerate(priorities):
+            queue.insert(item, priority)
+        for item, amount in decreases:
+            priority, _ = queue[item]
+            queue.decrease_key(item, max(0, priority - amount))
+        _pop_all(queue)
+    return run
+
+
+def dijkstra(queue_cls, graph, start_val):
+    """ Run dijkstra with queue_cls as its priority queue, which for
+        BucketPriorityQueue means running Dial's algorithm """
+    if queue_cls is BucketPriorityQueue:
+        return lambda: graph.dijkstra(start_val, return_distances=True,
+                                      method='dial')
+    return lambda: graph.dijkstra(start_val, return_distances=True,
+                                  priority_queue=queue_cls)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    priorities = [rng.randint(0, 10 * args.size) for _ in xrange(args.size)]
+    decreases = [(rng.randrange(args.size), rng.randint(0, 10 * args.size))
+                 for _ in xrange(args.size)]
+    g = barabasi_albert_graph(args.size, 3, weight_range=(1, 100), seed=rng)
+    side = int(args.size ** 0.5)
+    g_grid = grid_graph(side, side, directed=True, weight_range=(1, 100),
+                        seed=rng)
+
+    # every priority is within max_span of 0, the lowest possible
+    bounded = lambda queue_cls: (
+        functools.partial(BucketPriorityQueue, max_span=10 * args.size)
+        if queue_cls is BucketPriorityQueue else queue_cls)
+    benchmarks = [
+        ('build, pop all',
+         lambda queue_cls: build_and_pop_all(bounded(queue_cls), priorities)),
+        ('insert, decrease_key, pop all',
+         lambda queue_cls: insert_decrease_and_pop_all(bounded(queue_cls),
+                                                       priorities, decreases)),
+        ('dijkstra (Barabasi-Albert)',
+         lambda queue_cls: dijkstra(queue_cls, g, 0)),
+        ('dijkstra (directed grid)',
+         lambda queue_cls: dijkstra(queue_cls, g_grid, (0, 0))),
+    ]
+    print "Seconds (best of %s, %s items or vertices)" % (args.repeat,
+                                                          args.size)
+    for name, setup in benchmarks:
+        print "    %s" % name
+        for queue_cls in QUEUES:
+            print "        %-25s %10.4f" % (
+                queue_cls.__name__, _best_time(setup(queue_cls), args.repeat))
+
+
+if __name__ == '__main__':
+    main()
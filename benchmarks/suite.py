@@ -0,0 +1,351 @@
+"""
+Benchmark suite timing graph construction, search, dijkstra, connectivity, and
+vertex removal at several scales, with results saved as JSON so later runs can
+be compared against them to catch regressions
+
+Run from the repository root with ``python -m benchmarks.suite run OUTPUT`` and
+``python -m benchmarks.suite compare OLD NEW``
+"""
+
+
+from graphpy.graph import UndirectedGraph
+from graphpy.generators import barabasi_albert_graph, grid_graph
+
+import argparse
+import gc
+import itertools
+import json
+import math
+import platform
+import random
+import sys
+import time
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+################################################################################
+#                                                                              #
+#                                 Measurement                                  #
+#                                                                              #
+################################################################################
+
+
+def _can_reset_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except (IOError, OSError):
+        return False
+    return True
+
+
+def memory_source():
+    """ How peak memory is measured: 'tracemalloc' where it exists (Python
+        3.4+), otherwise 'vmhwm' (resident set size high-water mark, which
+        Linux lets us reset before each run), otherwise 'maxrss' (growth of
+        the process's peak resident set size), or None if none are available """
+    if tracemalloc is not None:
+        return 'tracemalloc'
+    if _can_reset_peak_rss():
+        return 'vmhwm'
+    if resource is not None:
+        return 'maxrss'
+    return None
+
+
+def _proc_status_bytes(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1]) * 1024
+
+
+def _peak_rss_bytes():
+    # ru_maxrss is in bytes on OS X and in kilobytes elsewhere
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+
+def time_run(run):
+    """ Seconds taken by calling run """
+    gc.collect()
+    start = timeit.default_timer()
+    run()
+    return timeit.default_timer() - start
+
+
+def peak_memory(run, source):
+    """ Peak bytes allocated while calling run, measured by source. With
+        'vmhwm' and 'maxrss' this is how far run raised the resident set size,
+        and with 'maxrss' that is 0 unless run outgrew everything before it """
+    gc.collect()
+    if source == 'tracemalloc':
+        tracemalloc.start()
+        run()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    elif source == 'vmhwm':
+        _can_reset_peak_rss()
+        rss_before = _proc_status_bytes('VmRSS')
+        run()
+        peak_bytes = _proc_status_bytes('VmHWM') - rss_before
+    elif source == 'maxrss':
+        rss_before = _peak_rss_bytes()
+        run()
+        peak_bytes = _peak_rss_bytes() - rss_before
+    else:
+        peak_bytes = None
+    return peak_bytes
+
+
+################################################################################
+#                                                                              #
+#                                    Cases                                     #
+#                                                                              #
+################################################################################
+
+
+class _Inputs(object):
+    """ A graph along with the same graph as lists and as a dict, a vertex to
+        start from, vertices to remove, and a connected half of the vertices
+        to take a subgraph of """
+
+    def __init__(self, graph, start_val, rng):
+        self.graph = graph
+        self.graph_cls = graph.__class__
+        self.start_val = start_val
+        self.vertices = [(v.val,) for v in graph.vertices]
+        if isinstance(graph, UndirectedGraph):
+            self.edges = [((e.endpoints[0].val, e.endpoints[1].val), e.attrs)
+                          for e in graph.edges]
+        else:
+            self.edges = [((e.v_from.val, e.v_to.val), e.attrs)
+                          for e in graph.edges]
+        self.graph_dict = dict((v_val, []) for (v_val,) in self.vertices)
+        for (v_val, neighbor_val), attrs in self.edges:
+            self.graph_dict[v_val].append((neighbor_val, attrs))
+        num_removals = min(100, graph.num_vertices)
+        self.removal_vals = rng.sample([v_val for (v_val,) in self.vertices],
+                                       num_removals)
+        # the first half of the vertices reached breadth first from the start,
+        # so that searching the subgraph from the start reaches all of them
+        self.subgraph_vals = set(itertools.islice(
+            (v_val for v_val, _, _ in graph.iter_bfs(start_val)),
+            graph.num_vertices // 2))
+
+
+def make_inputs(num_vertices, seed):
+    """ Inputs for undirected cases (a power-law Barabasi-Albert graph) and
+        for directed cases (a road-like grid with edges both ways), each with
+        about num_vertices vertices and random integer weights """
+    rng = random.Random(seed)
+    g = barabasi_albert_graph(num_vertices, 3, weight_range=(1, 100),
+                              seed=rng)
+    side = int(round(math.sqrt(num_vertices)))
+    g_directed = grid_graph(side, side, directed=True, weight_range=(1, 100),
+                            seed=rng)
+    return {'undirected': _Inputs(g, 0, rng),
+            'directed': _Inputs(g_directed, (0, 0), rng)}
+
+
+def _remove_vertices(inputs):
+    g = inputs.graph.clone()
+
+    def run():
+        for v_val in inputs.removal_vals:
+            g.remove_vertex(v_val)
+
+    return run
+
+
+# each case is a name, the kinds of graph it runs on, and a function of the
+# inputs that does any untimed setup and returns the function to time
+CASES = [
+    ('from_lists', ['undirected', 'directed'],
+     lambda inputs: lambda: inputs.graph_cls.from_lists(inputs.vertices,
+                                                        inputs.edges)),
+    ('from_dict', ['undirected', 'directed'],
+     lambda inputs: lambda: inputs.graph_cls.from_dict(inputs.graph_dict)),
+    ('clone', ['undirected', 'directed'],
+     lambda inputs: inputs.graph.clone),
+    ('search[breadth_first]', ['undirected', 'directed'],
+     lambda inputs: lambda: inputs.graph.search(inputs.start_val,
+                                                method='breadth_first')),
+    ('search[depth_first]', ['undirected', 'directed'],
+     lambda inputs: lambda: inputs.graph.search(inputs.start_val,
+                                                method='depth_first')),
+    ('dijkstra', ['undirected', 'directed'],
+     lambda inputs: lambda: inputs.graph.dijkstra(inputs.start_val,
+                                                  return_distances=True)),
+    ('is_connected', ['undirected'],
+     lambda inputs: lambda: inputs.graph.is_connected),
+    ('is_strongly_connected', ['directed'],
+     lambda inputs: lambda: inputs.graph.is_strongly_connected),
+    ('remove_vertex', ['undirected', 'directed'],
+     _remove_vertices),
+    ('induced_subgraph', ['undirected', 'directed'],
+     lambda inputs: lambda: inputs.graph.induced_subgraph(
+         inputs.subgraph_vals)),
+    ('search[subgraph_view]', ['undirected', 'directed'],
+     lambda inputs: lambda: inputs.graph.subgraph_view(
+         lambda v: v.val in inputs.subgraph_vals).search(inputs.start_val)),
+]
+
+
+################################################################################
+#                                                                              #
+#                                   Running                                    #
+#                                                                              #
+################################################################################
+
+
+def run_suite(sizes, repeat=3, budget=60.0, seed=0, case_filter=None,
+              log=None):
+    """ Results of every case at every size, each the fastest of repeat runs
+        along with the peak memory of one more run. Once a case takes longer
+        than budget seconds, it is skipped at larger sizes """
+    source = memory_source()
+    results = []
+    over_budget = set()
+    for size in sorted(sizes):
+        inputs = make_inputs(size, seed)
+        for case_name, kinds, setup in CASES:
+            for kind in kinds:
+                name = '%s.%s' % (inputs[kind].graph_cls.__name__, case_name)
+                if case_filter and case_filter not in name:
+                    continue
+                result = {'case': name, 'size': size, 'seconds': None,
+                          'peak_memory_bytes': None, 'skipped': True}
+                if name not in over_budget:
+                    seconds = min(time_run(setup(inputs[kind]))
+                                  for _ in xrange(repeat))
+                    result['seconds'] = seconds
+                    result['peak_memory_bytes'] = peak_memory(
+                        setup(inputs[kind]), source)
+                    result['skipped'] = False
+                    if seconds > budget:
+                        over_budget.add(name)
+                results.append(result)
+                if log is not None:
+                    log(result)
+    return results
+
+
+def compare(old_results, new_results, threshold=0.1, min_seconds=0.001,
+            min_bytes=2**20):
+    """ Regressions going from old_results to new_results: a case at some size
+        taking more than (1 + threshold) times as long, or using more than
+        (1 + threshold) times as much memory. Times where both runs are under
+        min_seconds, and peaks where both are under min_bytes, are ignored as
+        noise. Each regression is a tuple of the case, the size, the metric,
+        the old value, and the new value """
+    noise_floors = {'seconds': min_seconds, 'peak_memory_bytes': min_bytes}
+    old_by_key = dict(((r['case'], r['size']), r) for r in old_results)
+    regressions = []
+    for new in new_results:
+        old = old_by_key.get((new['case'], new['size']))
+        if old is None or old['skipped'] or new['skipped']:
+            continue
+        for metric, noise_floor in noise_floors.iteritems():
+            old_val = old[metric]
+            new_val = new[metric]
+            if not old_val or new_val is None:
+                continue
+            if max(old_val, new_val) < noise_floor:
+                continue
+            if new_val > (1 + threshold) * old_val:
+                regressions.append((new['case'], new['size'], metric, old_val,
+                                    new_val))
+    return regressions
+
+
+def _print_result(result):
+    if result['skipped']:
+        print "    %-45s %8s  skipped (over budget)" % (
+            result['case'], result['size'])
+    else:
+        peak_bytes = result['peak_memory_bytes']
+        peak = ('n/a' if peak_bytes is None
+                else '%.1f MiB' % (peak_bytes / 2.0**20))
+        print "    %-45s %8s  %10.4fs  %s" % (
+            result['case'], result['size'], result['seconds'], peak)
+    sys.stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help="run the suite")
+    run_parser.add_argument('output', help="JSON file to write results to")
+    run_parser.add_argument('--sizes', type=int, nargs='+',
+                            default=[1000, 10000, 100000, 1000000])
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--budget', type=float, default=60.0,
+                            help="seconds after which a case is skipped at "
+                                 "larger sizes")
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--filter', dest='case_filter',
+                            help="only run cases whose names contain this")
+
+    compare_parser = subparsers.add_parser(
+        'compare', help="compare two result files")
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help="fraction by which a metric may grow "
+                                     "before it counts as a regression")
+    compare_parser.add_argument('--min-seconds', type=float, default=0.001)
+    compare_parser.add_argument('--min-bytes', type=int, default=2**20)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        print "Memory source: %s" % memory_source()
+        results = run_suite(args.sizes, repeat=args.repeat, budget=args.budget,
+                            seed=args.seed, case_filter=args.case_filter,
+                            log=_print_result)
+        report = {'meta': {'python': platform.python_version(),
+                           'platform': platform.platform(),
+                           'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                           'memory_source': memory_source(),
+                           'repeat': args.repeat,
+                           'seed': args.seed},
+                  'results': results}
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        return 0
+
+    with open(args.old) as f:
+        old_report = json.load(f)
+    with open(args.new) as f:
+        new_report = json.load(f)
+    if (old_report['meta']['memory_source'] !=
+        new_report['meta']['memory_source']):
+        # peaks measured different ways can't be compared
+        for result in old_report['results']:
+            result['peak_memory_bytes'] = None
+    regressions = compare(old_report['results'], new_report['results'],
+                          threshold=args.threshold,
+                          min_seconds=args.min_seconds,
+                          min_bytes=args.min_bytes)
+    for case, size, metric, old_val, new_val in regressions:
+        print "REGRESSION %-45s %8s  %s: %.4g -> %.4g (%+.0f%%)" % (
+            case, size, metric, old_val, new_val,
+            100.0 * (new_val - old_val) / old_val)
+    print "%s regression(s) above %.0f%%" % (len(regressions),
+                                            100 * args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,23 +12,26 @@ Implementation of an edge, as used in graphs
 
 class UndirectedEdge(object):
 
+    __slots__ = ('_vertices', '_attrs', '_invalid_weight_edges')
+
     def __init__(self, vertices, attrs=None):
-        self._vertices = frozenset(vertices)
-        self._attrs = attrs or {}
-        self._is_self_edge = vertices[0] == vertices[1]
+        v0, v1 = vertices
+        # order the vertices canonically so equal edges have equal tuples
+        self._vertices = (v0, v1) if id(v0) <= id(v1) else (v1, v0)
+        # attrs dicts are only allocated once an attribute is set
+        self._attrs = attrs or None
+        # set of the edges without a valid weight in the graph this edge is in
+        # (None when not in a graph), kept up to date as the weight changes
+        self._invalid_weight_edges = None
 
     def __repr__(self):
-        vertices = (tuple(self._vertices) if not self._is_self_edge else
-                    tuple(self._vertices) * 2)
-        return "Edge(%s, %s)" % (vertices[0], vertices[1])
+        return "Edge(%s, %s)" % self._vertices
 
     def __str__(self):
-        vertices = (tuple(self._vertices) if not self._is_self_edge else
-                    tuple(self._vertices) * 2)
-        return "E(%s, %s)" % (str(vertices[0]), str(vertices[1]))
+        return "E(%s, %s)" % (str(self._vertices[0]), str(self._vertices[1]))
 
     def __eq__(self, other):
-        return self._vertices == other.vertices
+        return self._vertices == other.endpoints
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -38,31 +41,66 @@ class UndirectedEdge(object):
 
     @property
     def vertices(self):
+        return frozenset(self._vertices)
+
+    @property
+    def endpoints(self):
+        """ Tuple of the two vertices this edge connects, in canonical order
+            (a self edge's vertex appears twice) """
         return self._vertices
 
     @property
     def attrs(self):
+        if self._attrs is None:
+            self._attrs = {}
         return self._attrs
 
     @property
     def is_self_edge(self):
-        return self._is_self_edge
+        return self._vertices[0] == self._vertices[1]
+
+    @property
+    def has_valid_weight(self):
+        """ Whether this edge has a non-negative weight """
+        weight = self.get('weight')
+        return weight is not None and weight >= 0
 
     def get(self, attr):
         """ Get an attribute """
+        if self._attrs is None:
+            return None
         return self._attrs.get(attr)
 
     def set(self, attr, value):
         """ Set an attribute """
-        self._attrs[attr] = value
+        self.attrs[attr] = value
+        if attr == 'weight':
+            self._track_weight()
 
     def has_attr(self, attr):
         """ Check if an attribute exists """
-        return attr in self._attrs
+        return self._attrs is not None and attr in self._attrs
 
     def del_attr(self, attr):
         """ Delete an attribute """
-        del self._attrs[attr]
+        del self.attrs[attr]
+        if attr == 'weight':
+            self._track_weight()
+
+    def _watch_weight(self, invalid_weight_edges):
+        """ Keep invalid_weight_edges (a graph's set of edges without a valid
+            weight) up to date with this edge, or stop if it is None """
+        if self._invalid_weight_edges is not None:
+            self._invalid_weight_edges.discard(self)
+        self._invalid_weight_edges = invalid_weight_edges
+        self._track_weight()
+
+    def _track_weight(self):
+        if self._invalid_weight_edges is not None:
+            if self.has_valid_weight:
+                self._invalid_weight_edges.discard(self)
+            else:
+                self._invalid_weight_edges.add(self)
 
 
 ################################################################################
@@ -74,10 +112,16 @@ class UndirectedEdge(object):
 
 class DirectedEdge(object):
 
+    __slots__ = ('_v_from', '_v_to', '_attrs', '_invalid_weight_edges')
+
     def __init__(self, vertices, attrs=None):
         self._v_from = vertices[0]
         self._v_to = vertices[1]
-        self._attrs = attrs or {}
+        # attrs dicts are only allocated once an attribute is set
+        self._attrs = attrs or None
+        # set of the edges without a valid weight in the graph this edge is in
+        # (None when not in a graph), kept up to date as the weight changes
+        self._invalid_weight_edges = None
 
     def __repr__(self):
         return "Edge(%s, %s)" % (self._v_from, self._v_to)
@@ -104,20 +148,49 @@ class DirectedEdge(object):
 
     @property
     def attrs(self):
+        if self._attrs is None:
+            self._attrs = {}
         return self._attrs
 
+    @property
+    def has_valid_weight(self):
+        """ Whether this edge has a non-negative weight """
+        weight = self.get('weight')
+        return weight is not None and weight >= 0
+
     def get(self, attr):
         """ Get an attribute """
+        if self._attrs is None:
+            return None
         return self._attrs.get(attr)
 
     def set(self, attr, value):
         """ Set an attribute """
-        self._attrs[attr] = value
+        self.attrs[attr] = value
+        if attr == 'weight':
+            self._track_weight()
 
     def has_attr(self, attr):
         """ Check if an attribute exists """
-        return attr in self._attrs
+        return self._attrs is not None and attr in self._attrs
 
     def del_attr(self, attr):
         """ Delete an attribute """
-        del self._attrs[attr]
+        del self.attrs[attr]
+        if attr == 'weight':
+            self._track_weight()
+
+    def _watch_weight(self, invalid_weight_edges):
+        """ Keep invalid_weight_edges (a graph's set of edges without a valid
+            weight) up to date with this edge, or stop if it is None """
+        if self._invalid_weight_edges is not None:
+            self._invalid_weight_edges.discard(self)
+        self._invalid_weight_edges = invalid_weight_edges
+        self._track_weight()
+
+    def _track_weight(self):
+        if self._invalid_weight_edges is not None:
+            if self.has_valid_weight:
+                self._invalid_weight_edges.discard(self)
+            else:
+                self._invalid_weight_edges.add(self)
@@ -0,0 +1,412 @@
+"""
+Implementation of frozen graphs, immutable compressed sparse row (CSR)
+snapshots of graphs for read-heavy workloads
+"""
+
+
+from helpers import *
+
+from array import array
+from collections import deque
+
+
+################################################################################
+#                                                                              #
+#                                   Helpers                                    #
+#                                                                              #
+################################################################################
+
+
+def _pack_weights(weights):
+    """ Array of some weights, holding ints if every weight is an int that
+        fits in one and floats otherwise, so sums of them keep their type """
+    if all(isinstance(weight, (int, long)) for weight in weights):
+        try:
+            return array('l', weights)
+        except OverflowError:
+            pass
+    return array('d', weights)
+
+
+def _build_rows(vals, vals_to_indices, rows):
+    """ Pack rows of (neighbor val, edge) pairs into the offsets, targets, and
+        weights arrays of a CSR, along with the message of the error dijkstra
+        raises for some edge whose weight is missing or negative (None if
+        every weight is valid), made now so later changes to the edge don't
+        change it """
+    offsets = array('l', [0])
+    targets = array('l')
+    weights = []
+    weight_error = None
+
+    for val in vals:
+        for neighbor_val, e in rows(val):
+            weight = e.get('weight')
+            if weight is None or weight < 0:
+                if weight_error is None:
+                    weight_error = str(e) + (" must have a weight"
+                                             if weight is None else
+                                             " must have a non-negative weight")
+                weight = 0
+            targets.append(vals_to_indices[neighbor_val])
+            weights.append(weight)
+        offsets.append(len(targets))
+
+    return offsets, targets, _pack_weights(weights), weight_error
+
+
+def _reach_count(offsets, targets, start_idx):
+    """ Number of vertices reachable from a source vertex in a CSR """
+    seen = bytearray(len(offsets) - 1)
+    seen[start_idx] = 1
+    count = 1
+    vertex_queue = [start_idx]
+    while vertex_queue:
+        current_idx = vertex_queue.pop()
+        for target_idx in targets[offsets[current_idx]:
+                                  offsets[current_idx + 1]]:
+            if not seen[target_idx]:
+                seen[target_idx] = 1
+                count += 1
+                vertex_queue.append(target_idx)
+    return count
+
+
+class _FrozenGraph(object):
+    """ Shared read-only machinery of frozen graphs. Vertices are identified by
+        their index into self._vals, and the edges out of the vertex at index i
+        are the positions offsets[i] through offsets[i + 1] - 1 of targets (the
+        index of the vertex pointed to) and weights (the edge's weight) """
+
+    def __init__(self, vals, offsets, targets, weights, weight_error=None):
+        self._vals = tuple(vals)
+        self._vals_to_indices = {val: idx for idx, val in enumerate(vals)}
+        self._offsets = offsets
+        self._targets = targets
+        self._weights = weights
+        self._weight_error = weight_error
+
+    def __len__(self):
+        return self.num_vertices
+
+    def __iter__(self):
+        return iter(self._vals)
+
+    @property
+    def vals(self):
+        return self._vals
+
+    @property
+    def offsets(self):
+        return self._offsets
+
+    @property
+    def targets(self):
+        return self._targets
+
+    @property
+    def weights(self):
+        return self._weights
+
+    @property
+    def num_vertices(self):
+        """ Number of vertices in this graph """
+        return len(self._vals)
+
+    def has_vertex(self, v_val):
+        """ Checks if a certain vertex exists in this graph """
+        return v_val in self._vals_to_indices
+
+    def _row(self, v_val):
+        """ Slice of targets holding the edges out of a vertex """
+        idx = self._vals_to_indices[v_val]
+        return self._targets[self._offsets[idx]:self._offsets[idx + 1]]
+
+    def has_edge(self, v_vals):
+        """ Checks if a certain edge exists in this graph """
+        v0_val, v1_val = v_vals
+        if not (self.has_vertex(v0_val) and self.has_vertex(v1_val)):
+            return False
+        return self._vals_to_indices[v1_val] in self._row(v0_val)
+
+    def search(self, start_val, goal_val=None, method='breadth_first'):
+        """ Search for either some goal vertex or all vertices reachable from
+            a source vertex """
+        start = self._vals_to_indices[start_val]
+        goal = self._vals_to_indices.get(goal_val)
+        pop = deque.popleft if method == 'breadth_first' else deque.pop
+        offsets, targets = self._offsets, self._targets
+
+        predecessors = array('l', [-1]) * len(self._vals)
+        seen_so_far = bytearray(len(self._vals))
+        seen_so_far[start] = 1
+        vertex_queue = deque([start])
+        visit_order = []
+
+        def index_path(idx):
+            path = [self._vals[idx]]
+            while predecessors[idx] != -1:
+                idx = predecessors[idx]
+                path.append(self._vals[idx])
+            path.reverse()
+            return path
+
+        # handle each vertex until there are no vertices left to check
+        while vertex_queue:
+            current_idx = pop(vertex_queue)
+
+            # if searching for a specific vertex, check if this is it
+            if current_idx == goal:
+                return index_path(current_idx)
+
+            visit_order.append(current_idx)
+
+            # put the vertices this vertex points to onto the queue
+            for target_idx in targets[offsets[current_idx]:
+                                      offsets[current_idx + 1]]:
+                if not seen_so_far[target_idx]:
+                    seen_so_far[target_idx] = 1
+                    predecessors[target_idx] = current_idx
+                    vertex_queue.append(target_idx)
+
+        # if searching for a specific vertex, it was not reachable
+        if goal is not None:
+            return None
+
+        # map each visited val to its predecessor's, building paths only
+        # when they are looked up
+        vals = self._vals
+        return LazyPaths(dict(
+            (vals[idx], vals[predecessors[idx]] if idx != start else None)
+            for idx in visit_order))
+
+    def dijkstra(self, start_val, goal_val=None, return_distances=False,
+                 priority_queue=PriorityQueue):
+        """ Find the shortest path to either some goal vertex or to all vertices
+            reachable from a source vertex """
+        if self._weight_error is not None:
+            raise ValueError(self._weight_error)
+        start = self._vals_to_indices[start_val]
+        goal = self._vals_to_indices.get(goal_val)
+        offsets, targets, weights = self._offsets, self._targets, self._weights
+        n = len(self._vals)
+
+        distances = [float('inf')] * n
+        predecessors = [-1] * n
+        cloud_so_far = bytearray(n)
+
+        distances[start] = 0
+        predecessors[start] = None
+
+        # relax edges until there are no reached vertices left out of the
+        # cloud, only putting vertices in the queue once they are reached
+        vertex_queue = priority_queue(data=[(0, start)])
+        while vertex_queue:
+            # move the closest vertex that's not in the cloud into the cloud
+            _, current_idx = vertex_queue.pop_min()
+            cloud_so_far[current_idx] = 1
+
+            # if searching for a specific vertex, check if this is it
+            if current_idx == goal:
+                break
+
+            # conditionally relax each of that vertex's edges
+            current_distance = distances[current_idx]
+            for position in xrange(offsets[current_idx],
+                                   offsets[current_idx + 1]):
+                target_idx = targets[position]
+                if cloud_so_far[target_idx]:
+                    continue
+                new_target_distance = current_distance + weights[position]
+                if predecessors[target_idx] == -1:
+                    distances[target_idx] = new_target_distance
+                    predecessors[target_idx] = current_idx
+                    vertex_queue.insert(target_idx, new_target_distance)
+                elif new_target_distance < distances[target_idx]:
+                    distances[target_idx] = new_target_distance
+                    predecessors[target_idx] = current_idx
+                    vertex_queue.decrease_key(target_idx, new_target_distance)
+
+        # with the algorithm complete, prepare the output
+
+        vals = self._vals
+        namified_distances = {vals[idx]: d for idx, d in enumerate(distances)}
+
+        def backtrack(target_val):
+            """ Use our predecessor map to get the shortest path from our start
+                to some target """
+            idx = self._vals_to_indices[target_val]
+            if predecessors[idx] == -1:
+                return None
+            path = [target_val]
+            while predecessors[idx] is not None:
+                idx = predecessors[idx]
+                path.append(vals[idx])
+            path.reverse()
+            return path
+
+        if goal_val is not None:
+            return (namified_distances[goal_val] if return_distances
+                                                 else backtrack(goal_val))
+        else:
+            return (namified_distances if return_distances
+                                       else keydefaultdict(backtrack))
+
+
+################################################################################
+#                                                                              #
+#                                  Undirected                                  #
+#                                                                              #
+################################################################################
+
+
+class FrozenUndirectedGraph(_FrozenGraph):
+    """ Immutable CSR snapshot of an UndirectedGraph. Each edge is stored in the
+        rows of both of its vertices (a self edge is stored once) """
+
+    def __str__(self):
+        return "FrozenUndirectedGraph(%s vertices, %s edges)" % (
+            self.num_vertices, self.num_edges)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """ Generate a frozen graph from an UndirectedGraph """
+        vals = [v.val for v in graph.vertices]
+        vals_to_indices = {val: idx for idx, val in enumerate(vals)}
+
+        def rows(val):
+            for neighbor, e in graph.get_vertex(val).neighbors_with_edges:
+                yield neighbor.val, e
+
+        csr = _build_rows(vals, vals_to_indices, rows)
+        return cls(vals, *csr)
+
+    @property
+    def num_edges(self):
+        """ Number of edges in this graph """
+        num_self_edges = sum(1 for idx in xrange(len(self._vals))
+                             if idx in self._targets[self._offsets[idx]:
+                                                     self._offsets[idx + 1]])
+        return (len(self._targets) + num_self_edges) // 2
+
+    @property
+    def is_connected(self):
+        """ Checks if this graph has paths from each vertex to each other
+            vertex """
+        if not self._vals:
+            return True
+        return (_reach_count(self._offsets, self._targets, 0) ==
+                self.num_vertices)
+
+    def neighbors(self, v_val):
+        """ Iterator over vals of vertices adjacent to a vertex """
+        return (self._vals[idx] for idx in self._row(v_val))
+
+    def degree(self, v_val):
+        """ Number of neighbors a vertex has (+1 if it has a self edge) """
+        idx = self._vals_to_indices[v_val]
+        row = self._row(v_val)
+        return len(row) + (1 if idx in row else 0)
+
+
+################################################################################
+#                                                                              #
+#                                   Directed                                   #
+#                                                                              #
+################################################################################
+
+
+class FrozenDirectedGraph(_FrozenGraph):
+    """ Immutable CSR snapshot of a DirectedGraph. The rows of offsets, targets,
+        and weights hold each vertex's outs, and the rows of in_offsets and
+        in_sources hold each vertex's ins """
+
+    def __init__(self, vals, offsets, targets, weights, weight_error=None,
+                 in_offsets=None, in_sources=None):
+        super(FrozenDirectedGraph, self).__init__(vals, offsets, targets,
+                                                  weights, weight_error)
+        self._in_offsets = in_offsets
+        self._in_sources = in_sources
+
+    def __str__(self):
+        return "FrozenDirectedGraph(%s vertices, %s edges)" % (
+            self.num_vertices, self.num_edges)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """ Generate a frozen graph from a DirectedGraph """
+        vals = [v.val for v in graph.vertices]
+        vals_to_indices = {val: idx for idx, val in enumerate(vals)}
+
+        def out_rows(val):
+            for out, e in graph.get_vertex(val).outs_with_edges:
+                yield out.val, e
+
+        def in_rows(val):
+            for in_, e in graph.get_vertex(val).ins_with_edges:
+                yield in_.val, e
+
+        offsets, targets, weights, weight_error = _build_rows(
+            vals, vals_to_indices, out_rows)
+        in_offsets, in_sources, _, _ = _build_rows(vals, vals_to_indices,
+                                                   in_rows)
+        return cls(vals, offsets, targets, weights, weight_error,
+                   in_offsets=in_offsets, in_sources=in_sources)
+
+    @property
+    def in_offsets(self):
+        return self._in_offsets
+
+    @property
+    def in_sources(self):
+        return self._in_sources
+
+    @property
+    def num_edges(self):
+        """ Number of edges in this graph """
+        return len(self._targets)
+
+    @property
+    def is_weakly_connected(self):
+        """ Checks if this graph has a path from each vertex to each other
+            vertex when treating its edges as undirected """
+        n = len(self._vals)
+        if not n:
+            return True
+        seen = bytearray(n)
+        seen[0] = 1
+        count = 1
+        vertex_queue = [0]
+        while vertex_queue:
+            current_idx = vertex_queue.pop()
+            outs = self._targets[self._offsets[current_idx]:
+                                 self._offsets[current_idx + 1]]
+            ins = self._in_sources[self._in_offsets[current_idx]:
+                                   self._in_offsets[current_idx + 1]]
+            for idx in outs + ins:
+                if not seen[idx]:
+                    seen[idx] = 1
+                    count += 1
+                    vertex_queue.append(idx)
+        return count == n
+
+    @property
+    def is_strongly_connected(self):
+        """ Checks if this graph has a path from each vertex to each other
+            vertex """
+        n = len(self._vals)
+        if not n:
+            return True
+        return (_reach_count(self._offsets, self._targets, 0) ==
+                _reach_count(self._in_offsets, self._in_sources, 0) == n)
+
+    def outs(self, v_val):
+        """ Iterator over vals of vertices into which a vertex has an edge """
+        return (self._vals[idx] for idx in self._row(v_val))
+
+    def ins(self, v_val):
+        """ Iterator over vals of vertices which have an edge into a vertex """
+        idx = self._vals_to_indices[v_val]
+        return (self._vals[in_idx] for in_idx in
+                self._in_sources[self._in_offsets[idx]:
+                                 self._in_offsets[idx + 1]])
@@ -0,0 +1,184 @@
+"""
+Generators of synthetic graphs shaped like real networks (road-like grids and
+power-law social graphs), built in near-linear time
+"""
+
+
+from graph import UndirectedGraph, DirectedGraph
+from helpers import make_rng
+
+
+################################################################################
+#                                                                              #
+#                                   Helpers                                    #
+#                                                                              #
+################################################################################
+
+
+def _attrs_drawer(weight_range, rng):
+    """ Function giving the attrs of each new edge: None if weight_range is
+        None, and otherwise a random weight between the ends of weight_range
+        (an int if both ends are ints, a float otherwise) """
+    if weight_range is None:
+        return lambda: None
+    low, high = weight_range
+    if not 0 <= low <= high:
+        m = "weight_range must be a (low, high) pair with 0 <= low <= high"
+        raise ValueError(m)
+    if isinstance(low, (int, long)) and isinstance(high, (int, long)):
+        return lambda: {'weight': rng.randint(low, high)}
+    return lambda: {'weight': rng.uniform(low, high)}
+
+
+def _build(graph_cls, v_vals, edge_keys, weight_range, rng):
+    """ Graph of graph_cls with v_vals and an edge for each pair of vals in
+        edge_keys, added through the bulk construction path """
+    draw_attrs = _attrs_drawer(weight_range, rng)
+    g = graph_cls()
+    g.add_vertices((v_val,) for v_val in v_vals)
+    g.add_edges((edge_key, draw_attrs()) for edge_key in edge_keys)
+    return g
+
+
+################################################################################
+#                                                                              #
+#                                  Generators                                  #
+#                                                                              #
+################################################################################
+
+
+def grid_graph(num_rows, num_cols, directed=False, weight_range=None,
+               seed=None):
+    """ Graph of (row, col) vertices each with an edge to the vertices next to
+        it horizontally and vertically. Directed grids have edges both ways """
+    if num_rows < 1 or num_cols < 1:
+        raise ValueError("num_rows and num_cols must be at least 1")
+
+    def edge_keys():
+        for row in xrange(num_rows):
+            for col in xrange(num_cols):
+                if col + 1 < num_cols:
+                    yield ((row, col), (row, col + 1))
+                    if directed:
+                        yield ((row, col + 1), (row, col))
+                if row + 1 < num_rows:
+                    yield ((row, col), (row + 1, col))
+                    if directed:
+                        yield ((row + 1, col), (row, col))
+
+    v_vals = ((row, col) for row in xrange(num_rows)
+              for col in xrange(num_cols))
+    graph_cls = DirectedGraph if directed else UndirectedGraph
+    return _build(graph_cls, v_vals, edge_keys(), weight_range, make_rng(seed))
+
+
+def barabasi_albert_graph(num_vertices, num_edges_per_vertex, directed=False,
+                          weight_range=None, seed=None):
+    """ Scale-free graph grown by preferential attachment: vertices 0 to
+        num_vertices - 1 are added in order, each with edges to
+        num_edges_per_vertex distinct earlier vertices chosen with probability
+        proportional to their degree. Directed edges point to earlier
+        vertices """
+    if not 1 <= num_edges_per_vertex < num_vertices:
+        m = "num_edges_per_vertex must be at least 1 and less than num_vertices"
+        raise ValueError(m)
+    rng = make_rng(seed)
+
+    def edge_keys():
+        # each vertex appears once per edge it has, so a uniform choice from
+        # endpoints picks vertices with probability proportional to degree
+        endpoints = []
+        targets = range(num_edges_per_vertex)
+        for v_val in xrange(num_edges_per_vertex, num_vertices):
+            for target in targets:
+                yield (v_val, target)
+            endpoints.extend(targets)
+            endpoints.extend([v_val] * num_edges_per_vertex)
+            targets = set()
+            while len(targets) < num_edges_per_vertex:
+                targets.add(rng.choice(endpoints))
+
+    graph_cls = DirectedGraph if directed else UndirectedGraph
+    return _build(graph_cls, xrange(num_vertices), edge_keys(), weight_range,
+                  rng)
+
+
+def rmat_graph(scale, edge_factor=16, probabilities=(0.57, 0.19, 0.19),
+               directed=True, weight_range=None, seed=None):
+    """ Recursive matrix (R-MAT) graph with 2 ** scale vertices and about
+        edge_factor edges per vertex, with power-law degrees. probabilities are
+        those of an edge falling into the top-left, top-right, and bottom-left
+        quadrants of the adjacency matrix at each level of recursion (the
+        defaults are Graph500's). Self edges and repeated edges are dropped """
+    a, b, c = probabilities
+    if scale < 0 or edge_factor < 0:
+        raise ValueError("scale and edge_factor must be non-negative")
+    if min(a, b, c) < 0 or a + b + c > 1:
+        m = "probabilities must be non-negative and sum to at most 1"
+        raise ValueError(m)
+    rng = make_rng(seed)
+    num_vertices = 1 << scale
+
+    def edge_keys():
+        seen = set()
+        ab = a + b
+        abc = a + b + c
+        for _ in xrange(edge_factor * num_vertices):
+            v_from = v_to = 0
+            for bit in xrange(scale):
+                r = rng.random()
+                if r < a:
+                    continue
+                elif r < ab:
+                    v_to |= 1 << bit
+                elif r < abc:
+                    v_from |= 1 << bit
+                else:
+                    v_from |= 1 << bit
+                    v_to |= 1 << bit
+            if v_from == v_to:
+                continue
+            if not directed and v_to < v_from:
+                v_from, v_to = v_to, v_from
+            if (v_from, v_to) not in seen:
+                seen.add((v_from, v_to))
+                yield (v_from, v_to)
+
+    graph_cls = DirectedGraph if directed else UndirectedGraph
+    return _build(graph_cls, xrange(num_vertices), edge_keys(), weight_range,
+                  rng)
+
+
+def watts_strogatz_graph(num_vertices, num_neighbors, p, weight_range=None,
+                         seed=None):
+    """ Small-world undirected graph: a ring of vertices 0 to num_vertices - 1
+        each with edges to its num_neighbors nearest vertices, where each edge
+        is then rewired to a random vertex with probability p """
+    k = num_neighbors
+    if k % 2 or not 0 <= k < num_vertices:
+        m = "num_neighbors must be even and less than num_vertices"
+        raise ValueError(m)
+    rng = make_rng(seed)
+
+    neighbors = [set() for _ in xrange(num_vertices)]
+    for i in xrange(num_vertices):
+        for j in xrange(1, k // 2 + 1):
+            neighbors[i].add((i + j) % num_vertices)
+            neighbors[(i + j) % num_vertices].add(i)
+    for j in xrange(1, k // 2 + 1):
+        for i in xrange(num_vertices):
+            if rng.random() >= p or len(neighbors[i]) >= num_vertices - 1:
+                continue
+            new_neighbor = rng.randrange(num_vertices)
+            while new_neighbor == i or new_neighbor in neighbors[i]:
+                new_neighbor = rng.randrange(num_vertices)
+            old_neighbor = (i + j) % num_vertices
+            neighbors[i].remove(old_neighbor)
+            neighbors[old_neighbor].remove(i)
+            neighbors[i].add(new_neighbor)
+            neighbors[new_neighbor].add(i)
+
+    edge_keys = ((i, neighbor) for i in xrange(num_vertices)
+                 for neighbor in neighbors[i] if i < neighbor)
+    return _build(UndirectedGraph, xrange(num_vertices), edge_keys,
+                  weight_range, rng)
@@ -5,10 +5,425 @@ Implementation of a graph
 
 from edge import UndirectedEdge, DirectedEdge
 from vertex import UndirectedVertex, DirectedVertex
+from frozen import FrozenUndirectedGraph, FrozenDirectedGraph
+from views import (ReversedVertexView, ReversedEdgeView, UndirectedVertexView,
+                   UndirectedEdgeView, SubgraphUndirectedVertexView,
+                   SubgraphUndirectedEdgeView, SubgraphDirectedVertexView,
+                   SubgraphDirectedEdgeView, _lighter_edge)
 from helpers import *
 
+from collections import deque
+
 import copy
-import random
+import functools
+import itertools
+
+
+def _listing(items, limit=10):
+    """ Comma-separated strs of items for error messages, cut off after some
+        number of items """
+    items = list(items)
+    listing = ", ".join(str(item) for item in items[:limit])
+    if len(items) > limit:
+        listing += " (and %s more)" % (len(items) - limit)
+    return listing
+
+
+def _check_weights(invalid_weight_edges):
+    """ Raises a ValueError if a graph has any edges without a valid weight,
+        given the graph's set of such edges. A weight fixed other than with
+        set (e.g. through an edge's attrs dict) leaves its edge in the set,
+        so each edge is checked again and dropped if its weight is valid """
+    for e in list(invalid_weight_edges):
+        if e.has_valid_weight:
+            invalid_weight_edges.discard(e)
+        elif e.get('weight') is None:
+            raise ValueError(str(e) + " must have a weight")
+        else:
+            raise ValueError(str(e) + " must have a non-negative weight")
+
+
+def _copy_attrs(x):
+    """ Deep copy of the attrs of a vertex or edge, or None if it has none,
+        read without making x allocate an attrs dict """
+    attrs = x._attrs
+    return copy.deepcopy(attrs) if attrs else None
+
+
+def _relaxed_weight_error(v, next_v, weight):
+    """ ValueError for the edge from v to next_v, whose missing or negative
+        weight turned up as a search relaxed it. Weights written straight into
+        an edge's attrs dict bypass the graph's tracking, so searches check
+        each weight they relax as well """
+    e_str = "E(%s, %s)" % (str(v), str(next_v))
+    if weight is None:
+        return ValueError(e_str + " must have a weight")
+    return ValueError(e_str + " must have a non-negative weight")
+
+
+def _max_integer_weight(edges):
+    """ Greatest weight of edges, raising a ValueError if any edge doesn't
+        have a non-negative integer weight """
+    max_weight = 0
+    for e in edges:
+        weight = e.get('weight')
+        if weight is None or weight < 0 or weight != int(weight):
+            m = str(e) + " must have a non-negative integer weight"
+            raise ValueError(m)
+        max_weight = max(max_weight, weight)
+    return int(max_weight)
+
+
+def _get_starts(graph, start_val, start_vals):
+    """ Vertices of graph for a search to start from, given either start_val
+        or a collection of start_vals """
+    if (start_val is None) == (start_vals is None):
+        m = "Exactly one of start_val and start_vals must be given"
+        raise ValueError(m)
+    starts = []
+    seen = set()
+    for v_val in [start_val] if start_vals is None else start_vals:
+        v = graph.get_vertex(v_val)
+        if v is None:
+            raise KeyError(v_val)
+        if v_val not in seen:
+            seen.add(v_val)
+            starts.append(v)
+    return starts
+
+
+def _nearest_sources(predecessors, vals):
+    """ Each of vals mapped to the start its path begins at, following
+        predecessors (in which starts map to None), along with every val on
+        the way """
+    sources = {}
+    for v_val in vals:
+        unlabeled_vals = []
+        while v_val not in sources and predecessors[v_val] is not None:
+            unlabeled_vals.append(v_val)
+            v_val = predecessors[v_val]
+        source = sources.setdefault(v_val, v_val)
+        for unlabeled_val in unlabeled_vals:
+            sources[unlabeled_val] = source
+    return sources
+
+
+def _union_find(vertices_by_id, edge_keys):
+    """ Union-find of the ids of a graph's vertices (given by their ids, with
+        None for free ids) joined by edges (given by their endpoints' ids) """
+    components = UnionFind()
+    for v_id, v in enumerate(vertices_by_id):
+        if v is not None:
+            components.add(v_id)
+    for v0_id, v1_id in edge_keys:
+        components.union(v0_id, v1_id)
+    return components
+
+
+def _outs_and_ins(v):
+    """ Vertices a directed vertex has edges to or from """
+    return itertools.chain(v.outs, v.ins)
+
+
+def _component_labels(vertices, next_vertices):
+    """ Each of a graph's vertices' vals mapped to a label from 0 up, shared
+        by the vertices connected through next_vertices (which gives the
+        vertices a vertex has edges to or from), along with the number of
+        vertices with each label. Labels are in order of each component's
+        first vertex in vertices """
+    labels = {}
+    sizes = []
+    for root in vertices:
+        if root.val in labels:
+            continue
+        label = len(sizes)
+        labels[root.val] = label
+        size = 0
+        vertex_stack = [root]
+        while vertex_stack:
+            current_vertex = vertex_stack.pop()
+            size += 1
+            for next_vertex in next_vertices(current_vertex):
+                if next_vertex.val not in labels:
+                    labels[next_vertex.val] = label
+                    vertex_stack.append(next_vertex)
+        sizes.append(size)
+    return (labels, sizes)
+
+
+def _union_find_labels(vertices_by_id, components):
+    """ Same as _component_labels, but read from a union-find of the vertices'
+        ids """
+    labels = {}
+    sizes = []
+    root_labels = {}
+    for v_id, v in enumerate(vertices_by_id):
+        if v is None:
+            continue
+        root = components.find(v_id)
+        label = root_labels.get(root)
+        if label is None:
+            label = root_labels[root] = len(sizes)
+            sizes.append(components.set_size(root))
+        labels[v.val] = label
+    return (labels, sizes)
+
+
+def _largest_label(sizes):
+    """ Label of the largest component given each label's size, or None if
+        there are none """
+    if not sizes:
+        return None
+    return max(xrange(len(sizes)), key=lambda label: (sizes[label], -label))
+
+
+def _iter_bfs(start, next_vertices, on_discover, on_edge, on_finish):
+    """ Breadth-first traversal from start, where next_vertices gives the
+        vertices a vertex has edges to. Yields (val, depth, parent val) for
+        each vertex as it is discovered, and calls the hooks of iter_bfs """
+    seen = set([start.val])
+    vertex_queue = deque()
+
+    expand = on_discover(start.val, 0, None) if on_discover else True
+    yield (start.val, 0, None)
+    if expand is not False:
+        vertex_queue.append((start, 0))
+    elif on_finish:
+        on_finish(start.val)
+
+    while vertex_queue:
+        current_vertex, depth = vertex_queue.popleft()
+        for next_vertex in next_vertices(current_vertex):
+            if on_edge and on_edge(current_vertex.val,
+                                   next_vertex.val) is False:
+                continue
+            if next_vertex.val in seen:
+                continue
+            seen.add(next_vertex.val)
+            expand = (on_discover(next_vertex.val, depth + 1,
+                                  current_vertex.val) if on_discover else True)
+            yield (next_vertex.val, depth + 1, current_vertex.val)
+            if expand is not False:
+                vertex_queue.append((next_vertex, depth + 1))
+            elif on_finish:
+                on_finish(next_vertex.val)
+        if on_finish:
+            on_finish(current_vertex.val)
+
+
+def _iter_dfs(start, next_vertices, on_discover, on_edge, on_finish):
+    """ Depth-first traversal from start, where next_vertices gives the
+        vertices a vertex has edges to. Yields (val, depth, parent val) for
+        each vertex as it is discovered, and calls the hooks of iter_dfs """
+    seen = set([start.val])
+    # each entry is a vertex whose edges are being examined, an iterator over
+    # the vertices it has edges to, and its depth
+    vertex_stack = []
+
+    expand = on_discover(start.val, 0, None) if on_discover else True
+    yield (start.val, 0, None)
+    if expand is not False:
+        vertex_stack.append((start, iter(next_vertices(start)), 0))
+    elif on_finish:
+        on_finish(start.val)
+
+    while vertex_stack:
+        current_vertex, remaining, depth = vertex_stack[-1]
+        for next_vertex in remaining:
+            if on_edge and on_edge(current_vertex.val,
+                                   next_vertex.val) is False:
+                continue
+            if next_vertex.val in seen:
+                continue
+            seen.add(next_vertex.val)
+            expand = (on_discover(next_vertex.val, depth + 1,
+                                  current_vertex.val) if on_discover else True)
+            yield (next_vertex.val, depth + 1, current_vertex.val)
+            if expand is not False:
+                vertex_stack.append((next_vertex,
+                                     iter(next_vertices(next_vertex)),
+                                     depth + 1))
+                break
+            elif on_finish:
+                on_finish(next_vertex.val)
+        else:
+            # every edge of the current vertex has been examined
+            vertex_stack.pop()
+            if on_finish:
+                on_finish(current_vertex.val)
+
+
+def _bidirectional_dijkstra(start, goal, next_weighted, prev_weighted,
+                            priority_queue):
+    """ Shortest distance from start to goal and the vals along a shortest
+        path, or (inf, None) if there is none, found by growing Dijkstra
+        balls forward from start and backward from goal until they meet.
+        next_weighted and prev_weighted give the (vertex, weight) pairs a
+        vertex has edges to and from """
+    if start == goal:
+        return (0, [start.val])
+
+    # everything is kept per direction: index 0 is forward, 1 is backward
+    next_weighted = (next_weighted, prev_weighted)
+    distances = ({start.val: 0}, {goal.val: 0})
+    predecessors = ({start.val: None}, {goal.val: None})
+    clouds_so_far = (set(), set())
+    vertex_queues = (priority_queue(data=[(0, start)]),
+                     priority_queue(data=[(0, goal)]))
+    # the shortest start-to-goal distance found so far, and a vertex on a
+    # path of that distance
+    best_distance = float('inf')
+    meeting_val = None
+
+    while vertex_queues[0] and vertex_queues[1]:
+        # no path through a vertex outside both clouds can be shorter than
+        # the sum of the closest distances left in the queues
+        if (vertex_queues[0].find_min()[0] + vertex_queues[1].find_min()[0] >=
+                best_distance):
+            break
+
+        # grow whichever ball has the smaller frontier
+        side = 0 if len(vertex_queues[0]) <= len(vertex_queues[1]) else 1
+        side_distances, other_distances = distances[side], distances[1 - side]
+        current_distance, current_vertex = vertex_queues[side].pop_min()
+        clouds_so_far[side].add(current_vertex)
+
+        for neighbor, weight in next_weighted[side](current_vertex):
+            if weight is None or weight < 0:
+                raise _relaxed_weight_error(current_vertex, neighbor, weight)
+            if neighbor in clouds_so_far[side]:
+                continue
+            new_neighbor_distance = current_distance + weight
+            current_neighbor_distance = side_distances.get(neighbor.val)
+            if current_neighbor_distance is None:
+                vertex_queues[side].insert(neighbor, new_neighbor_distance)
+            elif new_neighbor_distance < current_neighbor_distance:
+                vertex_queues[side].decrease_key(neighbor,
+                                                 new_neighbor_distance)
+            else:
+                continue
+            side_distances[neighbor.val] = new_neighbor_distance
+            predecessors[side][neighbor.val] = current_vertex.val
+
+            # check for a shorter path through where the balls meet
+            if neighbor.val in other_distances:
+                distance = (new_neighbor_distance +
+                            other_distances[neighbor.val])
+                if distance < best_distance:
+                    best_distance, meeting_val = distance, neighbor.val
+
+    if meeting_val is None:
+        return (best_distance, None)
+
+    # walk back to start from the meeting vertex, then on to goal
+    path = [meeting_val]
+    while predecessors[0][path[-1]] is not None:
+        path.append(predecessors[0][path[-1]])
+    path.reverse()
+    while predecessors[1][path[-1]] is not None:
+        path.append(predecessors[1][path[-1]])
+    return (best_distance, path)
+
+
+def _astar(start, goal, next_weighted, heuristic, priority_queue):
+    """ Shortest distance from start to goal and the vals along a shortest
+        path, or (inf, None) if there is none, found by A* with heuristic.
+        next_weighted gives the (vertex, weight) pairs a vertex has edges to """
+    # distance from start to each vertex reached so far, and the heuristic's
+    # estimate of the distance from each one to goal
+    distances = {start.val: 0}
+    estimates = {start.val: heuristic(start, goal)}
+    predecessors = {start.val: None}
+
+    # vertices are popped in order of their distance plus estimate, so the
+    # search is drawn toward goal
+    vertex_queue = priority_queue(data=[(estimates[start.val], start)])
+    while vertex_queue:
+        _, current_vertex = vertex_queue.pop_min()
+        if current_vertex == goal:
+            break
+        current_distance = distances[current_vertex.val]
+
+        for neighbor, weight in next_weighted(current_vertex):
+            if weight is None or weight < 0:
+                raise _relaxed_weight_error(current_vertex, neighbor, weight)
+            new_neighbor_distance = current_distance + weight
+            current_neighbor_distance = distances.get(neighbor.val)
+            if current_neighbor_distance is None:
+                estimates[neighbor.val] = heuristic(neighbor, goal)
+            elif new_neighbor_distance >= current_neighbor_distance:
+                continue
+            distances[neighbor.val] = new_neighbor_distance
+            predecessors[neighbor.val] = current_vertex.val
+            priority = new_neighbor_distance + estimates[neighbor.val]
+            if neighbor in vertex_queue:
+                vertex_queue.decrease_key(neighbor, priority)
+            else:
+                vertex_queue.insert(neighbor, priority)
+
+    if goal.val not in predecessors:
+        return (float('inf'), None)
+    path = [goal.val]
+    while predecessors[path[-1]] is not None:
+        path.append(predecessors[path[-1]])
+    path.reverse()
+    return (distances[goal.val], path)
+
+
+def _iter_strongly_connected_components(vertices):
+    """ Strongly connected components of a directed graph, each a list of
+        vertices, found by Tarjan's algorithm (with an explicit stack rather
+        than recursion) over the graph's vertices. Each component is yielded
+        only after every component it has edges into """
+    # each vertex visited so far mapped to the order it was visited in, and
+    # to the earliest vertex known to be reachable from it that could still
+    # be in its component
+    indices = {}
+    lowlinks = {}
+    # visited vertices not yet assigned to a component
+    component_stack = []
+    on_component_stack = set()
+
+    for root in vertices:
+        if root in indices:
+            continue
+        indices[root] = lowlinks[root] = len(indices)
+        component_stack.append(root)
+        on_component_stack.add(root)
+        # each entry is a vertex whose outs are being examined, and an
+        # iterator over the rest of them
+        vertex_stack = [(root, root.outs)]
+
+        while vertex_stack:
+            current_vertex, remaining = vertex_stack[-1]
+            for out in remaining:
+                if out not in indices:
+                    indices[out] = lowlinks[out] = len(indices)
+                    component_stack.append(out)
+                    on_component_stack.add(out)
+                    vertex_stack.append((out, out.outs))
+                    break
+                elif out in on_component_stack:
+                    lowlinks[current_vertex] = min(lowlinks[current_vertex],
+                                                   indices[out])
+            else:
+                # every out of the current vertex has been examined
+                vertex_stack.pop()
+                if vertex_stack:
+                    parent = vertex_stack[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent],
+                                           lowlinks[current_vertex])
+                if lowlinks[current_vertex] == indices[current_vertex]:
+                    # the current vertex is the first visited of a component,
+                    # which is everything stacked on top of it
+                    component = []
+                    while True:
+                        v = component_stack.pop()
+                        on_component_stack.discard(v)
+                        component.append(v)
+                        if v == current_vertex:
+                            break
+                    yield component
 
 
 ################################################################################
@@ -21,42 +436,41 @@ import random
 class UndirectedGraph(object):
 
     def __init__(self):
-        self._vertices = set()
-        self._edges = set()
-        self._vals_to_vertices_map = {}
-        self._vals_to_edges_map = {}
+        # vals are interned into dense integer ids, which index
+        # self._vertices_by_id and key all other internal structures
+        self._vals_to_ids = {}
+        self._vertices_by_id = []
+        self._free_ids = []
+        self._ids_to_edges = {}
+        # edges without a valid weight, which the edges keep up to date as
+        # their weights change so dijkstra need not check every edge (an edge
+        # whose weight is fixed through its attrs dict stays until dijkstra
+        # checks it again)
+        self._invalid_weight_edges = set()
+        # union-find of the vertex ids' connected components if connectivity
+        # is tracked (see track_connectivity), otherwise None, along with
+        # whether edges have been removed since it was last brought up to date
+        self._components = None
+        self._components_stale = False
 
     def __str__(self):
-        vertices_str = ", ".join(str(v) for v in self._vertices)
-        edges_str = ", ".join(str(e) for e in self._edges)
+        vertices_str = ", ".join(str(v) for v in self.vertices)
+        edges_str = ", ".join(str(e) for e in self.edges)
         return "Vertices: %s\nEdges: %s" % (vertices_str, edges_str)
 
     def __len__(self):
         return self.num_vertices
 
     def __iter__(self):
-        return iter(self._vertices)
+        return self.vertices
 
     @classmethod
     def from_lists(cls, vertices, edges):
         """ Generate a graph by passing in a list of vertex vals and a list of
             edges between those vertices """
         g = cls()
-
-        for v in vertices:
-            if isinstance(v, tuple) and (len(v) == 1 or len(v) == 2):
-                g.add_vertex(*v)
-            else:
-                m = (str(v) + " must be a tuple and have length 1 or 2")
-                raise ValueError(m)
-
-        for e in edges:
-            if isinstance(e, tuple) and (len(e) == 1 or len(e) == 2):
-                g.add_edge(*e)
-            else:
-                m = (str(e) + " must be a tuple and have length 1 or 2")
-                raise ValueError(m)
-
+        g.add_vertices(vertices)
+        g.add_edges(edges)
         return g
 
     @classmethod
@@ -65,10 +479,9 @@ class UndirectedGraph(object):
             mapped to a set of vals of vertices to which there is an edge """
         vertex_attrs = vertex_attrs or {}
 
-        g = cls()
-
-        for v_val in graph_dict:
-            g.add_vertex(v_val)
+        v_vals = list(graph_dict)
+        seen_vals = set(graph_dict)
+        edges = []
 
         for v_val, neighbor_edge_list in graph_dict.items():
             for neighbor_edge in neighbor_edge_list:
@@ -85,19 +498,27 @@ class UndirectedGraph(object):
                 if not is_hashable(neighbor_val):
                     raise ValueError(str(neighbor_val) + " is not hashable")
 
-                if not g.has_vertex(neighbor_val):
-                    g.add_vertex(neighbor_val)
+                if neighbor_val not in seen_vals:
+                    seen_vals.add(neighbor_val)
+                    v_vals.append(neighbor_val)
+
+                edges.append(((v_val, neighbor_val), edge_attrs))
 
-                v_vals = (v_val, neighbor_val)
-                if not g.has_edge(v_vals):
-                    g.add_edge(v_vals, attrs=edge_attrs)
+        for v_val in vertex_attrs:
+            if v_val not in seen_vals:
+                seen_vals.add(v_val)
+                v_vals.append(v_val)
 
-        for v_val, v_attrs in vertex_attrs.items():
-            if not g.has_vertex(v_val):
-                g.add_vertex(v_val)
-            v = g.get_vertex(v_val)
-            for attr, value in v_attrs.items():
-                v.set(attr, value)
+        g = cls()
+        g.add_vertices([(v_val, dict(vertex_attrs[v_val]))
+                        if v_val in vertex_attrs else (v_val,)
+                        for v_val in v_vals])
+
+        # keep the first declaration of each edge
+        unique_edges = {}
+        for edge in edges:
+            unique_edges.setdefault(g._edge_key(edge[0]), edge)
+        g.add_edges(unique_edges.values())
 
         return g
 
@@ -106,30 +527,36 @@ class UndirectedGraph(object):
         """ Generate an undirected graph by turning a directed graph's edges
             into undirected edges and removing duplicate edges """
         g = cls()
+        g.add_vertices((v.val,) for v in directed_graph.vertices)
 
-        for v in directed_graph.vertices:
-            g.add_vertex(v.val)
-
+        unique_edges = {}
         for e in directed_graph.edges:
             v_vals = (e.v_from.val, e.v_to.val)
-            if not g.has_edge(v_vals):
-                g.add_edge(v_vals)
+            unique_edges.setdefault(g._edge_key(v_vals), (v_vals,))
+        g.add_edges(unique_edges.values())
 
         return g
 
     @classmethod
-    def random_graph(cls, vertex_vals, p):
+    def random_graph(cls, vertex_vals, p, seed=None):
         """ Generate a graph using a set of vertex vals where each pair of
             vertices has some probability of having an edge between them """
         g = cls()
-
-        for v_val in vertex_vals:
-            g.add_vertex(v_val)
-
-        for v0 in g.vertices:
-            for v1 in g.vertices:
-                if v0 > v1 and random.random() < p:
-                    g.add_edge((v0.val, v1.val))
+        v_vals = g.add_vertices((v_val,) for v_val in vertex_vals)
+
+        def pairs():
+            # the pair (i, j) with j < i is candidate i * (i - 1) / 2 + j, so
+            # candidates are decoded by walking i forward as they increase
+            i = 1
+            row_start = 0
+            num_candidates = len(v_vals) * (len(v_vals) - 1) // 2
+            for idx in bernoulli_indices(num_candidates, p, make_rng(seed)):
+                while idx >= row_start + i:
+                    row_start += i
+                    i += 1
+                yield ((v_vals[i], v_vals[idx - row_start]),)
+
+        g.add_edges(pairs())
 
         return g
 
@@ -137,25 +564,29 @@ class UndirectedGraph(object):
     def complete_graph(cls, vertex_vals):
         """ Generate a graph with all possible edges using a set of vertex
             vals """
-        return cls.random_graph(vertex_vals, 1.0)
+        g = cls()
+        v_vals = g.add_vertices((v_val,) for v_val in vertex_vals)
+        g.add_edges(((v_vals[i], v_vals[j]),)
+                    for i in xrange(len(v_vals)) for j in xrange(i))
+        return g
 
     @property
     def vertices(self):
-        return iter(self._vertices)
+        return (v for v in self._vertices_by_id if v is not None)
 
     @property
     def edges(self):
-        return iter(self._edges)
+        return self._ids_to_edges.itervalues()
 
     @property
     def num_vertices(self):
         """ Number of vertices in this graph """
-        return len(self._vertices)
+        return len(self._vals_to_ids)
 
     @property
     def num_edges(self):
         """ Number of edges in this graph """
-        return len(self._edges)
+        return len(self._ids_to_edges)
 
     @property
     def average_degree(self):
@@ -168,199 +599,533 @@ class UndirectedGraph(object):
     def is_connected(self):
         """ Checks if this graph has paths from each vertex to each other
             vertex """
-        return (len(self.search(tuple(self._vertices)[0].val)) ==
-                self.num_vertices)
+        if self._components is not None:
+            return self._connected_components().num_sets <= 1
+        start = next(self.vertices, None)
+        if start is None:
+            return True
+        return len(self.search(start.val)) == self.num_vertices
+
+    def track_connectivity(self, track=True):
+        """ Starts (or stops) keeping this graph's connected components in a
+            union-find updated as vertices and edges are added, so that
+            is_connected and are_connected take nearly constant time. Once
+            edges are removed, the union-find is rebuilt when next needed """
+        self._components = (_union_find(self._vertices_by_id,
+                                        self._ids_to_edges) if track
+                            else None)
+        self._components_stale = False
+
+    def _connected_components(self):
+        """ Union-find of this graph's connected components, rebuilt first if
+            edges have been removed since it was last up to date """
+        if self._components_stale:
+            self.track_connectivity()
+        return self._components
+
+    def connected_components(self):
+        """ Labels the connected components of this graph in one pass,
+            returning each vertex val mapped to its component's label (0 up,
+            in order of each component's first vertex), and a list of the
+            number of vertices with each label """
+        if self._components is not None:
+            return _union_find_labels(self._vertices_by_id,
+                                      self._connected_components())
+        return _component_labels(self.vertices, lambda v: v.neighbors)
+
+    def largest_component(self):
+        """ Creates a new graph of this graph's largest connected component
+            (the first one, if several are largest), with all new vertices and
+            edges like clone """
+        labels, sizes = self.connected_components()
+        largest_label = _largest_label(sizes)
+        g = self._empty_graph()
+
+        g.add_vertices((v.val, _copy_attrs(v)) for v in self.vertices
+                       if labels[v.val] == largest_label)
+
+        g.add_edges(((e.endpoints[0].val, e.endpoints[1].val),
+                     _copy_attrs(e)) for e in self.edges
+                    if labels[e.endpoints[0].val] == largest_label)
+
+        if self._components is not None:
+            g.track_connectivity()
+
+        return g
+
+    def are_connected(self, v0_val, v1_val):
+        """ Checks if there is a path between two vertices in this graph """
+        v0_id = self._vals_to_ids[v0_val]
+        v1_id = self._vals_to_ids[v1_val]
+        if self._components is not None:
+            components = self._connected_components()
+            return components.find(v0_id) == components.find(v1_id)
+        return self.search(v0_val, goal_val=v1_val) is not None
+
+    def _empty_graph(self):
+        """ New graph with nothing in it, of the class that clone and similar
+            methods make """
+        return self.__class__()
 
     def clone(self):
         """ Clones this graph """
-        g = self.__class__()
+        g = self._empty_graph()
 
-        for v in self._vertices:
-            g.add_vertex(v.val, attrs=copy.deepcopy(v.attrs))
+        g.add_vertices((v.val, _copy_attrs(v)) for v in self.vertices)
 
-        for e in self._edges:
-            vertices = list(e.vertices)
-            g.add_edge((vertices[0].val, vertices[-1].val),
-                       attrs=copy.deepcopy(e.attrs))
+        g.add_edges(((e.endpoints[0].val, e.endpoints[1].val),
+                     _copy_attrs(e)) for e in self.edges)
+
+        if self._components is not None:
+            g.track_connectivity()
 
         return g
 
+    def freeze(self):
+        """ Creates an immutable compressed sparse row snapshot of this graph,
+            for fast read-only traversals """
+        return FrozenUndirectedGraph.from_graph(self)
+
+    def subgraph_view(self, vertex_filter=None, edge_filter=None):
+        """ Read-only view of the vertices of this graph for which
+            vertex_filter(vertex) is true and the edges between them for which
+            edge_filter(edge) is true, filtered as they are read rather than
+            copied """
+        return UndirectedSubgraphView(self, vertex_filter, edge_filter)
+
+    def induced_subgraph(self, vals):
+        """ Creates a new graph of the vertices of this graph with vals and
+            the edges between them, with all new vertices and edges like
+            clone """
+        v_vals = []
+        positions = {}
+        for v_val in vals:
+            if not self.has_vertex(v_val):
+                raise KeyError(v_val)
+            if v_val not in positions:
+                positions[v_val] = len(v_vals)
+                v_vals.append(v_val)
+        g = self._empty_graph()
+
+        g.add_vertices((v_val, _copy_attrs(self.get_vertex(v_val)))
+                       for v_val in v_vals)
+
+        # each edge is seen from both of its vertices, so only add it from
+        # the one earlier in vals
+        edges = (((v_val, neighbor.val), _copy_attrs(e))
+                 for v_val in v_vals
+                 for neighbor, e in self.get_vertex(v_val).neighbors_with_edges
+                 if positions.get(neighbor.val, -1) >= positions[v_val])
+        g.add_edges(edges)
+
+        if self._components is not None:
+            g.track_connectivity()
+
+        return g
+
+    def _edge_key(self, v_vals):
+        """ Key in self._ids_to_edges of the edge between vertices, or None if
+            either vertex is not in this graph """
+        v0_val, v1_val = v_vals
+        v0_id = self._vals_to_ids.get(v0_val)
+        v1_id = self._vals_to_ids.get(v1_val)
+        if v0_id is None or v1_id is None:
+            return None
+        return (v0_id, v1_id) if v0_id <= v1_id else (v1_id, v0_id)
+
     def has_vertex(self, v_val):
         """ Checks if a certain vertex already exists in this graph """
-        return v_val in self._vals_to_vertices_map
+        return v_val in self._vals_to_ids
 
     def has_edge(self, v_vals):
         """ Checks if a certain edge already exists in this graph """
-        return v_vals in self._vals_to_edges_map
+        return self._edge_key(v_vals) in self._ids_to_edges
 
     def get_vertex(self, v_val):
         """ Gets a vertex in this graph """
-        return self._vals_to_vertices_map.get(v_val)
+        v_id = self._vals_to_ids.get(v_val)
+        return self._vertices_by_id[v_id] if v_id is not None else None
 
     def get_edge(self, v_vals):
         """ Gets an edge between vertices in this graph """
-        return self._vals_to_edges_map.get(v_vals)
+        return self._ids_to_edges.get(self._edge_key(v_vals))
+
+    def _intern(self, v):
+        """ Assigns an id to a new vertex, reusing the ids of removed vertices
+            so that ids stay dense """
+        if self._free_ids:
+            v_id = self._free_ids.pop()
+            self._vertices_by_id[v_id] = v
+        else:
+            v_id = len(self._vertices_by_id)
+            self._vertices_by_id.append(v)
+        self._vals_to_ids[v.val] = v_id
+        if self._components is not None and not self._components_stale:
+            self._components.add(v_id)
 
     def add_vertex(self, v_val=None, attrs=None):
         """ Adds a vertex to this graph """
         if not is_hashable(v_val):
             raise TypeError(str(v_val) + " must be hashable")
         v = UndirectedVertex(val=v_val, attrs=attrs)
-        if self.has_vertex(v_val):
+        if self.has_vertex(v.val):
             raise ValueError(str(v) + " already exists")
 
-        self._vertices.add(v)
-        self._vals_to_vertices_map[v_val] = v
+        self._intern(v)
 
         return v.val
 
     def add_edge(self, v_vals, attrs=None):
         """ Adds an edge between vertices in this graph """
+        if not (isinstance(v_vals, tuple) and len(v_vals) == 2):
+            raise ValueError(str(v_vals) + " must be a tuple of two vals")
         v0_val, v1_val = v_vals
         v0 = self.get_vertex(v0_val)
         v1 = self.get_vertex(v1_val)
         e = UndirectedEdge((v0, v1), attrs=attrs)
-        if self.has_edge((v0_val, v1_val)):
+        edge_key = self._edge_key(v_vals)
+        if edge_key in self._ids_to_edges:
             raise ValueError(str(e) + " already exists")
 
         v0.add_edge(e)
         if not e.is_self_edge:
             v1.add_edge(e)
-        self._edges.add(e)
-        self._vals_to_edges_map[(v0_val, v1_val)] = e
-        self._vals_to_edges_map[(v1_val, v0_val)] = e
+        self._ids_to_edges[edge_key] = e
+        e._watch_weight(self._invalid_weight_edges)
+        if self._components is not None and not self._components_stale:
+            self._components.union(*edge_key)
+
+    def add_vertices(self, vertices):
+        """ Adds many vertices to this graph at once. Every vertex is checked
+            before any is added, and all problems are reported together """
+        malformed = []
+        unhashable = []
+        new_vertices = []
+        with paused_gc():
+            for entry in vertices:
+                if not (isinstance(entry, tuple) and
+                        (len(entry) == 1 or len(entry) == 2)):
+                    malformed.append(entry)
+                elif not is_hashable(entry[0]):
+                    unhashable.append(entry[0])
+                else:
+                    new_vertices.append(UndirectedVertex(*entry))
+        if malformed:
+            m = _listing(malformed) + " must be tuples and have length 1 or 2"
+            raise ValueError(m)
+        if unhashable:
+            raise TypeError(_listing(unhashable) + " must be hashable")
+
+        new_vals = set()
+        duplicates = []
+        for v in new_vertices:
+            if v.val in self._vals_to_ids or v.val in new_vals:
+                duplicates.append(v)
+            new_vals.add(v.val)
+        if duplicates:
+            raise ValueError(_listing(duplicates) + " already exist")
+
+        for v in new_vertices:
+            self._intern(v)
+
+        return [v.val for v in new_vertices]
+
+    def add_edges(self, edges):
+        """ Adds many edges to this graph at once. Every edge is checked before
+            any is added, and all problems are reported together """
+        malformed = []
+        malformed_v_vals = []
+        missing = []
+        duplicates = []
+        # each new edge's key mapped to its attrs
+        new_edges = {}
+        with paused_gc():
+            for entry in edges:
+                if not (isinstance(entry, tuple) and
+                        (len(entry) == 1 or len(entry) == 2)):
+                    malformed.append(entry)
+                    continue
+                if not (isinstance(entry[0], tuple) and len(entry[0]) == 2):
+                    malformed_v_vals.append(entry[0])
+                    continue
+                edge_key = self._edge_key(entry[0])
+                if edge_key is None:
+                    missing.append(entry[0])
+                elif edge_key in self._ids_to_edges or edge_key in new_edges:
+                    duplicates.append(entry[0])
+                else:
+                    new_edges[edge_key] = entry[1] if len(entry) == 2 else None
+        if malformed:
+            m = _listing(malformed) + " must be tuples and have length 1 or 2"
+            raise ValueError(m)
+        if malformed_v_vals:
+            m = _listing(malformed_v_vals) + " must be tuples of two vals"
+            raise ValueError(m)
+        if missing:
+            m = _listing(missing) + " must be between vertices in this graph"
+            raise ValueError(m)
+        if duplicates:
+            raise ValueError(_listing(duplicates) + " already exist")
+
+        vertices_by_id = self._vertices_by_id
+        invalid_weight_edges = self._invalid_weight_edges
+        with paused_gc():
+            for edge_key, attrs in new_edges.iteritems():
+                v0 = vertices_by_id[edge_key[0]]
+                v1 = vertices_by_id[edge_key[1]]
+                e = UndirectedEdge((v0, v1), attrs=attrs)
+                v0.add_edge(e)
+                if v0 != v1:
+                    v1.add_edge(e)
+                self._ids_to_edges[edge_key] = e
+                e._watch_weight(invalid_weight_edges)
+        if self._components is not None and not self._components_stale:
+            for edge_key in new_edges:
+                self._components.union(*edge_key)
 
     def remove_vertex(self, v_val):
         """ Removes a vertex from this graph """
         v = self.get_vertex(v_val)
         for e in set(v.edges):
-            vertices = list(e.vertices)
-            self.remove_edge((vertices[0].val, vertices[-1].val))
-        self._vertices.discard(v)
-        del self._vals_to_vertices_map[v_val]
+            v0, v1 = e.endpoints
+            self.remove_edge((v0.val, v1.val))
+        v_id = self._vals_to_ids.pop(v_val)
+        self._vertices_by_id[v_id] = None
+        self._free_ids.append(v_id)
+        # with its edges gone (or never there), the vertex is in a component
+        # of its own, unless the components are already out of date
+        if self._components is not None and not self._components_stale:
+            self._components.remove(v_id)
 
     def remove_edge(self, v_vals):
         """ Removes an edge between vertices in this graph """
-        v0_val, v1_val = v_vals
-        v0 = self.get_vertex(v0_val)
-        v1 = self.get_vertex(v1_val)
-        e = UndirectedEdge((v0, v1))
+        e = self._ids_to_edges.pop(self._edge_key(v_vals), None)
+        if e is None:
+            raise KeyError(v_vals)
+        v0, v1 = e.endpoints
 
         v0.remove_edge(e)
         if not e.is_self_edge:
             v1.remove_edge(e)
-        self._edges.discard(e)
-        del self._vals_to_edges_map[(v0.val, v1.val)]
-        if not e.is_self_edge:
-            del self._vals_to_edges_map[(v1.val, v0.val)]
+        e._watch_weight(None)
+        # the edge may have been all that joined two parts of a component
+        if self._components is not None:
+            self._components_stale = True
 
-    def search(self, start_val, goal_val=None, method='breadth_first'):
+    def search(self, start_val=None, goal_val=None, method='breadth_first',
+               start_vals=None):
         """ Search for either some goal vertex or all vertices reachable from
-            a source vertex """
-        start = self.get_vertex(start_val)
+            a source vertex. Given start_vals instead of start_val, the search
+            starts from all of them at once, and the val of the start each
+            vertex was reached from is returned too """
+        starts = _get_starts(self, start_val, start_vals)
         goal = self.get_vertex(goal_val)
-        pop_idx = 0 if method == 'breadth_first' else -1
-
-        vertex_queue = [(start, [start])]
-        seen_so_far = set([start])
-        paths = {}
 
-        namify_path = lambda path: [v.val for v in path]
-
-        # handle each vertex until there are no vertices left to check
-        while vertex_queue:
-            current_vertex, current_path = vertex_queue.pop(pop_idx)
-
-            # if searching for a specific vertex, check if this is it
-            if current_vertex == goal:
-                return namify_path(current_path)
+        vertex_queue = deque(starts)
+        pop = (vertex_queue.popleft if method == 'breadth_first'
+               else vertex_queue.pop)
+        # each vertex val reached so far mapped to the val it was reached from
+        predecessors = dict((start.val, None) for start in starts)
+        paths = LazyPaths(predecessors)
 
-            # if this is the first visit to this vertex, store its path
-            if current_vertex not in paths:
-                paths[current_vertex.val] = namify_path(current_path)
+        # handle each vertex until there are no vertices left to check, or
+        # until the goal vertex is reached
+        while vertex_queue and (goal is None or goal.val not in predecessors):
+            current_vertex = pop()
 
             # put this vertex's neighbors onto the back of the queue
             for neighbor in current_vertex.neighbors:
-                if neighbor not in seen_so_far:
-                    new_path = current_path + [neighbor]
-                    vertex_queue.append((neighbor, new_path))
-                    seen_so_far.add(neighbor)
-
-        # if searching for a specific vertex, it was not reachable
-        if goal is not None:
-            return None
-
-        return paths
-
-    def dijkstra(self, start_val, goal_val=None, return_distances=False,
-                 priority_queue=PriorityQueue):
-        """ Find the shortest path to either some goal vertex or to all vertices
-            reachable from a source vertex """
-        for e in self._edges:
-            edge_weight = e.get('weight')
-            if edge_weight is None:
-                raise ValueError(str(e) + " must have a weight")
-            if edge_weight < 0:
-                raise ValueError(str(e) + " must have a non-negative weight")
+                if neighbor.val not in predecessors:
+                    predecessors[neighbor.val] = current_vertex.val
+                    vertex_queue.append(neighbor)
+
+        # if searching for a specific vertex, return its path (or None if it
+        # was not reachable)
+        result = paths.get(goal.val) if goal is not None else paths
+        if start_vals is None:
+            return result
+        return (result, _nearest_sources(predecessors, predecessors))
+
+    def iter_bfs(self, start_val, on_discover=None, on_edge=None,
+                 on_finish=None):
+        """ Lazily traverse the vertices reachable from some vertex breadth
+            first, yielding (val, depth, parent val) as each is discovered """
         start = self.get_vertex(start_val)
+        if start is None:
+            raise KeyError(start_val)
+        return _iter_bfs(start, lambda v: v.neighbors, on_discover, on_edge,
+                         on_finish)
+
+    def iter_dfs(self, start_val, on_discover=None, on_edge=None,
+                 on_finish=None):
+        """ Lazily traverse the vertices reachable from some vertex depth
+            first, yielding (val, depth, parent val) as each is discovered """
+        start = self.get_vertex(start_val)
+        if start is None:
+            raise KeyError(start_val)
+        return _iter_dfs(start, lambda v: v.neighbors, on_discover, on_edge,
+                         on_finish)
+
+    def dijkstra(self, start_val=None, goal_val=None, return_distances=False,
+                 priority_queue=PriorityQueue, method='heap', max_weight=None,
+                 max_distance=None, max_results=None, goal_vals=None,
+                 start_vals=None):
+        """ Find the shortest path to either some goal vertex or to all vertices
+            reachable from a source vertex. With method='dial', weights must be
+            non-negative integers of at most max_weight (found from the edges
+            if not given), and a circular bucket queue is used instead.
+            max_distance, max_results, and goal_vals cut the search off once
+            the next closest vertex is farther than max_distance, once
+            max_results vertices are settled, or once all of goal_vals are
+            settled, and then only the settled vertices are in the results.
+            Given start_vals instead of start_val, every one of them starts at
+            distance 0, and the val of the nearest start to each settled
+            vertex is returned too """
+        _check_weights(self._invalid_weight_edges)
+        if method == 'dial':
+            if priority_queue is not PriorityQueue:
+                m = "priority_queue can't be given with method='dial'"
+                raise ValueError(m)
+            if max_weight is None:
+                max_weight = _max_integer_weight(self.edges)
+            priority_queue = functools.partial(BucketPriorityQueue,
+                                               max_span=max_weight)
+        starts = _get_starts(self, start_val, start_vals)
         goal = self.get_vertex(goal_val)
-
-        distances = {v: float('inf') for v in self}
-        predecessors = {v: -1 for v in self}
-        cloud_so_far = set([start])
-
-        distances[start] = 0
-        predecessors[start] = None
-
-        # relax edges until there are no vertices left not in the cloud
-        vertex_queue = priority_queue(data=[(distances[v], v) for v in self])
+        if goal_val is not None and goal is None:
+            raise KeyError(goal_val)
+        if max_results is not None and max_results < 1:
+            raise ValueError("max_results must be at least 1")
+        remaining_goal_vals = None
+        if goal_vals is not None:
+            remaining_goal_vals = set(goal_vals)
+            for v_val in remaining_goal_vals:
+                if not self.has_vertex(v_val):
+                    raise KeyError(v_val)
+        is_cut_off = (max_distance is not None or max_results is not None or
+                      goal_vals is not None)
+
+        # vertices are only given a distance and a predecessor once they are
+        # reached, and are only in the queue until they join the cloud, so the
+        # work done is proportional to the part of the graph explored
+        distances = dict((start.val, 0) for start in starts)
+        predecessors = dict((start.val, None) for start in starts)
+        cloud_so_far = set()
+
+        # relax edges until there are no reached vertices left out of the cloud
+        vertex_queue = priority_queue(data=[(0, start) for start in starts])
         while vertex_queue:
             # move the closest vertex that's not in the cloud into the cloud
-            _, current_vertex = vertex_queue.pop_min()
+            current_distance, current_vertex = vertex_queue.pop_min()
+            if max_distance is not None and current_distance > max_distance:
+                break
             cloud_so_far.add(current_vertex)
 
             # if searching for a specific vertex, check if this is it
             if current_vertex == goal:
                 break
+            # check the other cutoffs
+            if remaining_goal_vals is not None:
+                remaining_goal_vals.discard(current_vertex.val)
+                if not remaining_goal_vals:
+                    break
+            if max_results is not None and len(cloud_so_far) >= max_results:
+                break
 
             # conditionally relax each of that vertex's edges
-            current_distance = distances[current_vertex]
-            eligible_neighbors = [n for n in current_vertex.neighbors
-                                  if n not in cloud_so_far]
-            for neighbor in eligible_neighbors:
-                current_neighbor_distance = distances[neighbor]
-                e = self.get_edge((current_vertex.val, neighbor.val))
-                new_neighbor_distance = current_distance + e.get('weight')
-                if new_neighbor_distance < current_neighbor_distance:
-                    distances[neighbor] = new_neighbor_distance
-                    predecessors[neighbor] = current_vertex
+            for neighbor, weight in current_vertex.neighbors_with_weights:
+                if weight is None or weight < 0:
+                    raise _relaxed_weight_error(current_vertex, neighbor,
+                                                weight)
+                if neighbor in cloud_so_far:
+                    continue
+                new_neighbor_distance = current_distance + weight
+                if (max_distance is not None and
+                        new_neighbor_distance > max_distance):
+                    continue
+                current_neighbor_distance = distances.get(neighbor.val)
+                if current_neighbor_distance is None:
+                    distances[neighbor.val] = new_neighbor_distance
+                    predecessors[neighbor.val] = current_vertex.val
+                    vertex_queue.insert(neighbor, new_neighbor_distance)
+                elif new_neighbor_distance < current_neighbor_distance:
+                    distances[neighbor.val] = new_neighbor_distance
+                    predecessors[neighbor.val] = current_vertex.val
                     vertex_queue.decrease_key(neighbor, new_neighbor_distance)
 
         # with the algorithm complete, prepare the output
 
-        namify_keys = lambda dic: {v.val: d for v, d in dic.items()}
-        namify_values = lambda dic: {k: v.val if hasattr(v, 'val') else v
-                                     for k, v in dic.items()}
-        namified_distances = namify_keys(distances)
-        namified_predecessors = namify_values(namify_keys(predecessors))
-
         def backtrack(target_val):
             """ Use our predecessor map to get the shortest path from our start
                 to some target """
-            if namified_predecessors[target_val] == -1:
+            if target_val not in predecessors:
+                if not self.has_vertex(target_val):
+                    raise KeyError(target_val)
                 return None
             path = [target_val]
-            while namified_predecessors[path[-1]] is not None:
-                path.append(namified_predecessors[path[-1]])
+            while predecessors[path[-1]] is not None:
+                path.append(predecessors[path[-1]])
             path.reverse()
             return path
 
         if goal_val is not None:
-            return (namified_distances[goal_val] if return_distances
-                                                 else backtrack(goal_val))
+            if goal not in cloud_so_far:
+                result = float('inf') if return_distances else None
+            else:
+                result = (distances[goal_val] if return_distances
+                          else backtrack(goal_val))
+        elif is_cut_off:
+            # only the settled vertices' distances are final
+            if return_distances:
+                result = dict((v.val, distances[v.val]) for v in cloud_so_far)
+            else:
+                result = LazyPaths(dict((v.val, predecessors[v.val])
+                                        for v in cloud_so_far))
         else:
-            return (namified_distances if return_distances
-                                       else keydefaultdict(backtrack))
+            # snapshot the vals, so later changes to this graph don't change
+            # which vals the distances cover
+            result = (LazyDistances(distances, frozenset(self._vals_to_ids))
+                      if return_distances else keydefaultdict(backtrack))
+
+        if start_vals is None:
+            return result
+        settled_vals = [v.val for v in cloud_so_far]
+        return (result, _nearest_sources(predecessors, settled_vals))
+
+    def shortest_path(self, start_val, goal_val, return_distances=False,
+                      priority_queue=PriorityQueue):
+        """ Find the shortest path between two vertices with bidirectional
+            Dijkstra, searching from both ends at once so that usually far
+            fewer vertices are explored than by dijkstra with a goal_val """
+        _check_weights(self._invalid_weight_edges)
+        start = self.get_vertex(start_val)
+        goal = self.get_vertex(goal_val)
+        for v_val, v in [(start_val, start), (goal_val, goal)]:
+            if v is None:
+                raise KeyError(v_val)
+
+        neighbors_with_weights = lambda v: v.neighbors_with_weights
+        distance, path = _bidirectional_dijkstra(
+            start, goal, neighbors_with_weights, neighbors_with_weights,
+            priority_queue)
+        return distance if return_distances else path
+
+    def astar(self, start_val, goal_val, heuristic, return_distances=False,
+              priority_queue=PriorityQueue):
+        """ Find the shortest path between two vertices with A*, where
+            heuristic(vertex, goal_vertex) estimates the distance from a vertex
+            to the goal without ever overestimating it (see
+            graphpy.heuristics) """
+        _check_weights(self._invalid_weight_edges)
+        start = self.get_vertex(start_val)
+        goal = self.get_vertex(goal_val)
+        for v_val, v in [(start_val, start), (goal_val, goal)]:
+            if v is None:
+                raise KeyError(v_val)
+
+        distance, path = _astar(start, goal, lambda v: v.neighbors_with_weights,
+                                heuristic, priority_queue)
+        return distance if return_distances else path
 
 
 ################################################################################
@@ -373,42 +1138,41 @@ class UndirectedGraph(object):
 class DirectedGraph(object):
 
     def __init__(self):
-        self._vertices = set()
-        self._edges = set()
-        self._vals_to_vertices_map = {}
-        self._vals_to_edges_map = {}
+        # vals are interned into dense integer ids, which index
+        # self._vertices_by_id and key all other internal structures
+        self._vals_to_ids = {}
+        self._vertices_by_id = []
+        self._free_ids = []
+        self._ids_to_edges = {}
+        # edges without a valid weight, which the edges keep up to date as
+        # their weights change so dijkstra need not check every edge (an edge
+        # whose weight is fixed through its attrs dict stays until dijkstra
+        # checks it again)
+        self._invalid_weight_edges = set()
+        # union-find of the vertex ids' connected components if connectivity
+        # is tracked (see track_connectivity), otherwise None, along with
+        # whether edges have been removed since it was last brought up to date
+        self._components = None
+        self._components_stale = False
 
     def __str__(self):
-        vertices_str = ", ".join(str(v) for v in self._vertices)
-        edges_str = ", ".join(str(e) for e in self._edges)
+        vertices_str = ", ".join(str(v) for v in self.vertices)
+        edges_str = ", ".join(str(e) for e in self.edges)
         return "Vertices: %s\nEdges: %s" % (vertices_str, edges_str)
 
     def __len__(self):
         return self.num_vertices
 
     def __iter__(self):
-        return iter(self._vertices)
+        return self.vertices
 
     @classmethod
     def from_lists(cls, vertices, edges):
         """ Generate a graph by passing in a list of vertex vals and a list of
             edges between those vertices """
         g = cls()
-
-        for v in vertices:
-            if isinstance(v, tuple) and (len(v) == 1 or len(v) == 2):
-                g.add_vertex(*v)
-            else:
-                m = (str(v) + " must be a tuple and have length 1 or 2")
-                raise ValueError(m)
-
-        for e in edges:
-            if isinstance(e, tuple) and (len(e) == 1 or len(e) == 2):
-                g.add_edge(*e)
-            else:
-                m = (str(e) + " must be a tuple and have length 1 or 2")
-                raise ValueError(m)
-
+        g.add_vertices(vertices)
+        g.add_edges(edges)
         return g
 
     @classmethod
@@ -417,10 +1181,9 @@ class DirectedGraph(object):
             mapped to a set of vals of vertices to which there is an edge """
         vertex_attrs = vertex_attrs or {}
 
-        g = cls()
-
-        for v_val in graph_dict:
-            g.add_vertex(v_val)
+        v_vals = list(graph_dict)
+        seen_vals = set(graph_dict)
+        edges = []
 
         for v_val, out_edge_list in graph_dict.items():
             for out_edge in out_edge_list:
@@ -436,19 +1199,27 @@ class DirectedGraph(object):
                 if not is_hashable(out_val):
                     raise ValueError(str(out_val) + " is not hashable")
 
-                if not g.has_vertex(out_val):
-                    g.add_vertex(out_val)
+                if out_val not in seen_vals:
+                    seen_vals.add(out_val)
+                    v_vals.append(out_val)
+
+                edges.append(((v_val, out_val), edge_attrs))
 
-                v_vals = (v_val, out_val)
-                if not g.has_edge(v_vals):
-                    g.add_edge(v_vals, attrs=edge_attrs)
+        for v_val in vertex_attrs:
+            if v_val not in seen_vals:
+                seen_vals.add(v_val)
+                v_vals.append(v_val)
+
+        g = cls()
+        g.add_vertices([(v_val, dict(vertex_attrs[v_val]))
+                        if v_val in vertex_attrs else (v_val,)
+                        for v_val in v_vals])
 
-        for v_val, v_attrs in vertex_attrs.items():
-            if not g.has_vertex(v_val):
-                g.add_vertex(v_val)
-            v = g.get_vertex(v_val)
-            for attr, value in v_attrs.items():
-                v.set(attr, value)
+        # keep the first declaration of each edge
+        unique_edges = {}
+        for edge in edges:
+            unique_edges.setdefault(g._edge_key(edge[0]), edge)
+        g.add_edges(unique_edges.values())
 
         return g
 
@@ -457,49 +1228,50 @@ class DirectedGraph(object):
         """ Generate a graph by transposing another graph (reversing all of its
             edges) """
         g = cls()
-        for v in transpose_graph.vertices:
-            g.add_vertex(v.val)
-        for e in transpose_graph.edges:
-            g.add_edge((e.v_to.val, e.v_from.val))
+        g.add_vertices((v.val,) for v in transpose_graph.vertices)
+        g.add_edges(((e.v_to.val, e.v_from.val),)
+                    for e in transpose_graph.edges)
         return g
 
     @classmethod
-    def random_graph(cls, vertex_vals, p=0.5):
+    def random_graph(cls, vertex_vals, p=0.5, seed=None):
         """ Generate a graph using a set of vertex vals where each ordered pair
             of vertices has some probability of having an edge from the first to
             the second """
         g = cls()
-        for v_val in vertex_vals:
-            g.add_vertex(v_val)
-        for v0 in g.vertices:
-            for v1 in g.vertices:
-                if random.random() < p:
-                    g.add_edge((v0.val, v1.val))
+        v_vals = g.add_vertices((v_val,) for v_val in vertex_vals)
+        n = len(v_vals)
+        g.add_edges(((v_vals[idx // n], v_vals[idx % n]),)
+                    for idx in bernoulli_indices(n * n, p, make_rng(seed)))
         return g
 
     @classmethod
     def complete_graph(cls, vertex_vals):
         """ Generate a graph with all possible edges using a set of vertex
             vals """
-        return cls.random_graph(vertex_vals, p=1.0)
+        g = cls()
+        v_vals = g.add_vertices((v_val,) for v_val in vertex_vals)
+        g.add_edges(((v_from_val, v_to_val),)
+                    for v_from_val in v_vals for v_to_val in v_vals)
+        return g
 
     @property
     def vertices(self):
-        return iter(self._vertices)
+        return (v for v in self._vertices_by_id if v is not None)
 
     @property
     def edges(self):
-        return iter(self._edges)
+        return self._ids_to_edges.itervalues()
 
     @property
     def num_vertices(self):
         """ Number of vertices in this graph """
-        return len(self._vertices)
+        return len(self._vals_to_ids)
 
     @property
     def num_edges(self):
         """ Number of edges in this graph """
-        return len(self._edges)
+        return len(self._ids_to_edges)
 
     @property
     def average_outs(self):
@@ -519,198 +1291,964 @@ class DirectedGraph(object):
     def is_weakly_connected(self):
         """ Checks if this graph has a path from each vertex to each other
             vertex when treating its edges as undirected """
-        return UndirectedGraph.from_directed_graph(self).is_connected
+        if self._components is not None:
+            return self._connected_components().num_sets <= 1
+        start = next(self.vertices, None)
+        if start is None:
+            return True
+        num_reached = sum(1 for _ in _iter_bfs(start, _outs_and_ins, None,
+                                               None, None))
+        return num_reached == self.num_vertices
+
+    def track_connectivity(self, track=True):
+        """ Starts (or stops) keeping this graph's weakly connected components
+            in a union-find updated as vertices and edges are added, so that
+            is_weakly_connected and are_weakly_connected take nearly constant
+            time. Once edges are removed, the union-find is rebuilt when next
+            needed """
+        self._components = (_union_find(self._vertices_by_id,
+                                        self._ids_to_edges) if track
+                            else None)
+        self._components_stale = False
+
+    def _connected_components(self):
+        """ Union-find of this graph's weakly connected components, rebuilt
+            first if edges have been removed since it was last up to date """
+        if self._components_stale:
+            self.track_connectivity()
+        return self._components
+
+    def weakly_connected_components(self):
+        """ Labels the weakly connected components of this graph in one pass,
+            returning each vertex val mapped to its component's label (0 up,
+            in order of each component's first vertex), and a list of the
+            number of vertices with each label """
+        if self._components is not None:
+            return _union_find_labels(self._vertices_by_id,
+                                      self._connected_components())
+        return _component_labels(self.vertices, _outs_and_ins)
+
+    def largest_component(self):
+        """ Creates a new graph of this graph's largest weakly connected
+            component (the first one, if several are largest), with all new
+            vertices and edges like clone """
+        labels, sizes = self.weakly_connected_components()
+        largest_label = _largest_label(sizes)
+        g = self._empty_graph()
+
+        g.add_vertices((v.val, _copy_attrs(v)) for v in self.vertices
+                       if labels[v.val] == largest_label)
+
+        g.add_edges(((e.v_from.val, e.v_to.val), _copy_attrs(e))
+                    for e in self.edges
+                    if labels[e.v_from.val] == largest_label)
+
+        if self._components is not None:
+            g.track_connectivity()
+
+        return g
+
+    def are_weakly_connected(self, v0_val, v1_val):
+        """ Checks if there is a path between two vertices in this graph when
+            treating its edges as undirected """
+        v0_id = self._vals_to_ids[v0_val]
+        v1_id = self._vals_to_ids[v1_val]
+        if self._components is not None:
+            components = self._connected_components()
+            return components.find(v0_id) == components.find(v1_id)
+        start = self._vertices_by_id[v0_id]
+        return any(v_val == v1_val for v_val, _, _ in
+                   _iter_bfs(start, _outs_and_ins, None, None, None))
 
     @property
     def is_strongly_connected(self):
         """ Checks if this graph has a path from each vertex to each other
             vertex """
-        v_self = tuple(self._vertices)[0]
-        t = self.from_transpose(self)
-        v_t = tuple(t.vertices)[0]
-        return (len(self.search(v_self.val)) == len(t.search(v_t.val)) ==
-                self.num_vertices)
+        # the first component found is a whole component, so the graph is
+        # strongly connected only if it has every vertex
+        components = _iter_strongly_connected_components(self.vertices)
+        return len(next(components, [])) == self.num_vertices
+
+    def strongly_connected_components(self):
+        """ Lists of vals of the vertices in each strongly connected component
+            of this graph, ordered so that no component has an edge into any
+            component before it """
+        components = list(_iter_strongly_connected_components(self.vertices))
+        components.reverse()
+        return [[v.val for v in component] for component in components]
+
+    def condensation(self):
+        """ Directed acyclic graph with a vertex for each strongly connected
+            component of this graph, numbered in the order given by
+            strongly_connected_components and with the component's vals as
+            its 'members' attr, and an edge between components wherever this
+            graph has an edge between their vertices """
+        components = self.strongly_connected_components()
+        component_idxs = {}
+        for component_idx, component in enumerate(components):
+            for v_val in component:
+                component_idxs[v_val] = component_idx
+
+        component_edges = set()
+        for e in self.edges:
+            from_idx = component_idxs[e.v_from.val]
+            to_idx = component_idxs[e.v_to.val]
+            if from_idx != to_idx:
+                component_edges.add((from_idx, to_idx))
+
+        g = self._empty_graph()
+        g.add_vertices((component_idx, {'members': component})
+                       for component_idx, component in enumerate(components))
+        g.add_edges((edge_key,) for edge_key in component_edges)
+        return g
+
+    def _empty_graph(self):
+        """ New graph with nothing in it, of the class that clone and similar
+            methods make """
+        return self.__class__()
 
     def clone(self):
         """ Clones this graph """
-        g = self.__class__()
+        g = self._empty_graph()
+
+        g.add_vertices((v.val, _copy_attrs(v)) for v in self.vertices)
 
-        for v in self._vertices:
-            g.add_vertex(v.val, attrs=copy.deepcopy(v.attrs))
+        g.add_edges(((e.v_from.val, e.v_to.val), _copy_attrs(e))
+                    for e in self.edges)
 
-        for e in self._edges:
-            g.add_edge((e.v_from.val, e.v_to.val), attrs=copy.deepcopy(e.attrs))
+        if self._components is not None:
+            g.track_connectivity()
 
         return g
 
+    def freeze(self):
+        """ Creates an immutable compressed sparse row snapshot of this graph,
+            for fast read-only traversals """
+        return FrozenDirectedGraph.from_graph(self)
+
+    def subgraph_view(self, vertex_filter=None, edge_filter=None):
+        """ Read-only view of the vertices of this graph for which
+            vertex_filter(vertex) is true and the edges between them for which
+            edge_filter(edge) is true, filtered as they are read rather than
+            copied """
+        return DirectedSubgraphView(self, vertex_filter, edge_filter)
+
+    def induced_subgraph(self, vals):
+        """ Creates a new graph of the vertices of this graph with vals and
+            the edges between them, with all new vertices and edges like
+            clone """
+        v_vals = []
+        positions = {}
+        for v_val in vals:
+            if not self.has_vertex(v_val):
+                raise KeyError(v_val)
+            if v_val not in positions:
+                positions[v_val] = len(v_vals)
+                v_vals.append(v_val)
+        g = self._empty_graph()
+
+        g.add_vertices((v_val, _copy_attrs(self.get_vertex(v_val)))
+                       for v_val in v_vals)
+
+        edges = (((v_val, out.val), _copy_attrs(e))
+                 for v_val in v_vals
+                 for out, e in self.get_vertex(v_val).outs_with_edges
+                 if out.val in positions)
+        g.add_edges(edges)
+
+        if self._components is not None:
+            g.track_connectivity()
+
+        return g
+
+    def reversed(self):
+        """ Read-only view of this graph with every edge pointing the other
+            way, which reads through to this graph rather than copying it like
+            from_transpose """
+        return ReversedGraphView(self)
+
+    def as_undirected(self):
+        """ Read-only view of this graph with its edges treated as undirected,
+            which reads through to this graph rather than copying it like
+            UndirectedGraph.from_directed_graph. Where two vertices have edges
+            both ways, the lighter one stands for both """
+        return UndirectedGraphView(self)
+
+    def _edge_key(self, v_vals):
+        """ Key in self._ids_to_edges of the edge from one vertex to another,
+            or None if either vertex is not in this graph """
+        v_from_val, v_to_val = v_vals
+        v_from_id = self._vals_to_ids.get(v_from_val)
+        v_to_id = self._vals_to_ids.get(v_to_val)
+        if v_from_id is None or v_to_id is None:
+            return None
+        return (v_from_id, v_to_id)
+
     def has_vertex(self, v_val):
         """ Checks if a certain vertex already exists in this graph """
-        return v_val in self._vals_to_vertices_map
+        return v_val in self._vals_to_ids
 
     def has_edge(self, v_vals):
         """ Checks if a certain edge already exists in this graph """
-        return v_vals in self._vals_to_edges_map
+        return self._edge_key(v_vals) in self._ids_to_edges
 
     def get_vertex(self, v_val):
         """ Gets a vertex in this graph """
-        return self._vals_to_vertices_map.get(v_val)
+        v_id = self._vals_to_ids.get(v_val)
+        return self._vertices_by_id[v_id] if v_id is not None else None
 
     def get_edge(self, v_vals):
         """ Gets an edge between vertices in this graph """
-        return self._vals_to_edges_map.get(v_vals)
+        return self._ids_to_edges.get(self._edge_key(v_vals))
+
+    def _intern(self, v):
+        """ Assigns an id to a new vertex, reusing the ids of removed vertices
+            so that ids stay dense """
+        if self._free_ids:
+            v_id = self._free_ids.pop()
+            self._vertices_by_id[v_id] = v
+        else:
+            v_id = len(self._vertices_by_id)
+            self._vertices_by_id.append(v)
+        self._vals_to_ids[v.val] = v_id
+        if self._components is not None and not self._components_stale:
+            self._components.add(v_id)
 
     def add_vertex(self, v_val=None, attrs=None):
         """ Adds a vertex to this graph """
         if not is_hashable(v_val):
             raise TypeError(str(v_val) + " must be hashable")
         v = DirectedVertex(val=v_val, attrs=attrs)
-        if self.has_vertex(v_val):
+        if self.has_vertex(v.val):
             raise ValueError(str(v) + " already exists")
 
-        self._vertices.add(v)
-        self._vals_to_vertices_map[v_val] = v
+        self._intern(v)
 
         return v.val
 
     def add_edge(self, v_vals, attrs=None):
         """ Adds an edge from one vertex in this graph to another """
+        if not (isinstance(v_vals, tuple) and len(v_vals) == 2):
+            raise ValueError(str(v_vals) + " must be a tuple of two vals")
         v_from_val, v_to_val = v_vals
         v_from = self.get_vertex(v_from_val)
         v_to = self.get_vertex(v_to_val)
         e = DirectedEdge((v_from, v_to), attrs=attrs)
-        if self.has_edge((v_from_val, v_to_val)):
+        edge_key = self._edge_key(v_vals)
+        if edge_key in self._ids_to_edges:
             raise ValueError(str(e) + " already exists")
 
         v_from.add_edge(e)
         if v_from != v_to:
             v_to.add_edge(e)
-        self._edges.add(e)
-        self._vals_to_edges_map[(v_from.val, v_to.val)] = e
+        self._ids_to_edges[edge_key] = e
+        e._watch_weight(self._invalid_weight_edges)
+        if self._components is not None and not self._components_stale:
+            self._components.union(*edge_key)
+
+    def add_vertices(self, vertices):
+        """ Adds many vertices to this graph at once. Every vertex is checked
+            before any is added, and all problems are reported together """
+        malformed = []
+        unhashable = []
+        new_vertices = []
+        with paused_gc():
+            for entry in vertices:
+                if not (isinstance(entry, tuple) and
+                        (len(entry) == 1 or len(entry) == 2)):
+                    malformed.append(entry)
+                elif not is_hashable(entry[0]):
+                    unhashable.append(entry[0])
+                else:
+                    new_vertices.append(DirectedVertex(*entry))
+        if malformed:
+            m = _listing(malformed) + " must be tuples and have length 1 or 2"
+            raise ValueError(m)
+        if unhashable:
+            raise TypeError(_listing(unhashable) + " must be hashable")
+
+        new_vals = set()
+        duplicates = []
+        for v in new_vertices:
+            if v.val in self._vals_to_ids or v.val in new_vals:
+                duplicates.append(v)
+            new_vals.add(v.val)
+        if duplicates:
+            raise ValueError(_listing(duplicates) + " already exist")
+
+        for v in new_vertices:
+            self._intern(v)
+
+        return [v.val for v in new_vertices]
+
+    def add_edges(self, edges):
+        """ Adds many edges to this graph at once. Every edge is checked before
+            any is added, and all problems are reported together """
+        malformed = []
+        malformed_v_vals = []
+        missing = []
+        duplicates = []
+        # each new edge's key mapped to its attrs
+        new_edges = {}
+        with paused_gc():
+            for entry in edges:
+                if not (isinstance(entry, tuple) and
+                        (len(entry) == 1 or len(entry) == 2)):
+                    malformed.append(entry)
+                    continue
+                if not (isinstance(entry[0], tuple) and len(entry[0]) == 2):
+                    malformed_v_vals.append(entry[0])
+                    continue
+                edge_key = self._edge_key(entry[0])
+                if edge_key is None:
+                    missing.append(entry[0])
+                elif edge_key in self._ids_to_edges or edge_key in new_edges:
+                    duplicates.append(entry[0])
+                else:
+                    new_edges[edge_key] = entry[1] if len(entry) == 2 else None
+        if malformed:
+            m = _listing(malformed) + " must be tuples and have length 1 or 2"
+            raise ValueError(m)
+        if malformed_v_vals:
+            m = _listing(malformed_v_vals) + " must be tuples of two vals"
+            raise ValueError(m)
+        if missing:
+            m = _listing(missing) + " must be between vertices in this graph"
+            raise ValueError(m)
+        if duplicates:
+            raise ValueError(_listing(duplicates) + " already exist")
+
+        vertices_by_id = self._vertices_by_id
+        invalid_weight_edges = self._invalid_weight_edges
+        with paused_gc():
+            for edge_key, attrs in new_edges.iteritems():
+                v_from = vertices_by_id[edge_key[0]]
+                v_to = vertices_by_id[edge_key[1]]
+                e = DirectedEdge((v_from, v_to), attrs=attrs)
+                v_from.add_edge(e)
+                if v_from != v_to:
+                    v_to.add_edge(e)
+                self._ids_to_edges[edge_key] = e
+                e._watch_weight(invalid_weight_edges)
+        if self._components is not None and not self._components_stale:
+            for edge_key in new_edges:
+                self._components.union(*edge_key)
 
     def remove_vertex(self, v_val):
         """ Removes a vertex from this graph """
         v = self.get_vertex(v_val)
         for e in set(v.edges):
             self.remove_edge((e.v_from.val, e.v_to.val))
-        self._vertices.discard(v)
-        del self._vals_to_vertices_map[v_val]
+        v_id = self._vals_to_ids.pop(v_val)
+        self._vertices_by_id[v_id] = None
+        self._free_ids.append(v_id)
+        # with its edges gone (or never there), the vertex is in a component
+        # of its own, unless the components are already out of date
+        if self._components is not None and not self._components_stale:
+            self._components.remove(v_id)
 
     def remove_edge(self, v_vals):
         """ Removes an edge from one vertex in this graph to another """
-        v_from_val, v_to_val = v_vals
-        v_from = self.get_vertex(v_from_val)
-        v_to = self.get_vertex(v_to_val)
-        e = DirectedEdge((v_from, v_to))
-
-        v_from.remove_edge(e)
-        v_to.remove_edge(e)
-        self._edges.discard(e)
-        del self._vals_to_edges_map[(v_from.val, v_to.val)]
-
-    def search(self, start_val, goal_val=None, method='breadth_first'):
+        e = self._ids_to_edges.pop(self._edge_key(v_vals), None)
+        if e is None:
+            raise KeyError(v_vals)
+
+        e.v_from.remove_edge(e)
+        e.v_to.remove_edge(e)
+        e._watch_weight(None)
+        # the edge may have been all that joined two parts of a component
+        if self._components is not None:
+            self._components_stale = True
+
+    def search(self, start_val=None, goal_val=None, method='breadth_first',
+               start_vals=None):
         """ Search for either some goal vertex or all vertices reachable from
-            some vertex """
-        start = self.get_vertex(start_val)
+            some vertex. Given start_vals instead of start_val, the search
+            starts from all of them at once, and the val of the start each
+            vertex was reached from is returned too """
+        starts = _get_starts(self, start_val, start_vals)
         goal = self.get_vertex(goal_val)
-        pop_idx = 0 if method == 'breadth_first' else -1
 
-        vertex_queue = [(start, [start])]
-        seen_so_far = set([start])
-        paths = {}
+        vertex_queue = deque(starts)
+        pop = (vertex_queue.popleft if method == 'breadth_first'
+               else vertex_queue.pop)
+        # each vertex val reached so far mapped to the val it was reached from
+        predecessors = dict((start.val, None) for start in starts)
+        paths = LazyPaths(predecessors)
 
-        namify_path = lambda path: [v.val for v in path]
-
-        # handle each vertex until there are no vertices left to check
-        while vertex_queue:
-            current_vertex, current_path = vertex_queue.pop(pop_idx)
-
-            # if searching for a specific vertex, check if this is it
-            if current_vertex == goal:
-                return namify_path(current_path)
-
-            # if this is the first visit to this vertex, store its path
-            if current_vertex not in paths:
-                paths[current_vertex.val] = namify_path(current_path)
+        # handle each vertex until there are no vertices left to check, or
+        # until the goal vertex is reached
+        while vertex_queue and (goal is None or goal.val not in predecessors):
+            current_vertex = pop()
 
             # put the vertices this vertex points to onto the back of the queue
             for out in current_vertex.outs:
-                if out not in seen_so_far:
-                    new_path = current_path + [out]
-                    vertex_queue.append((out, new_path))
-                    seen_so_far.add(out)
-
-        # if searching for a specific vertex, it was not reachable
-        if goal is not None:
-            return None
-
-        return paths
-
-    def dijkstra(self, start_val, goal_val=None, return_distances=False,
-                 priority_queue=PriorityQueue):
-        """ Find the shortest path to either some goal vertex or to all vertices
-            reachable from a source vertex """
-        for e in self._edges:
-            edge_weight = e.get('weight')
-            if edge_weight is None:
-                raise ValueError(str(e) + " must have a weight")
-            if edge_weight < 0:
-                raise ValueError(str(e) + " must have a non-negative weight")
+                if out.val not in predecessors:
+                    predecessors[out.val] = current_vertex.val
+                    vertex_queue.append(out)
+
+        # if searching for a specific vertex, return its path (or None if it
+        # was not reachable)
+        result = paths.get(goal.val) if goal is not None else paths
+        if start_vals is None:
+            return result
+        return (result, _nearest_sources(predecessors, predecessors))
+
+    def iter_bfs(self, start_val, on_discover=None, on_edge=None,
+                 on_finish=None):
+        """ Lazily traverse the vertices reachable from some vertex breadth
+            first, yielding (val, depth, parent val) as each is discovered """
+        start = self.get_vertex(start_val)
+        if start is None:
+            raise KeyError(start_val)
+        return _iter_bfs(start, lambda v: v.outs, on_discover, on_edge,
+                         on_finish)
+
+    def iter_dfs(self, start_val, on_discover=None, on_edge=None,
+                 on_finish=None):
+        """ Lazily traverse the vertices reachable from some vertex depth
+            first, yielding (val, depth, parent val) as each is discovered """
         start = self.get_vertex(start_val)
+        if start is None:
+            raise KeyError(start_val)
+        return _iter_dfs(start, lambda v: v.outs, on_discover, on_edge,
+                         on_finish)
+
+    def dijkstra(self, start_val=None, goal_val=None, return_distances=False,
+                 priority_queue=PriorityQueue, method='heap', max_weight=None,
+                 max_distance=None, max_results=None, goal_vals=None,
+                 start_vals=None):
+        """ Find the shortest path to either some goal vertex or to all vertices
+            reachable from a source vertex. With method='dial', weights must be
+            non-negative integers of at most max_weight (found from the edges
+            if not given), and a circular bucket queue is used instead.
+            max_distance, max_results, and goal_vals cut the search off once
+            the next closest vertex is farther than max_distance, once
+            max_results vertices are settled, or once all of goal_vals are
+            settled, and then only the settled vertices are in the results.
+            Given start_vals instead of start_val, every one of them starts at
+            distance 0, and the val of the nearest start to each settled
+            vertex is returned too """
+        _check_weights(self._invalid_weight_edges)
+        if method == 'dial':
+            if priority_queue is not PriorityQueue:
+                m = "priority_queue can't be given with method='dial'"
+                raise ValueError(m)
+            if max_weight is None:
+                max_weight = _max_integer_weight(self.edges)
+            priority_queue = functools.partial(BucketPriorityQueue,
+                                               max_span=max_weight)
+        starts = _get_starts(self, start_val, start_vals)
         goal = self.get_vertex(goal_val)
-
-        distances = {v: float('inf') for v in self}
-        predecessors = {v: -1 for v in self}
-        cloud_so_far = set([start])
-
-        distances[start] = 0
-        predecessors[start] = None
-
-        # relax edges until there are no vertices left not in the cloud
-        vertex_queue = priority_queue(data=[(distances[v], v) for v in self])
+        if goal_val is not None and goal is None:
+            raise KeyError(goal_val)
+        if max_results is not None and max_results < 1:
+            raise ValueError("max_results must be at least 1")
+        remaining_goal_vals = None
+        if goal_vals is not None:
+            remaining_goal_vals = set(goal_vals)
+            for v_val in remaining_goal_vals:
+                if not self.has_vertex(v_val):
+                    raise KeyError(v_val)
+        is_cut_off = (max_distance is not None or max_results is not None or
+                      goal_vals is not None)
+
+        # vertices are only given a distance and a predecessor once they are
+        # reached, and are only in the queue until they join the cloud, so the
+        # work done is proportional to the part of the graph explored
+        distances = dict((start.val, 0) for start in starts)
+        predecessors = dict((start.val, None) for start in starts)
+        cloud_so_far = set()
+
+        # relax edges until there are no reached vertices left out of the cloud
+        vertex_queue = priority_queue(data=[(0, start) for start in starts])
         while vertex_queue:
             # move the closest vertex that's not in the cloud into the cloud
-            _, current_vertex = vertex_queue.pop_min()
+            current_distance, current_vertex = vertex_queue.pop_min()
+            if max_distance is not None and current_distance > max_distance:
+                break
             cloud_so_far.add(current_vertex)
 
             # if searching for a specific vertex, check if this is it
             if current_vertex == goal:
                 break
+            # check the other cutoffs
+            if remaining_goal_vals is not None:
+                remaining_goal_vals.discard(current_vertex.val)
+                if not remaining_goal_vals:
+                    break
+            if max_results is not None and len(cloud_so_far) >= max_results:
+                break
 
             # conditionally relax each of that vertex's edges
-            current_distance = distances[current_vertex]
-            eligible_outs = [n for n in current_vertex.outs
-                             if n not in cloud_so_far]
-            for out in eligible_outs:
-                current_out_distance = distances[out]
-                e = self.get_edge((current_vertex.val, out.val))
-                new_out_distance = current_distance + e.get('weight')
-                if new_out_distance < current_out_distance:
-                    distances[out] = new_out_distance
-                    predecessors[out] = current_vertex
+            for out, weight in current_vertex.outs_with_weights:
+                if weight is None or weight < 0:
+                    raise _relaxed_weight_error(current_vertex, out, weight)
+                if out in cloud_so_far:
+                    continue
+                new_out_distance = current_distance + weight
+                if (max_distance is not None and
+                        new_out_distance > max_distance):
+                    continue
+                current_out_distance = distances.get(out.val)
+                if current_out_distance is None:
+                    distances[out.val] = new_out_distance
+                    predecessors[out.val] = current_vertex.val
+                    vertex_queue.insert(out, new_out_distance)
+                elif new_out_distance < current_out_distance:
+                    distances[out.val] = new_out_distance
+                    predecessors[out.val] = current_vertex.val
                     vertex_queue.decrease_key(out, new_out_distance)
 
         # with the algorithm complete, prepare the output
 
-        namify_keys = lambda dic: {v.val: d for v, d in dic.items()}
-        namify_values = lambda dic: {k: v.val if hasattr(v, 'val') else v
-                                     for k, v in dic.items()}
-        namified_distances = namify_keys(distances)
-        namified_predecessors = namify_values(namify_keys(predecessors))
-
         def backtrack(target_val):
             """ Use our predecessor map to get the shortest path from our start
                 to some target """
-            if namified_predecessors[target_val] == -1:
+            if target_val not in predecessors:
+                if not self.has_vertex(target_val):
+                    raise KeyError(target_val)
                 return None
             path = [target_val]
-            while namified_predecessors[path[-1]] is not None:
-                path.append(namified_predecessors[path[-1]])
+            while predecessors[path[-1]] is not None:
+                path.append(predecessors[path[-1]])
             path.reverse()
             return path
 
         if goal_val is not None:
-            return (namified_distances[goal_val] if return_distances
-                                                 else backtrack(goal_val))
+            if goal not in cloud_so_far:
+                result = float('inf') if return_distances else None
+            else:
+                result = (distances[goal_val] if return_distances
+                          else backtrack(goal_val))
+        elif is_cut_off:
+            # only the settled vertices' distances are final
+            if return_distances:
+                result = dict((v.val, distances[v.val]) for v in cloud_so_far)
+            else:
+                result = LazyPaths(dict((v.val, predecessors[v.val])
+                                        for v in cloud_so_far))
         else:
-            return (namified_distances if return_distances
-                                       else keydefaultdict(backtrack))
+            # snapshot the vals, so later changes to this graph don't change
+            # which vals the distances cover
+            result = (LazyDistances(distances, frozenset(self._vals_to_ids))
+                      if return_distances else keydefaultdict(backtrack))
+
+        if start_vals is None:
+            return result
+        settled_vals = [v.val for v in cloud_so_far]
+        return (result, _nearest_sources(predecessors, settled_vals))
+
+    def shortest_path(self, start_val, goal_val, return_distances=False,
+                      priority_queue=PriorityQueue):
+        """ Find the shortest path between two vertices with bidirectional
+            Dijkstra, searching from both ends at once so that usually far
+            fewer vertices are explored than by dijkstra with a goal_val """
+        _check_weights(self._invalid_weight_edges)
+        start = self.get_vertex(start_val)
+        goal = self.get_vertex(goal_val)
+        for v_val, v in [(start_val, start), (goal_val, goal)]:
+            if v is None:
+                raise KeyError(v_val)
+
+        distance, path = _bidirectional_dijkstra(
+            start, goal, lambda v: v.outs_with_weights,
+            lambda v: v.ins_with_weights, priority_queue)
+        return distance if return_distances else path
+
+    def astar(self, start_val, goal_val, heuristic, return_distances=False,
+              priority_queue=PriorityQueue):
+        """ Find the shortest path between two vertices with A*, where
+            heuristic(vertex, goal_vertex) estimates the distance from a vertex
+            to the goal without ever overestimating it (see
+            graphpy.heuristics) """
+        _check_weights(self._invalid_weight_edges)
+        start = self.get_vertex(start_val)
+        goal = self.get_vertex(goal_val)
+        for v_val, v in [(start_val, start), (goal_val, goal)]:
+            if v is None:
+                raise KeyError(v_val)
+
+        distance, path = _astar(start, goal, lambda v: v.outs_with_weights,
+                                heuristic, priority_queue)
+        return distance if return_distances else path
+
+
+################################################################################
+#                                                                              #
+#                                    Views                                     #
+#                                                                              #
+################################################################################
+
+
+def _keep_all(_):
+    return True
+
+
+class _SubgraphVals(object):
+    """ Vals of a subgraph view's vertices, standing in for the dict of vals
+        to ids that graphs keep """
+
+    def __init__(self, view):
+        self._view = view
+
+    def __contains__(self, v_val):
+        return self._view.has_vertex(v_val)
+
+    def __iter__(self):
+        return (v.val for v in self._view.vertices)
+
+    def __len__(self):
+        return self._view.num_vertices
+
+
+class _GraphView(object):
+    """ Read-only graph reinterpreting the vertices and edges of some other
+        graph, which changes to that graph show through. Clone a view to get
+        a graph that can be changed """
+
+    def __init__(self, graph):
+        self._graph = graph
+        self._components = None
+        self._components_stale = False
+
+    @property
+    def _vals_to_ids(self):
+        # dijkstra's distances map every val in here
+        return self._graph._vals_to_ids
+
+    @property
+    def num_vertices(self):
+        """ Number of vertices in this graph """
+        return self._graph.num_vertices
+
+    def has_vertex(self, v_val):
+        """ Checks if a certain vertex already exists in this graph """
+        return self._graph.has_vertex(v_val)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(self.__class__.__name__ + " is read-only")
+
+    add_vertex = add_edge = add_vertices = add_edges = _read_only
+    remove_vertex = remove_edge = track_connectivity = _read_only
+
+
+class ReversedGraphView(_GraphView, DirectedGraph):
+    """ Directed graph with the edges of another directed graph pointing the
+        other way, made by g.reversed() """
+
+    @property
+    def _invalid_weight_edges(self):
+        return set(itertools.imap(ReversedEdgeView,
+                                  self._graph._invalid_weight_edges))
+
+    @property
+    def vertices(self):
+        return itertools.imap(ReversedVertexView, self._graph.vertices)
+
+    @property
+    def edges(self):
+        return itertools.imap(ReversedEdgeView, self._graph.edges)
+
+    @property
+    def num_edges(self):
+        """ Number of edges in this graph """
+        return self._graph.num_edges
+
+    @property
+    def is_weakly_connected(self):
+        """ Checks if this graph has a path from each vertex to each other
+            vertex when treating its edges as undirected """
+        return self._graph.is_weakly_connected
+
+    def weakly_connected_components(self):
+        """ Labels the weakly connected components of this graph, which are
+            those of the graph it views """
+        return self._graph.weakly_connected_components()
+
+    def are_weakly_connected(self, v0_val, v1_val):
+        """ Checks if there is a path between two vertices in this graph when
+            treating its edges as undirected """
+        return self._graph.are_weakly_connected(v0_val, v1_val)
+
+    @property
+    def is_strongly_connected(self):
+        """ Checks if this graph has a path from each vertex to each other
+            vertex """
+        return self._graph.is_strongly_connected
+
+    def _empty_graph(self):
+        return DirectedGraph()
+
+    def has_edge(self, v_vals):
+        """ Checks if a certain edge already exists in this graph """
+        v_from_val, v_to_val = v_vals
+        return self._graph.has_edge((v_to_val, v_from_val))
+
+    def get_vertex(self, v_val):
+        """ Gets a vertex in this graph """
+        v = self._graph.get_vertex(v_val)
+        return ReversedVertexView(v) if v is not None else None
+
+    def get_edge(self, v_vals):
+        """ Gets an edge between vertices in this graph """
+        v_from_val, v_to_val = v_vals
+        e = self._graph.get_edge((v_to_val, v_from_val))
+        return ReversedEdgeView(e) if e is not None else None
+
+    def reversed(self):
+        """ The graph this view reverses """
+        return self._graph
+
+
+class UndirectedGraphView(_GraphView, UndirectedGraph):
+    """ Undirected graph with the edges of a directed graph, made by
+        g.as_undirected(). Where two vertices have edges both ways, the
+        lighter edge stands for both """
+
+    def _keeps_edge(self, e):
+        """ Checks if an edge of the viewed graph is in this graph, which it
+            isn't if a lighter edge the other way stands for it """
+        reverse_e = self._graph.get_edge((e.v_to.val, e.v_from.val))
+        return reverse_e is None or _lighter_edge(e, reverse_e) is e
+
+    @property
+    def _invalid_weight_edges(self):
+        return set(UndirectedEdgeView(e)
+                   for e in self._graph._invalid_weight_edges
+                   if self._keeps_edge(e))
+
+    @property
+    def vertices(self):
+        return itertools.imap(UndirectedVertexView, self._graph.vertices)
+
+    @property
+    def edges(self):
+        return itertools.imap(UndirectedEdgeView,
+                              itertools.ifilter(self._keeps_edge,
+                                                self._graph.edges))
+
+    @property
+    def num_edges(self):
+        """ Number of edges in this graph, counted by going through them """
+        return sum(1 for _ in self.edges)
+
+    @property
+    def is_connected(self):
+        """ Checks if this graph has paths from each vertex to each other
+            vertex """
+        return self._graph.is_weakly_connected
+
+    def connected_components(self):
+        """ Labels the connected components of this graph, which are the
+            weakly connected components of the graph it views """
+        return self._graph.weakly_connected_components()
+
+    def are_connected(self, v0_val, v1_val):
+        """ Checks if there is a path between two vertices in this graph """
+        return self._graph.are_weakly_connected(v0_val, v1_val)
+
+    def _empty_graph(self):
+        return UndirectedGraph()
+
+    def has_edge(self, v_vals):
+        """ Checks if a certain edge already exists in this graph """
+        v0_val, v1_val = v_vals
+        return (self._graph.has_edge((v0_val, v1_val)) or
+                self._graph.has_edge((v1_val, v0_val)))
+
+    def get_vertex(self, v_val):
+        """ Gets a vertex in this graph """
+        v = self._graph.get_vertex(v_val)
+        return UndirectedVertexView(v) if v is not None else None
+
+    def get_edge(self, v_vals):
+        """ Gets an edge between vertices in this graph """
+        v0_val, v1_val = v_vals
+        e = self._graph.get_edge((v0_val, v1_val))
+        reverse_e = self._graph.get_edge((v1_val, v0_val))
+        if e is None:
+            e = reverse_e
+        elif reverse_e is not None:
+            e = _lighter_edge(e, reverse_e)
+        return UndirectedEdgeView(e) if e is not None else None
+
+
+class UndirectedSubgraphView(_GraphView, UndirectedGraph):
+    """ Undirected graph with the vertices of another undirected graph that
+        pass vertex_filter and the edges between them that pass edge_filter,
+        made by g.subgraph_view() """
+
+    def __init__(self, graph, vertex_filter=None, edge_filter=None):
+        _GraphView.__init__(self, graph)
+        self._vertex_filter = vertex_filter or _keep_all
+        self._edge_filter = edge_filter or _keep_all
+
+    @property
+    def _vals_to_ids(self):
+        return _SubgraphVals(self)
+
+    @property
+    def _invalid_weight_edges(self):
+        return set(e for e in self._graph._invalid_weight_edges
+                   if self._keeps_edge(e))
+
+    @property
+    def vertices(self):
+        return (self._view_vertex(v) for v in self._graph.vertices
+                if self._vertex_filter(v))
+
+    @property
+    def edges(self):
+        return (self._view_edge(e) for e in self._graph.edges
+                if self._keeps_edge(e))
+
+    @property
+    def num_vertices(self):
+        """ Number of vertices in this graph, counted by going through the
+            viewed graph's vertices """
+        return sum(1 for _ in self.vertices)
+
+    @property
+    def num_edges(self):
+        """ Number of edges in this graph, counted by going through the
+            viewed graph's edges """
+        return sum(1 for _ in self.edges)
+
+    def are_connected(self, v0_val, v1_val):
+        """ Checks if there is a path between two vertices in this graph """
+        for v_val in [v0_val, v1_val]:
+            if not self.has_vertex(v_val):
+                raise KeyError(v_val)
+        return self.search(v0_val, goal_val=v1_val) is not None
+
+    def _empty_graph(self):
+        return self._graph._empty_graph()
+
+    def _keeps_edge(self, e):
+        v0, v1 = e.endpoints
+        return (self._edge_filter(e) and self._vertex_filter(v0) and
+                self._vertex_filter(v1))
+
+    def _view_vertex(self, v):
+        return SubgraphUndirectedVertexView(v, self._vertex_filter,
+                                            self._edge_filter)
+
+    def _view_edge(self, e):
+        return SubgraphUndirectedEdgeView(e, self._vertex_filter,
+                                          self._edge_filter)
+
+    def has_vertex(self, v_val):
+        """ Checks if a certain vertex already exists in this graph """
+        v = self._graph.get_vertex(v_val)
+        return v is not None and self._vertex_filter(v)
+
+    def has_edge(self, v_vals):
+        """ Checks if a certain edge already exists in this graph """
+        e = self._graph.get_edge(v_vals)
+        return e is not None and self._keeps_edge(e)
+
+    def get_vertex(self, v_val):
+        """ Gets a vertex in this graph """
+        v = self._graph.get_vertex(v_val)
+        if v is None or not self._vertex_filter(v):
+            return None
+        return self._view_vertex(v)
+
+    def get_edge(self, v_vals):
+        """ Gets an edge between vertices in this graph """
+        e = self._graph.get_edge(v_vals)
+        if e is None or not self._keeps_edge(e):
+            return None
+        return self._view_edge(e)
+
+
+class DirectedSubgraphView(_GraphView, DirectedGraph):
+    """ Directed graph with the vertices of another directed graph that pass
+        vertex_filter and the edges between them that pass edge_filter, made
+        by g.subgraph_view() """
+
+    def __init__(self, graph, vertex_filter=None, edge_filter=None):
+        _GraphView.__init__(self, graph)
+        self._vertex_filter = vertex_filter or _keep_all
+        self._edge_filter = edge_filter or _keep_all
+
+    @property
+    def _vals_to_ids(self):
+        return _SubgraphVals(self)
+
+    @property
+    def _invalid_weight_edges(self):
+        return set(e for e in self._graph._invalid_weight_edges
+                   if self._keeps_edge(e))
+
+    @property
+    def vertices(self):
+        return (self._view_vertex(v) for v in self._graph.vertices
+                if self._vertex_filter(v))
+
+    @property
+    def edges(self):
+        return (self._view_edge(e) for e in self._graph.edges
+                if self._keeps_edge(e))
+
+    @property
+    def num_vertices(self):
+        """ Number of vertices in this graph, counted by going through the
+            viewed graph's vertices """
+        return sum(1 for _ in self.vertices)
+
+    @property
+    def num_edges(self):
+        """ Number of edges in this graph, counted by going through the
+            viewed graph's edges """
+        return sum(1 for _ in self.edges)
+
+    def are_weakly_connected(self, v0_val, v1_val):
+        """ Checks if there is a path between two vertices in this graph when
+            treating its edges as undirected """
+        for v_val in [v0_val, v1_val]:
+            if not self.has_vertex(v_val):
+                raise KeyError(v_val)
+        return any(v_val == v1_val for v_val, _, _ in
+                   _iter_bfs(self.get_vertex(v0_val), _outs_and_ins, None,
+                             None, None))
+
+    def _empty_graph(self):
+        return self._graph._empty_graph()
+
+    def _keeps_edge(self, e):
+        return (self._edge_filter(e) and self._vertex_filter(e.v_from) and
+                self._vertex_filter(e.v_to))
+
+    def _view_vertex(self, v):
+        return SubgraphDirectedVertexView(v, self._vertex_filter,
+                                          self._edge_filter)
+
+    def _view_edge(self, e):
+        return SubgraphDirectedEdgeView(e, self._vertex_filter,
+                                        self._edge_filter)
+
+    def has_vertex(self, v_val):
+        """ Checks if a certain vertex already exists in this graph """
+        v = self._graph.get_vertex(v_val)
+        return v is not None and self._vertex_filter(v)
+
+    def has_edge(self, v_vals):
+        """ Checks if a certain edge already exists in this graph """
+        e = self._graph.get_edge(v_vals)
+        return e is not None and self._keeps_edge(e)
+
+    def get_vertex(self, v_val):
+        """ Gets a vertex in this graph """
+        v = self._graph.get_vertex(v_val)
+        if v is None or not self._vertex_filter(v):
+            return None
+        return self._view_vertex(v)
+
+    def get_edge(self, v_vals):
+        """ Gets an edge between vertices in this graph """
+        e = self._graph.get_edge(v_vals)
+        if e is None or not self._keeps_edge(e):
+            return None
+        return self._view_edge(e)
@@ -1,10 +1,19 @@
 """
 Helpers for edge.py, vertex.py, and graph.py
 """
-__all__ = ['is_hashable', 'keydefaultdict', 'PriorityQueue']
+__all__ = ['is_hashable', 'keydefaultdict', 'LazyPaths', 'LazyDistances',
+           'paused_gc', 'make_rng', 'bernoulli_indices', 'PriorityQueue',
+           'HeapqPriorityQueue', 'PairingPriorityQueue', 'RadixPriorityQueue',
+           'BucketPriorityQueue', 'UnionFind']
 
 
-from collections import defaultdict
+from collections import defaultdict, Mapping
+from contextlib import contextmanager
+
+import gc
+import heapq
+import math
+import random
 
 
 ################################################################################
@@ -31,6 +40,173 @@ class keydefaultdict(defaultdict):
             ret = self[key] = self.default_factory(key)
             return ret
 
+class LazyPaths(Mapping):
+    """ Read-only mapping of each vertex val reached by a search to the list of
+        vals on the path to it, each path only built when it is looked up """
+
+    def __init__(self, predecessors):
+        # each reached val mapped to the val before it on its path (None for
+        # the val the search started from)
+        self._predecessors = predecessors
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __getitem__(self, v_val):
+        if v_val not in self._predecessors:
+            raise KeyError(v_val)
+        path = []
+        while v_val is not None:
+            path.append(v_val)
+            v_val = self._predecessors[v_val]
+        path.reverse()
+        return path
+
+    def __contains__(self, v_val):
+        return v_val in self._predecessors
+
+    def __iter__(self):
+        return iter(self._predecessors)
+
+    def __len__(self):
+        return len(self._predecessors)
+
+class LazyDistances(Mapping):
+    """ Read-only mapping of each val in some collection of vals to its distance
+        in a smaller dict of distances, or to infinity if it has none there """
+
+    def __init__(self, distances, vals):
+        self._distances = distances
+        self._vals = vals
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __getitem__(self, val):
+        if val in self._distances:
+            return self._distances[val]
+        if val in self._vals:
+            return float('inf')
+        raise KeyError(val)
+
+    def __contains__(self, val):
+        return val in self._vals
+
+    def __iter__(self):
+        return iter(self._vals)
+
+    def __len__(self):
+        return len(self._vals)
+
+@contextmanager
+def paused_gc():
+    """ Context in which the cyclic garbage collector does not run, since its
+        passes are wasted while building many long-lived objects at once """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+def make_rng(seed=None):
+    """ Source of randomness for a seed, which may be None (the random module's
+        shared generator), an int, or a random.Random to use as is """
+    if seed is None:
+        return random
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+def bernoulli_indices(num_candidates, p, rng=random):
+    """ Increasing indices in [0, num_candidates), each included independently
+        with probability p. Rather than flipping a coin per candidate, the gaps
+        between included indices are drawn from a geometric distribution, so
+        this takes time proportional to the number of indices produced """
+    if p <= 0:
+        return
+    if p >= 1:
+        for idx in xrange(num_candidates):
+            yield idx
+        return
+    log_q = math.log(1.0 - p)
+    idx = -1
+    while True:
+        idx += 1 + int(math.log(1.0 - rng.random()) / log_q)
+        if idx >= num_candidates:
+            return
+        yield idx
+
+
+################################################################################
+#                                                                              #
+#                                  Union-Find                                  #
+#                                                                              #
+################################################################################
+
+
+class UnionFind(object):
+    """ Disjoint sets of non-negative integer ids (such as a graph's vertex
+        ids), merged by size and with paths halved on each lookup, so any
+        sequence of operations takes nearly constant amortized time each """
+
+    def __init__(self):
+        # each id's parent in its set's tree (itself for a set's root), or
+        # None if the id is in no set
+        self._parents = []
+        # each root's number of ids in its set
+        self._sizes = []
+        self.num_sets = 0
+
+    def __contains__(self, x):
+        return x < len(self._parents) and self._parents[x] is not None
+
+    def add(self, x):
+        """ Add x as a set of its own """
+        if x in self:
+            raise ValueError("%s is already in a set" % (x,))
+        while len(self._parents) <= x:
+            self._parents.append(None)
+            self._sizes.append(0)
+        self._parents[x] = x
+        self._sizes[x] = 1
+        self.num_sets += 1
+
+    def remove(self, x):
+        """ Remove x, which must be in a set of its own """
+        if x not in self or self._sizes[self.find(x)] != 1:
+            raise ValueError("%s is not in a set of its own" % (x,))
+        self._parents[x] = None
+        self._sizes[x] = 0
+        self.num_sets -= 1
+
+    def find(self, x):
+        """ Root of the set x is in """
+        parents = self._parents
+        while parents[x] != x:
+            parents[x] = parents[parents[x]]
+            x = parents[x]
+        return x
+
+    def union(self, x, y):
+        """ Merge the sets x and y are in, returning whether they were
+            different sets """
+        x_root = self.find(x)
+        y_root = self.find(y)
+        if x_root == y_root:
+            return False
+        if self._sizes[x_root] < self._sizes[y_root]:
+            x_root, y_root = y_root, x_root
+        self._parents[y_root] = x_root
+        self._sizes[x_root] += self._sizes[y_root]
+        self.num_sets -= 1
+        return True
+
+    def set_size(self, x):
+        """ Number of ids in the set x is in """
+        return self._sizes[self.find(x)]
+
 
 ################################################################################
 #                                                                              #
@@ -201,3 +377,371 @@ class PriorityQueue(object):
         self._write_entry(new_entry, position)
         # bubble the newly decreased entry up by sifting down its parents
         self._siftdown(0, position)
+
+
+################################################################################
+#                                                                              #
+#                         Alternative Priority Queues                          #
+#                                                                              #
+################################################################################
+
+
+class HeapqPriorityQueue(object):
+    """ Drop-in replacement for PriorityQueue built on heapq. Rather than
+        moving an item's entry, decrease_key pushes a new entry and leaves the
+        old one in the heap, to be skipped as stale when it reaches the top """
+
+    def __init__(self, data=None):
+        # each item mapped to its current priority, which tells the entries
+        # in self._heap that are current apart from the stale ones
+        self._priorities = {}
+        for priority, item in data or []:
+            if item in self._priorities:
+                raise ValueError("Duplicate item %s" % (item,))
+            self._priorities[item] = priority
+        self._heap = list(data or [])
+        heapq.heapify(self._heap)
+
+    def __str__(self):
+        return str([entry for entry in self._heap if self._is_current(entry)])
+
+    def __len__(self):
+        return len(self._priorities)
+
+    def __getitem__(self, item):
+        return (self._priorities[item], item)
+
+    def __contains__(self, item):
+        return item in self._priorities
+
+    def _is_current(self, entry):
+        priority, item = entry
+        return item in self._priorities and self._priorities[item] == priority
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap and not self._is_current(heap[0]):
+            heapq.heappop(heap)
+
+    def find_min(self):
+        self._drop_stale()
+        return self._heap[0]
+
+    def pop_min(self):
+        self._drop_stale()
+        priority, item = heapq.heappop(self._heap)
+        del self._priorities[item]
+        return (priority, item)
+
+    def insert(self, item, priority):
+        if item in self._priorities:
+            raise ValueError("Duplicate item %s" % (item,))
+        self._priorities[item] = priority
+        heapq.heappush(self._heap, (priority, item))
+
+    def decrease_key(self, item, new_priority):
+        current_priority = self._priorities[item]
+        if new_priority > current_priority:
+            err_args = (new_priority, current_priority)
+            raise ValueError("%s is greater than %s" % err_args)
+        self._priorities[item] = new_priority
+        heapq.heappush(self._heap, (new_priority, item))
+
+
+class _PairingNode(object):
+
+    __slots__ = ('priority', 'item', 'child', 'sibling', 'prev')
+
+    def __init__(self, priority, item):
+        self.priority = priority
+        self.item = item
+        # leftmost child, next sibling to the right, and either the previous
+        # sibling or (for a leftmost child) the parent
+        self.child = None
+        self.sibling = None
+        self.prev = None
+
+
+class PairingPriorityQueue(object):
+    """ Drop-in replacement for PriorityQueue built on a pairing heap, with
+        O(1) insert and decrease_key and amortized O(log n) pop_min """
+
+    def __init__(self, data=None):
+        self._root = None
+        # each item mapped to its node in the heap
+        self._nodes = {}
+        for priority, item in data or []:
+            self.insert(item, priority)
+
+    def __str__(self):
+        return str([(node.priority, item)
+                    for item, node in self._nodes.iteritems()])
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __getitem__(self, item):
+        return (self._nodes[item].priority, item)
+
+    def __contains__(self, item):
+        return item in self._nodes
+
+    def _meld(self, node0, node1):
+        """ Merge two heaps by making the root with the larger priority the
+            leftmost child of the other, returning the new root """
+        if node1.priority < node0.priority:
+            node0, node1 = node1, node0
+        node1.prev = node0
+        node1.sibling = node0.child
+        if node0.child is not None:
+            node0.child.prev = node1
+        node0.child = node1
+        return node0
+
+    def find_min(self):
+        if self._root is None:
+            raise IndexError("find_min from empty priority queue")
+        return (self._root.priority, self._root.item)
+
+    def pop_min(self):
+        root = self._root
+        if root is None:
+            raise IndexError("pop_min from empty priority queue")
+        del self._nodes[root.item]
+
+        # detach the root's children
+        children = []
+        child = root.child
+        while child is not None:
+            next_child = child.sibling
+            child.prev = child.sibling = None
+            children.append(child)
+            child = next_child
+
+        # meld the children in pairs from left to right, then meld those
+        # pairs from right to left
+        pairs = [self._meld(children[i], children[i + 1])
+                 if i + 1 < len(children) else children[i]
+                 for i in xrange(0, len(children), 2)]
+        new_root = pairs.pop() if pairs else None
+        while pairs:
+            new_root = self._meld(pairs.pop(), new_root)
+        self._root = new_root
+
+        return (root.priority, root.item)
+
+    def insert(self, item, priority):
+        if item in self._nodes:
+            raise ValueError("Duplicate item %s" % (item,))
+        node = self._nodes[item] = _PairingNode(priority, item)
+        self._root = node if self._root is None else self._meld(self._root,
+                                                                node)
+
+    def decrease_key(self, item, new_priority):
+        node = self._nodes[item]
+        if new_priority > node.priority:
+            err_args = (new_priority, node.priority)
+            raise ValueError("%s is greater than %s" % err_args)
+        node.priority = new_priority
+        if node is self._root:
+            return
+        # cut the node's subtree out of the heap and meld it with the root
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.prev = node.sibling = None
+        self._root = self._meld(self._root, node)
+
+
+class RadixPriorityQueue(object):
+    """ Drop-in replacement for PriorityQueue for non-negative integer
+        priorities which is monotone: nothing may be given a priority below the
+        last one popped, as in dijkstra with integer weights. Entries sit in
+        buckets by the highest bit in which their priority differs from the
+        last popped, so each entry is moved through at most as many buckets as
+        its priority has bits. Like HeapqPriorityQueue, decrease_key leaves a
+        stale entry behind to be skipped later """
+
+    def __init__(self, data=None):
+        self._last_popped = 0
+        self._buckets = [[]]
+        # each item mapped to its current priority, which tells the entries
+        # in self._buckets that are current apart from the stale ones
+        self._priorities = {}
+        for priority, item in data or []:
+            self.insert(item, priority)
+
+    def __str__(self):
+        return str(sorted(self[item] for item in self._priorities))
+
+    def __len__(self):
+        return len(self._priorities)
+
+    def __getitem__(self, item):
+        return (self._priorities[item], item)
+
+    def __contains__(self, item):
+        return item in self._priorities
+
+    def _is_current(self, entry):
+        priority, item = entry
+        return item in self._priorities and self._priorities[item] == priority
+
+    def _push(self, entry):
+        priority, _ = entry
+        if priority < self._last_popped or priority != int(priority):
+            m = ("%s must be an integer no less than the last priority popped, "
+                 "%s" % (priority, self._last_popped))
+            raise ValueError(m)
+        bucket_idx = (int(priority) ^ self._last_popped).bit_length()
+        while len(self._buckets) <= bucket_idx:
+            self._buckets.append([])
+        self._buckets[bucket_idx].append(entry)
+
+    def _drop_stale(self, bucket_idx):
+        bucket = self._buckets[bucket_idx]
+        if bucket_idx == 0:
+            # every entry in the first bucket has the same priority, so stale
+            # ones only need dropping once they reach the end
+            while bucket and not self._is_current(bucket[-1]):
+                bucket.pop()
+        else:
+            self._buckets[bucket_idx] = [entry for entry in bucket
+                                         if self._is_current(entry)]
+        return self._buckets[bucket_idx]
+
+    def _first_bucket(self):
+        """ Index of the first bucket holding a current entry, with the stale
+            entries dropped from every bucket up to it """
+        for bucket_idx in xrange(len(self._buckets)):
+            if self._drop_stale(bucket_idx):
+                return bucket_idx
+        raise IndexError("empty priority queue")
+
+    def find_min(self):
+        bucket_idx = self._first_bucket()
+        if bucket_idx == 0:
+            return self._buckets[0][-1]
+        return min(self._buckets[bucket_idx])
+
+    def pop_min(self):
+        bucket_idx = self._first_bucket()
+        if bucket_idx:
+            # every entry in this bucket moves to a lower bucket once the
+            # smallest of them becomes the last popped priority
+            entries = self._buckets[bucket_idx]
+            self._buckets[bucket_idx] = []
+            self._last_popped = int(min(entries)[0])
+            for entry in entries:
+                self._push(entry)
+        priority, item = self._buckets[0].pop()
+        del self._priorities[item]
+        return (priority, item)
+
+    def insert(self, item, priority):
+        if item in self._priorities:
+            raise ValueError("Duplicate item %s" % (item,))
+        self._push((priority, item))
+        self._priorities[item] = priority
+
+    def decrease_key(self, item, new_priority):
+        current_priority = self._priorities[item]
+        if new_priority > current_priority:
+            err_args = (new_priority, current_priority)
+            raise ValueError("%s is greater than %s" % err_args)
+        self._push((new_priority, item))
+        self._priorities[item] = new_priority
+
+
+class BucketPriorityQueue(object):
+    """ Drop-in replacement for PriorityQueue for non-negative integer
+        priorities which, once some priority is popped, all lie between it and
+        max_span more than it, as in dijkstra with integer weights of at most
+        max_span (Dial's algorithm). Entries sit in a circle of max_span + 1
+        buckets, one per priority, which pop_min walks around. Like
+        HeapqPriorityQueue, decrease_key leaves a stale entry behind to be
+        skipped later """
+
+    def __init__(self, data=None, max_span=None):
+        if max_span is None or max_span < 0 or max_span != int(max_span):
+            raise ValueError("max_span must be a non-negative integer")
+        self._max_span = int(max_span)
+        self._buckets = [[] for _ in xrange(self._max_span + 1)]
+        self._last_popped = 0
+        # no current entry has a priority below self._cursor, from which
+        # pop_min starts looking
+        self._cursor = 0
+        # each item mapped to its current priority, which tells the entries
+        # in self._buckets that are current apart from the stale ones
+        self._priorities = {}
+        for priority, item in data or []:
+            self.insert(item, priority)
+
+    def __str__(self):
+        return str(sorted(self[item] for item in self._priorities))
+
+    def __len__(self):
+        return len(self._priorities)
+
+    def __getitem__(self, item):
+        return (self._priorities[item], item)
+
+    def __contains__(self, item):
+        return item in self._priorities
+
+    def _is_current(self, entry):
+        priority, item = entry
+        return item in self._priorities and self._priorities[item] == priority
+
+    def _push(self, entry):
+        priority, _ = entry
+        low = self._last_popped
+        high = self._last_popped + self._max_span
+        if not low <= priority <= high or priority != int(priority):
+            err_args = (priority, low, high)
+            m = "%s must be an integer between %s and %s" % err_args
+            raise ValueError(m)
+        self._cursor = min(self._cursor, int(priority))
+        self._buckets[int(priority) % len(self._buckets)].append(entry)
+
+    def _advance(self):
+        """ Move the cursor up to the minimum priority, returning the bucket
+            holding it, with a current entry at its end """
+        if not self._priorities:
+            raise IndexError("empty priority queue")
+        # every current entry lies within max_span of the cursor, so the one
+        # bucket for each priority from the cursor on holds only entries with
+        # that priority, apart from stale ones
+        while True:
+            bucket = self._buckets[self._cursor % len(self._buckets)]
+            while bucket and not self._is_current(bucket[-1]):
+                bucket.pop()
+            if bucket:
+                return bucket
+            self._cursor += 1
+
+    def find_min(self):
+        return self._advance()[-1]
+
+    def pop_min(self):
+        priority, item = self._advance().pop()
+        del self._priorities[item]
+        self._last_popped = self._cursor
+        return (priority, item)
+
+    def insert(self, item, priority):
+        if item in self._priorities:
+            raise ValueError("Duplicate item %s" % (item,))
+        self._push((priority, item))
+        self._priorities[item] = priority
+
+    def decrease_key(self, item, new_priority):
+        current_priority = self._priorities[item]
+        if new_priority > current_priority:
+            err_args = (new_priority, current_priority)
+            raise ValueError("%s is greater than %s" % err_args)
+        self._push((new_priority, item))
+        self._priorities[item] = new_priority
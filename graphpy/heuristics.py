@@ -0,0 +1,34 @@
+"""
+Heuristics for astar, estimating the distance between two vertices from
+coordinates stored in their attrs
+"""
+
+
+import math
+
+
+def euclidean(x_attr='x', y_attr='y', scale=1.0):
+    """ Heuristic giving the straight-line distance between two vertices'
+        (x_attr, y_attr) points, times scale. Never overestimates as long as
+        each edge's weight is at least scale times the distance between its
+        vertices """
+    def heuristic(v, goal):
+        dx = v.get(x_attr) - goal.get(x_attr)
+        dy = v.get(y_attr) - goal.get(y_attr)
+        return scale * math.sqrt(dx * dx + dy * dy)
+    return heuristic
+
+
+def haversine(lat_attr='lat', lon_attr='lon', radius=6371.0):
+    """ Heuristic giving the great-circle distance between two vertices'
+        (lat_attr, lon_attr) positions, in degrees, on a sphere of radius
+        (by default the Earth's mean radius in km) """
+    def heuristic(v, goal):
+        lat0 = math.radians(v.get(lat_attr))
+        lat1 = math.radians(goal.get(lat_attr))
+        dlat = lat1 - lat0
+        dlon = math.radians(goal.get(lon_attr) - v.get(lon_attr))
+        a = (math.sin(dlat / 2) ** 2 +
+             math.cos(lat0) * math.cos(lat1) * math.sin(dlon / 2) ** 2)
+        return 2 * radius * math.asin(min(1.0, math.sqrt(a)))
+    return heuristic
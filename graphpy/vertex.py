@@ -3,6 +3,9 @@ Implementation of a vertex, as used in graphs
 """
 
 
+import itertools
+
+
 ################################################################################
 #                                                                              #
 #                                  Undirected                                  #
@@ -12,11 +15,15 @@ Implementation of a vertex, as used in graphs
 
 class UndirectedVertex(object):
 
+    __slots__ = ('_val', '_attrs', '_neighbors_to_edges')
+
     def __init__(self, val=None, attrs=None):
-        self._val = val or id(self)
-        self._attrs = attrs or {}
-        self._edges = set()
-        self._has_self_edge = False
+        self._val = val if val is not None else id(self)
+        # attrs dicts are only allocated once an attribute is set
+        self._attrs = attrs or None
+        # each neighbor mapped to the edge shared with it (a self edge is
+        # mapped to from this vertex itself)
+        self._neighbors_to_edges = {}
 
     def __repr__(self):
         display = (self.val, id(self))
@@ -26,7 +33,8 @@ class UndirectedVertex(object):
         return "V(%s)" % self.val
 
     def __contains__(self, e):
-        return e in self._edges
+        neighbor = self._neighbor_through(e)
+        return neighbor is not None and neighbor in self._neighbors_to_edges
 
     @property
     def val(self):
@@ -34,62 +42,82 @@ class UndirectedVertex(object):
 
     @property
     def attrs(self):
+        if self._attrs is None:
+            self._attrs = {}
         return self._attrs
 
     @property
     def edges(self):
-        return iter(self._edges)
+        return self._neighbors_to_edges.itervalues()
 
     @property
     def has_self_edge(self):
-        return self._has_self_edge
+        return self in self._neighbors_to_edges
 
     @property
     def neighbors(self):
         """ Iterator over vertices adjacent to this vertex """
-        return iter(set(v for e in self._edges for v in e.vertices
-                        if v != self) |
-                    (set([self]) if self._has_self_edge else set()))
+        return iter(self._neighbors_to_edges)
+
+    @property
+    def neighbors_with_edges(self):
+        """ Iterator over (neighbor, edge shared with it) pairs """
+        return self._neighbors_to_edges.iteritems()
+
+    @property
+    def neighbors_with_weights(self):
+        """ Iterator over (neighbor, weight of the edge shared with it)
+            pairs """
+        return ((neighbor, e.get('weight'))
+                for neighbor, e in self._neighbors_to_edges.iteritems())
 
     @property
     def degree(self):
         """ Number of neighbors this vertex has (+1 if it has a self edge) """
-        return sum(1 for _ in self._edges) + (1 if self._has_self_edge else 0)
+        return (len(self._neighbors_to_edges) +
+                (1 if self in self._neighbors_to_edges else 0))
+
+    def _neighbor_through(self, e):
+        """ The vertex at the other end of an edge from this vertex, or None if
+            this vertex is not part of the edge """
+        v0, v1 = e.endpoints
+        if v0 == self:
+            return v1
+        if v1 == self:
+            return v0
+        return None
 
     def add_edge(self, e):
         """ Adds an edge to this vertex """
-        if self not in e.vertices:
+        neighbor = self._neighbor_through(e)
+        if neighbor is None:
             raise ValueError(str(self) + " is not part of " + str(e) + ".")
-        if e in self:
+        if neighbor in self._neighbors_to_edges:
             raise ValueError(str(self) + " already has " + str(e) + ".")
 
-        self._edges.add(e)
-
-        if e.is_self_edge:
-            self._has_self_edge = True
+        self._neighbors_to_edges[neighbor] = e
 
     def remove_edge(self, e):
         """ Removes an edge from this vertex """
-        self._edges.discard(e)
-
-        if e.is_self_edge:
-            self._has_self_edge = False
+        self._neighbors_to_edges.pop(self._neighbor_through(e), None)
 
     def get(self, attr):
         """ Get an attribute """
+        if self._attrs is None:
+            return None
         return self._attrs.get(attr)
 
     def set(self, attr, value):
         """ Set an attribute """
-        self._attrs[attr] = value
+        self.attrs[attr] = value
 
     def has_attr(self, attr):
         """ Check if an attribute exists """
-        return attr in self._attrs
+        return self._attrs is not None and attr in self._attrs
 
     def del_attr(self, attr):
         """ Delete an attribute """
-        del self._attrs[attr]
+        del self.attrs[attr]
 
 
 ################################################################################
@@ -101,10 +129,16 @@ class UndirectedVertex(object):
 
 class DirectedVertex(object):
 
+    __slots__ = ('_val', '_attrs', '_outs_to_edges', '_ins_to_edges')
+
     def __init__(self, val=None, attrs=None):
-        self._val = val or id(self)
-        self._attrs = attrs or {}
-        self._edges = set()
+        self._val = val if val is not None else id(self)
+        # attrs dicts are only allocated once an attribute is set
+        self._attrs = attrs or None
+        # each out mapped to the edge into it, and each in mapped to the edge
+        # out of it (a self edge is in both)
+        self._outs_to_edges = {}
+        self._ins_to_edges = {}
 
     def __repr__(self):
         display = (self.val, id(self))
@@ -114,7 +148,8 @@ class DirectedVertex(object):
         return "V(%s)" % self.val
 
     def __contains__(self, e):
-        return e in self._edges
+        return ((e.v_from == self and e.v_to in self._outs_to_edges) or
+                (e.v_to == self and e.v_from in self._ins_to_edges))
 
     @property
     def val(self):
@@ -122,31 +157,58 @@ class DirectedVertex(object):
 
     @property
     def attrs(self):
+        if self._attrs is None:
+            self._attrs = {}
         return self._attrs
 
     @property
     def edges(self):
-        return iter(self._edges)
+        # a self edge is in both maps, so only take it from the outs map
+        return itertools.chain(self._outs_to_edges.itervalues(),
+                               (e for v, e in self._ins_to_edges.iteritems()
+                                if v != self))
 
     @property
     def outs(self):
         """ Iterator over vertices into which this vertex has an edge """
-        return iter(set(e.v_to for e in self._edges if e.v_from == self))
+        return iter(self._outs_to_edges)
 
     @property
     def ins(self):
         """ Iterator over vertices which have an edge into this vertex """
-        return iter(set(e.v_from for e in self._edges if e.v_to == self))
+        return iter(self._ins_to_edges)
+
+    @property
+    def outs_with_edges(self):
+        """ Iterator over (out, edge into it) pairs """
+        return self._outs_to_edges.iteritems()
+
+    @property
+    def ins_with_edges(self):
+        """ Iterator over (in, edge out of it) pairs """
+        return self._ins_to_edges.iteritems()
+
+    @property
+    def outs_with_weights(self):
+        """ Iterator over (out, weight of the edge into it) pairs """
+        return ((out, e.get('weight'))
+                for out, e in self._outs_to_edges.iteritems())
+
+    @property
+    def ins_with_weights(self):
+        """ Iterator over (in, weight of the edge out of it) pairs """
+        return ((in_, e.get('weight'))
+                for in_, e in self._ins_to_edges.iteritems())
 
     @property
     def out_degree(self):
         """ Number of vertices into which this vertex has an edge """
-        return sum(1 for e in self._edges if e.v_from == self)
+        return len(self._outs_to_edges)
 
     @property
     def in_degree(self):
         """ Number of vertices which have an edge into this vertex """
-        return sum(1 for e in self._edges if e.v_to == self)
+        return len(self._ins_to_edges)
 
     @property
     def degree(self):
@@ -160,24 +222,32 @@ class DirectedVertex(object):
         if e in self:
             raise ValueError(str(self) + " already has " + str(e) + ".")
 
-        self._edges.add(e)
+        if e.v_from == self:
+            self._outs_to_edges[e.v_to] = e
+        if e.v_to == self:
+            self._ins_to_edges[e.v_from] = e
 
     def remove_edge(self, e):
         """ Removes an edge from this vertex """
-        self._edges.discard(e)
+        if e.v_from == self:
+            self._outs_to_edges.pop(e.v_to, None)
+        if e.v_to == self:
+            self._ins_to_edges.pop(e.v_from, None)
 
     def get(self, attr):
         """ Get an attribute """
+        if self._attrs is None:
+            return None
         return self._attrs.get(attr)
 
     def set(self, attr, value):
         """ Set an attribute """
-        self._attrs[attr] = value
+        self.attrs[attr] = value
 
     def has_attr(self, attr):
         """ Check if an attribute exists """
-        return attr in self._attrs
+        return self._attrs is not None and attr in self._attrs
 
     def del_attr(self, attr):
         """ Delete an attribute """
-        del self._attrs[attr]
+        del self.attrs[attr]
@@ -0,0 +1,694 @@
+"""
+Views of vertices and edges that reinterpret or filter them without copying,
+as used by graph views
+"""
+
+
+import itertools
+
+
+def _lighter_edge(e0, e1):
+    """ Of the edges both ways between two vertices, the one with the lower
+        weight, where a missing weight counts as the heaviest. Ties go to the
+        edge pointing from the lesser val, so the same edge is always
+        chosen however the edges were reached """
+    def key(e):
+        weight = e.get('weight')
+        return (weight is None, weight, e.v_from.val, e.v_to.val)
+    return e0 if key(e0) <= key(e1) else e1
+
+
+################################################################################
+#                                                                              #
+#                                   Reversed                                   #
+#                                                                              #
+################################################################################
+
+
+class ReversedVertexView(object):
+    """ Directed vertex seen with its edges reversed, so that its outs are the
+        ins of the vertex it views and its ins are that vertex's outs """
+
+    __slots__ = ('_v',)
+
+    def __init__(self, v):
+        self._v = v
+
+    def __repr__(self):
+        return "ReversedVertexView(%r)" % (self._v,)
+
+    def __str__(self):
+        return str(self._v)
+
+    def __eq__(self, other):
+        return isinstance(other, ReversedVertexView) and self._v == other._v
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._v)
+
+    @property
+    def val(self):
+        return self._v.val
+
+    @property
+    def attrs(self):
+        return self._v.attrs
+
+    @property
+    def _attrs(self):
+        return self._v._attrs
+
+    @property
+    def edges(self):
+        return itertools.imap(ReversedEdgeView, self._v.edges)
+
+    @property
+    def outs(self):
+        """ Iterator over vertices into which this vertex has an edge """
+        return itertools.imap(ReversedVertexView, self._v.ins)
+
+    @property
+    def ins(self):
+        """ Iterator over vertices which have an edge into this vertex """
+        return itertools.imap(ReversedVertexView, self._v.outs)
+
+    @property
+    def outs_with_edges(self):
+        """ Iterator over (out, edge into it) pairs """
+        return ((ReversedVertexView(in_), ReversedEdgeView(e))
+                for in_, e in self._v.ins_with_edges)
+
+    @property
+    def ins_with_edges(self):
+        """ Iterator over (in, edge out of it) pairs """
+        return ((ReversedVertexView(out), ReversedEdgeView(e))
+                for out, e in self._v.outs_with_edges)
+
+    @property
+    def outs_with_weights(self):
+        """ Iterator over (out, weight of the edge into it) pairs """
+        return ((ReversedVertexView(in_), weight)
+                for in_, weight in self._v.ins_with_weights)
+
+    @property
+    def ins_with_weights(self):
+        """ Iterator over (in, weight of the edge out of it) pairs """
+        return ((ReversedVertexView(out), weight)
+                for out, weight in self._v.outs_with_weights)
+
+    @property
+    def out_degree(self):
+        """ Number of vertices into which this vertex has an edge """
+        return self._v.in_degree
+
+    @property
+    def in_degree(self):
+        """ Number of vertices which have an edge into this vertex """
+        return self._v.out_degree
+
+    @property
+    def degree(self):
+        """ Sum of out degree and in degree """
+        return self._v.degree
+
+    def get(self, attr):
+        """ Get an attribute """
+        return self._v.get(attr)
+
+    def has_attr(self, attr):
+        """ Check if an attribute exists """
+        return self._v.has_attr(attr)
+
+
+class ReversedEdgeView(object):
+    """ Directed edge seen pointing the other way """
+
+    __slots__ = ('_e',)
+
+    def __init__(self, e):
+        self._e = e
+
+    def __repr__(self):
+        return "ReversedEdgeView(%r)" % (self._e,)
+
+    def __str__(self):
+        return "E(%s, %s)" % (str(self.v_from), str(self.v_to))
+
+    def __eq__(self, other):
+        return isinstance(other, ReversedEdgeView) and self._e == other._e
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._e)
+
+    @property
+    def v_from(self):
+        return ReversedVertexView(self._e.v_to)
+
+    @property
+    def v_to(self):
+        return ReversedVertexView(self._e.v_from)
+
+    @property
+    def attrs(self):
+        return self._e.attrs
+
+    @property
+    def _attrs(self):
+        return self._e._attrs
+
+    @property
+    def has_valid_weight(self):
+        """ Whether this edge has a non-negative weight """
+        return self._e.has_valid_weight
+
+    def get(self, attr):
+        """ Get an attribute """
+        return self._e.get(attr)
+
+    def has_attr(self, attr):
+        """ Check if an attribute exists """
+        return self._e.has_attr(attr)
+
+
+################################################################################
+#                                                                              #
+#                                  Undirected                                  #
+#                                                                              #
+################################################################################
+
+
+class UndirectedVertexView(object):
+    """ Directed vertex seen as undirected, adjacent to both its outs and its
+        ins. Where it has edges both ways with another vertex, the lighter
+        edge stands for both """
+
+    __slots__ = ('_v',)
+
+    def __init__(self, v):
+        self._v = v
+
+    def __repr__(self):
+        return "UndirectedVertexView(%r)" % (self._v,)
+
+    def __str__(self):
+        return str(self._v)
+
+    def __eq__(self, other):
+        return isinstance(other, UndirectedVertexView) and self._v == other._v
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._v)
+
+    @property
+    def val(self):
+        return self._v.val
+
+    @property
+    def attrs(self):
+        return self._v.attrs
+
+    @property
+    def _attrs(self):
+        return self._v._attrs
+
+    @property
+    def edges(self):
+        return (e for _, e in self.neighbors_with_edges)
+
+    @property
+    def has_self_edge(self):
+        return any(out == self._v for out in self._v.outs)
+
+    @property
+    def neighbors(self):
+        """ Iterator over vertices adjacent to this vertex """
+        outs = set(self._v.outs)
+        return itertools.imap(UndirectedVertexView, itertools.chain(
+            outs, (in_ for in_ in self._v.ins if in_ not in outs)))
+
+    @property
+    def neighbors_with_edges(self):
+        """ Iterator over (neighbor, edge shared with it) pairs """
+        return ((UndirectedVertexView(neighbor), UndirectedEdgeView(e))
+                for neighbor, e in self._viewed_neighbors_with_edges())
+
+    @property
+    def neighbors_with_weights(self):
+        """ Iterator over (neighbor, weight of the edge shared with it)
+            pairs """
+        return ((UndirectedVertexView(neighbor), e.get('weight'))
+                for neighbor, e in self._viewed_neighbors_with_edges())
+
+    @property
+    def degree(self):
+        """ Number of neighbors this vertex has (+1 if it has a self edge) """
+        return sum(2 if neighbor._v == self._v else 1
+                   for neighbor in self.neighbors)
+
+    def _viewed_neighbors_with_edges(self):
+        """ The viewed vertex's outs and ins, each with the edge standing for
+            the edges between them """
+        outs_to_edges = dict(self._v.outs_with_edges)
+        for in_, e in self._v.ins_with_edges:
+            out_e = outs_to_edges.get(in_)
+            if out_e is None:
+                yield in_, e
+            else:
+                outs_to_edges[in_] = _lighter_edge(out_e, e)
+        for out, e in outs_to_edges.iteritems():
+            yield out, e
+
+    def get(self, attr):
+        """ Get an attribute """
+        return self._v.get(attr)
+
+    def has_attr(self, attr):
+        """ Check if an attribute exists """
+        return self._v.has_attr(attr)
+
+
+class UndirectedEdgeView(object):
+    """ Directed edge seen as undirected """
+
+    __slots__ = ('_e',)
+
+    def __init__(self, e):
+        self._e = e
+
+    def __repr__(self):
+        return "UndirectedEdgeView(%r)" % (self._e,)
+
+    def __str__(self):
+        return str(self._e)
+
+    def __eq__(self, other):
+        return (isinstance(other, UndirectedEdgeView) and
+                self._vertex_pair() == other._vertex_pair())
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._vertex_pair())
+
+    @property
+    def vertices(self):
+        return frozenset(self.endpoints)
+
+    @property
+    def endpoints(self):
+        """ Tuple of the two vertices this edge connects, from the vertex the
+            viewed edge points from to the one it points to """
+        return (UndirectedVertexView(self._e.v_from),
+                UndirectedVertexView(self._e.v_to))
+
+    @property
+    def attrs(self):
+        return self._e.attrs
+
+    @property
+    def _attrs(self):
+        return self._e._attrs
+
+    @property
+    def is_self_edge(self):
+        return self._e.v_from == self._e.v_to
+
+    @property
+    def has_valid_weight(self):
+        """ Whether this edge has a non-negative weight """
+        return self._e.has_valid_weight
+
+    def _vertex_pair(self):
+        return frozenset((self._e.v_from, self._e.v_to))
+
+    def get(self, attr):
+        """ Get an attribute """
+        return self._e.get(attr)
+
+    def has_attr(self, attr):
+        """ Check if an attribute exists """
+        return self._e.has_attr(attr)
+
+
+################################################################################
+#                                                                              #
+#                                   Subgraph                                   #
+#                                                                              #
+################################################################################
+
+
+class SubgraphUndirectedVertexView(object):
+    """ Undirected vertex seen without the neighbors that fail vertex_filter
+        and the edges that fail edge_filter """
+
+    __slots__ = ('_v', '_vertex_filter', '_edge_filter')
+
+    def __init__(self, v, vertex_filter, edge_filter):
+        self._v = v
+        self._vertex_filter = vertex_filter
+        self._edge_filter = edge_filter
+
+    def __repr__(self):
+        return "SubgraphUndirectedVertexView(%r)" % (self._v,)
+
+    def __str__(self):
+        return str(self._v)
+
+    def __eq__(self, other):
+        return (isinstance(other, SubgraphUndirectedVertexView) and
+                self._v == other._v)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._v)
+
+    @property
+    def val(self):
+        return self._v.val
+
+    @property
+    def attrs(self):
+        return self._v.attrs
+
+    @property
+    def _attrs(self):
+        return self._v._attrs
+
+    @property
+    def edges(self):
+        return (self._view_edge(e)
+                for _, e in self._kept_neighbors_with_edges())
+
+    @property
+    def has_self_edge(self):
+        return any(neighbor == self._v
+                   for neighbor, _ in self._kept_neighbors_with_edges())
+
+    @property
+    def neighbors(self):
+        """ Iterator over vertices adjacent to this vertex """
+        return (self._view_vertex(neighbor)
+                for neighbor, _ in self._kept_neighbors_with_edges())
+
+    @property
+    def neighbors_with_edges(self):
+        """ Iterator over (neighbor, edge shared with it) pairs """
+        return ((self._view_vertex(neighbor), self._view_edge(e))
+                for neighbor, e in self._kept_neighbors_with_edges())
+
+    @property
+    def neighbors_with_weights(self):
+        """ Iterator over (neighbor, weight of the edge shared with it)
+            pairs """
+        return ((self._view_vertex(neighbor), e.get('weight'))
+                for neighbor, e in self._kept_neighbors_with_edges())
+
+    @property
+    def degree(self):
+        """ Number of neighbors this vertex has (+1 if it has a self edge) """
+        return sum(2 if neighbor == self._v else 1
+                   for neighbor, _ in self._kept_neighbors_with_edges())
+
+    def _kept_neighbors_with_edges(self):
+        """ The viewed vertex's (neighbor, edge) pairs that pass the
+            filters """
+        vertex_filter = self._vertex_filter
+        edge_filter = self._edge_filter
+        return ((neighbor, e) for neighbor, e in self._v.neighbors_with_edges
+                if vertex_filter(neighbor) and edge_filter(e))
+
+    def _view_vertex(self, v):
+        return SubgraphUndirectedVertexView(v, self._vertex_filter,
+                                            self._edge_filter)
+
+    def _view_edge(self, e):
+        return SubgraphUndirectedEdgeView(e, self._vertex_filter,
+                                          self._edge_filter)
+
+    def get(self, attr):
+        """ Get an attribute """
+        return self._v.get(attr)
+
+    def has_attr(self, attr):
+        """ Check if an attribute exists """
+        return self._v.has_attr(attr)
+
+
+class SubgraphUndirectedEdgeView(object):
+    """ Undirected edge of a subgraph view, whose vertices are seen through
+        the same filters """
+
+    __slots__ = ('_e', '_vertex_filter', '_edge_filter')
+
+    def __init__(self, e, vertex_filter, edge_filter):
+        self._e = e
+        self._vertex_filter = vertex_filter
+        self._edge_filter = edge_filter
+
+    def __repr__(self):
+        return "SubgraphUndirectedEdgeView(%r)" % (self._e,)
+
+    def __str__(self):
+        return str(self._e)
+
+    def __eq__(self, other):
+        return (isinstance(other, SubgraphUndirectedEdgeView) and
+                self._e == other._e)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._e)
+
+    @property
+    def vertices(self):
+        return frozenset(self.endpoints)
+
+    @property
+    def endpoints(self):
+        """ Tuple of the two vertices this edge connects, in the viewed edge's
+            order """
+        return tuple(SubgraphUndirectedVertexView(v, self._vertex_filter,
+                                                  self._edge_filter)
+                     for v in self._e.endpoints)
+
+    @property
+    def attrs(self):
+        return self._e.attrs
+
+    @property
+    def _attrs(self):
+        return self._e._attrs
+
+    @property
+    def is_self_edge(self):
+        return self._e.is_self_edge
+
+    @property
+    def has_valid_weight(self):
+        """ Whether this edge has a non-negative weight """
+        return self._e.has_valid_weight
+
+    def get(self, attr):
+        """ Get an attribute """
+        return self._e.get(attr)
+
+    def has_attr(self, attr):
+        """ Check if an attribute exists """
+        return self._e.has_attr(attr)
+
+
+class SubgraphDirectedVertexView(object):
+    """ Directed vertex seen without the outs and ins that fail vertex_filter
+        and the edges that fail edge_filter """
+
+    __slots__ = ('_v', '_vertex_filter', '_edge_filter')
+
+    def __init__(self, v, vertex_filter, edge_filter):
+        self._v = v
+        self._vertex_filter = vertex_filter
+        self._edge_filter = edge_filter
+
+    def __repr__(self):
+        return "SubgraphDirectedVertexView(%r)" % (self._v,)
+
+    def __str__(self):
+        return str(self._v)
+
+    def __eq__(self, other):
+        return (isinstance(other, SubgraphDirectedVertexView) and
+                self._v == other._v)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._v)
+
+    @property
+    def val(self):
+        return self._v.val
+
+    @property
+    def attrs(self):
+        return self._v.attrs
+
+    @property
+    def _attrs(self):
+        return self._v._attrs
+
+    @property
+    def edges(self):
+        # a self edge is both an out and an in, so only take it from the outs
+        out_edges = (e for _, e in self._kept(self._v.outs_with_edges))
+        in_edges = (e for in_, e in self._kept(self._v.ins_with_edges)
+                    if in_ != self._v)
+        return itertools.imap(self._view_edge,
+                              itertools.chain(out_edges, in_edges))
+
+    @property
+    def outs(self):
+        """ Iterator over vertices into which this vertex has an edge """
+        return (self._view_vertex(out)
+                for out, _ in self._kept(self._v.outs_with_edges))
+
+    @property
+    def ins(self):
+        """ Iterator over vertices which have an edge into this vertex """
+        return (self._view_vertex(in_)
+                for in_, _ in self._kept(self._v.ins_with_edges))
+
+    @property
+    def outs_with_edges(self):
+        """ Iterator over (out, edge into it) pairs """
+        return ((self._view_vertex(out), self._view_edge(e))
+                for out, e in self._kept(self._v.outs_with_edges))
+
+    @property
+    def ins_with_edges(self):
+        """ Iterator over (in, edge out of it) pairs """
+        return ((self._view_vertex(in_), self._view_edge(e))
+                for in_, e in self._kept(self._v.ins_with_edges))
+
+    @property
+    def outs_with_weights(self):
+        """ Iterator over (out, weight of the edge into it) pairs """
+        return ((self._view_vertex(out), e.get('weight'))
+                for out, e in self._kept(self._v.outs_with_edges))
+
+    @property
+    def ins_with_weights(self):
+        """ Iterator over (in, weight of the edge out of it) pairs """
+        return ((self._view_vertex(in_), e.get('weight'))
+                for in_, e in self._kept(self._v.ins_with_edges))
+
+    @property
+    def out_degree(self):
+        """ Number of vertices into which this vertex has an edge """
+        return sum(1 for _ in self._kept(self._v.outs_with_edges))
+
+    @property
+    def in_degree(self):
+        """ Number of vertices which have an edge into this vertex """
+        return sum(1 for _ in self._kept(self._v.ins_with_edges))
+
+    @property
+    def degree(self):
+        """ Sum of out degree and in degree """
+        return self.out_degree + self.in_degree
+
+    def _kept(self, vertices_with_edges):
+        """ The (vertex, edge) pairs of vertices_with_edges that pass the
+            filters """
+        vertex_filter = self._vertex_filter
+        edge_filter = self._edge_filter
+        return ((v, e) for v, e in vertices_with_edges
+                if vertex_filter(v) and edge_filter(e))
+
+    def _view_vertex(self, v):
+        return SubgraphDirectedVertexView(v, self._vertex_filter,
+                                          self._edge_filter)
+
+    def _view_edge(self, e):
+        return SubgraphDirectedEdgeView(e, self._vertex_filter,
+                                        self._edge_filter)
+
+    def get(self, attr):
+        """ Get an attribute """
+        return self._v.get(attr)
+
+    def has_attr(self, attr):
+        """ Check if an attribute exists """
+        return self._v.has_attr(attr)
+
+
+class SubgraphDirectedEdgeView(object):
+    """ Directed edge of a subgraph view, whose vertices are seen through the
+        same filters """
+
+    __slots__ = ('_e', '_vertex_filter', '_edge_filter')
+
+    def __init__(self, e, vertex_filter, edge_filter):
+        self._e = e
+        self._vertex_filter = vertex_filter
+        self._edge_filter = edge_filter
+
+    def __repr__(self):
+        return "SubgraphDirectedEdgeView(%r)" % (self._e,)
+
+    def __str__(self):
+        return str(self._e)
+
+    def __eq__(self, other):
+        return (isinstance(other, SubgraphDirectedEdgeView) and
+                self._e == other._e)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._e)
+
+    @property
+    def v_from(self):
+        return SubgraphDirectedVertexView(self._e.v_from, self._vertex_filter,
+                                          self._edge_filter)
+
+    @property
+    def v_to(self):
+        return SubgraphDirectedVertexView(self._e.v_to, self._vertex_filter,
+                                          self._edge_filter)
+
+    @property
+    def attrs(self):
+        return self._e.attrs
+
+    @property
+    def _attrs(self):
+        return self._e._attrs
+
+    @property
+    def has_valid_weight(self):
+        """ Whether this edge has a non-negative weight """
+        return self._e.has_valid_weight
+
+    def get(self, attr):
+        """ Get an attribute """
+        return self._e.get(attr)
+
+    def has_attr(self, attr):
+        """ Check if an attribute exists """
+        return self._e.has_attr(attr)
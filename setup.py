@@ -25,7 +25,7 @@ setup(
         'Programming Language :: Python :: 2',
     ],
     keywords='edge vertex graph',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks']),
     install_requires=[],
     extras_require={},
     package_data={},
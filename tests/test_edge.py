@@ -74,6 +74,20 @@ class TestUndirectedEdge(unittest.TestCase):
         with self.assertRaises(AttributeError):
             e01.vertices = frozenset()
 
+    def test_undirected_edge_endpoints(self):
+        """ Get an undirected edge's endpoints property """
+        v0 = UndirectedVertex(val='v0')
+        v1 = UndirectedVertex(val='v1')
+        e00 = UndirectedEdge((v0, v0))
+        e01 = UndirectedEdge((v0, v1))
+        e10 = UndirectedEdge((v1, v0))
+
+        self.assertEqual(e00.endpoints, (v0, v0))
+        self.assertEqual(set(e01.endpoints), set([v0, v1]))
+        self.assertEqual(e01.endpoints, e10.endpoints)
+        with self.assertRaises(AttributeError):
+            e01.endpoints = (v1, v0)
+
     def test_undirected_edge_attrs(self):
         """ Get an undirected edge's attrs property """
         v0 = UndirectedVertex(val='v0')
@@ -96,6 +110,23 @@ class TestUndirectedEdge(unittest.TestCase):
         with self.assertRaises(AttributeError):
             e00.is_self_edge = False
 
+    def test_undirected_edge_compact_layout(self):
+        """ An undirected edge has no instance dict, and only allocates an attrs
+            dict once it is needed """
+        v0 = UndirectedVertex(val='v0')
+        v1 = UndirectedVertex(val='v1')
+        e01 = UndirectedEdge((v0, v1))
+
+        self.assertFalse(hasattr(e01, '__dict__'))
+        self.assertIsNone(e01.get('weight'))
+        self.assertFalse(e01.has_attr('weight'))
+        with self.assertRaises(KeyError):
+            e01.del_attr('weight')
+
+        e01.set('weight', 5)
+
+        self.assertEqual(e01.get('weight'), 5)
+
     def test_undirected_edge_get(self):
         """ Get an attribute of an undirected edge """
         v0 = UndirectedVertex(val='v0')
@@ -132,6 +163,22 @@ class TestUndirectedEdge(unittest.TestCase):
 
         self.assertFalse(e01.has_attr('weight'))
 
+    def test_undirected_edge_has_valid_weight(self):
+        """ Check if an undirected edge has a non-negative weight """
+        v0 = UndirectedVertex(val='v0')
+        v1 = UndirectedVertex(val='v1')
+        e01 = UndirectedEdge((v0, v1), attrs={'weight': 0})
+        e10 = UndirectedEdge((v1, v0))
+
+        self.assertTrue(e01.has_valid_weight)
+        self.assertFalse(e10.has_valid_weight)
+
+        e01.set('weight', -1)
+        e10.set('weight', 2.5)
+
+        self.assertFalse(e01.has_valid_weight)
+        self.assertTrue(e10.has_valid_weight)
+
     def test_undirected_edge_del_attr(self):
         """ Delete an attribute of an undirected edge """
         v0 = UndirectedVertex(val='v0')
@@ -267,6 +314,22 @@ class TestDirectedEdge(unittest.TestCase):
 
         self.assertFalse(e01.has_attr('weight'))
 
+    def test_directed_edge_has_valid_weight(self):
+        """ Check if a directed edge has a non-negative weight """
+        v0 = DirectedVertex(val='v0')
+        v1 = DirectedVertex(val='v1')
+        e01 = DirectedEdge((v0, v1), attrs={'weight': 0})
+        e10 = DirectedEdge((v1, v0))
+
+        self.assertTrue(e01.has_valid_weight)
+        self.assertFalse(e10.has_valid_weight)
+
+        e01.set('weight', -1)
+        e10.set('weight', 2.5)
+
+        self.assertFalse(e01.has_valid_weight)
+        self.assertTrue(e10.has_valid_weight)
+
     def test_directed_edge_del_attr(self):
         """ Delete an attribute of a directed edge """
         v0 = DirectedVertex(val='v0')
@@ -0,0 +1,189 @@
+"""
+Tests for frozen.py
+"""
+
+
+from graphpy.graph import UndirectedGraph, DirectedGraph
+from graphpy.frozen import FrozenUndirectedGraph, FrozenDirectedGraph
+from graphpy.helpers import LazyPaths
+
+import unittest
+
+
+################################################################################
+#                                                                              #
+#                                  Undirected                                  #
+#                                                                              #
+################################################################################
+
+
+class TestFrozenUndirectedGraph(unittest.TestCase):
+
+    def test_freeze_undirected_graph(self):
+        """ Freeze an undirected graph into a CSR snapshot """
+        g = UndirectedGraph.from_lists([('v0',), ('v1',), ('v2',), ('v3',)],
+                                       [(('v0', 'v0'),),
+                                        (('v0', 'v1'),),
+                                        (('v0', 'v2'),)])
+        fg = g.freeze()
+
+        self.assertIsInstance(fg, FrozenUndirectedGraph)
+        self.assertEqual(len(fg), 4)
+        self.assertEqual(fg.num_edges, 3)
+        self.assertEqual(set(fg), set(['v0', 'v1', 'v2', 'v3']))
+        self.assertEqual(len(fg.offsets), 5)
+        self.assertEqual(len(fg.targets), 5)
+        self.assertEqual(set(fg.neighbors('v0')), set(['v0', 'v1', 'v2']))
+        self.assertEqual(set(fg.neighbors('v3')), set())
+        self.assertEqual(fg.degree('v0'), 4)
+        self.assertTrue(fg.has_edge(('v1', 'v0')))
+        self.assertFalse(fg.has_edge(('v1', 'v2')))
+        self.assertFalse(fg.has_edge(('v1', 'v4')))
+
+        g.add_edge(('v1', 'v2'))
+
+        self.assertFalse(fg.has_edge(('v1', 'v2')))
+
+    def test_frozen_undirected_graph_is_connected(self):
+        """ Get whether a path exists for every pair of vertices in a frozen
+            undirected graph """
+        g_connected = UndirectedGraph.from_dict({'v0': [('v1',), ('v2',)],
+                                                 'v1': [],
+                                                 'v2': []})
+        g_disconnected = UndirectedGraph.from_dict({'v0': [('v1',)],
+                                                    'v1': [],
+                                                    'v2': []})
+
+        self.assertTrue(g_connected.freeze().is_connected)
+        self.assertFalse(g_disconnected.freeze().is_connected)
+
+    def test_frozen_undirected_graph_search(self):
+        """ Search a frozen undirected graph """
+        g = UndirectedGraph.from_lists([('v0',), ('v1',), ('v2',), ('v3',),
+                                        ('v4',)],
+                                       [(('v0', 'v0'),),
+                                        (('v0', 'v1'),),
+                                        (('v0', 'v2'),),
+                                        (('v1', 'v3'),)])
+        fg = g.freeze()
+
+        for method in ['breadth_first', 'depth_first']:
+            self.assertEqual(fg.search('v0', goal_val='v0', method=method),
+                             ['v0'])
+            self.assertEqual(fg.search('v0', goal_val='v3', method=method),
+                             ['v0', 'v1', 'v3'])
+            self.assertIsNone(fg.search('v0', goal_val='v4', method=method))
+            self.assertEqual(fg.search('v0', method=method),
+                             g.search('v0', method=method))
+            self.assertIsInstance(fg.search('v0', method=method), LazyPaths)
+
+    def test_frozen_undirected_graph_dijkstra(self):
+        """ Perform Dijkstra's algorithm on a frozen undirected graph """
+        g = UndirectedGraph.from_lists([('A',), ('B',), ('C',), ('D',),
+                                        ('E',)],
+                                       [(('A', 'A'), {'weight': 1}),
+                                        (('A', 'B'), {'weight': 1}),
+                                        (('A', 'C'), {'weight': 2}),
+                                        (('B', 'C'), {'weight': 0}),
+                                        (('B', 'D'), {'weight': 5})])
+        fg = g.freeze()
+        negative_weight_g = g.clone()
+        negative_weight_g.get_edge(('B', 'C')).set('weight', -2)
+        missing_weight_g = g.clone()
+        missing_weight_g.get_edge(('A', 'B')).set('weight', None)
+
+        self.assertEqual(fg.dijkstra('A', goal_val='C'), ['A', 'B', 'C'])
+        self.assertEqual(fg.dijkstra('A', goal_val='D'), ['A', 'B', 'D'])
+        self.assertIsNone(fg.dijkstra('A', goal_val='E'))
+        self.assertEqual(fg.dijkstra('A', return_distances=True),
+                         g.dijkstra('A', return_distances=True))
+        A_paths = fg.dijkstra('A')
+        self.assertEqual(A_paths['D'], ['A', 'B', 'D'])
+        self.assertIsNone(A_paths['E'])
+        self.assertIsInstance(fg.dijkstra('A', goal_val='D',
+                                          return_distances=True), int)
+        float_weight_g = g.clone()
+        float_weight_g.get_edge(('B', 'D')).set('weight', 4.5)
+        self.assertEqual(float_weight_g.freeze().dijkstra(
+            'A', goal_val='D', return_distances=True), 5.5)
+
+        with self.assertRaises(ValueError):
+            negative_weight_g.freeze().dijkstra('A')
+        with self.assertRaises(ValueError):
+            missing_weight_g.freeze().dijkstra('A')
+
+        # the error is the one for the weight the edge had when frozen
+        negative_weight_fg = negative_weight_g.freeze()
+        negative_weight_g.get_edge(('B', 'C')).set('weight', None)
+        negative_weight_g.remove_edge(('B', 'C'))
+        with self.assertRaises(ValueError) as context:
+            negative_weight_fg.dijkstra('A')
+        self.assertIn("must have a non-negative weight",
+                      str(context.exception))
+
+
+################################################################################
+#                                                                              #
+#                                   Directed                                   #
+#                                                                              #
+################################################################################
+
+
+class TestFrozenDirectedGraph(unittest.TestCase):
+
+    def test_freeze_directed_graph(self):
+        """ Freeze a directed graph into a CSR snapshot """
+        g = DirectedGraph.from_lists([('v0',), ('v1',), ('v2',)],
+                                     [(('v0', 'v0'),),
+                                      (('v0', 'v1'),),
+                                      (('v2', 'v0'),)])
+        fg = g.freeze()
+
+        self.assertIsInstance(fg, FrozenDirectedGraph)
+        self.assertEqual(len(fg), 3)
+        self.assertEqual(fg.num_edges, 3)
+        self.assertEqual(set(fg.outs('v0')), set(['v0', 'v1']))
+        self.assertEqual(set(fg.ins('v0')), set(['v0', 'v2']))
+        self.assertTrue(fg.has_edge(('v0', 'v1')))
+        self.assertFalse(fg.has_edge(('v1', 'v0')))
+
+    def test_frozen_directed_graph_connectivity(self):
+        """ Get whether a frozen directed graph is weakly or strongly
+            connected """
+        g_strong = DirectedGraph.from_dict({'v0': [('v1',)],
+                                            'v1': [('v2',)],
+                                            'v2': [('v0',)]})
+        g_weak = DirectedGraph.from_dict({'v0': [('v1',)],
+                                          'v1': [],
+                                          'v2': [('v1',)]})
+        g_disconnected = DirectedGraph.from_dict({'v0': [('v1',)],
+                                                  'v1': [],
+                                                  'v2': []})
+
+        self.assertTrue(g_strong.freeze().is_strongly_connected)
+        self.assertTrue(g_strong.freeze().is_weakly_connected)
+        self.assertFalse(g_weak.freeze().is_strongly_connected)
+        self.assertTrue(g_weak.freeze().is_weakly_connected)
+        self.assertFalse(g_disconnected.freeze().is_strongly_connected)
+        self.assertFalse(g_disconnected.freeze().is_weakly_connected)
+
+    def test_frozen_directed_graph_search_and_dijkstra(self):
+        """ Search and perform Dijkstra's algorithm on a frozen directed
+            graph """
+        g = DirectedGraph.from_lists([('A',), ('B',), ('C',), ('D',)],
+                                     [(('A', 'B'), {'weight': 1}),
+                                      (('A', 'C'), {'weight': 2}),
+                                      (('B', 'C'), {'weight': 0}),
+                                      (('D', 'A'), {'weight': 1})])
+        fg = g.freeze()
+
+        self.assertEqual(fg.search('A', goal_val='C'), ['A', 'C'])
+        self.assertIsNone(fg.search('A', goal_val='D'))
+        self.assertEqual(fg.search('A'), g.search('A'))
+        self.assertEqual(fg.dijkstra('A', goal_val='C'), ['A', 'B', 'C'])
+        self.assertEqual(fg.dijkstra('A', return_distances=True),
+                         {'A': 0, 'B': 1, 'C': 1, 'D': float('inf')})
+
+
+if __name__ == '__main__':
+    unittest.main()
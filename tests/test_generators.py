@@ -0,0 +1,105 @@
+"""
+Tests for generators.py
+"""
+
+
+from graphpy.graph import UndirectedGraph, DirectedGraph
+from graphpy.generators import *
+
+import unittest
+
+
+class TestGenerators(unittest.TestCase):
+
+    def test_grid_graph(self):
+        """ Generate undirected and directed grids """
+        g = grid_graph(3, 4)
+        g_directed = grid_graph(3, 4, directed=True)
+
+        self.assertIsInstance(g, UndirectedGraph)
+        self.assertEqual(g.num_vertices, 12)
+        self.assertEqual(g.num_edges, 3 * 3 + 2 * 4)
+        self.assertTrue(g.has_edge(((1, 1), (1, 2))))
+        self.assertTrue(g.has_edge(((1, 1), (2, 1))))
+        self.assertFalse(g.has_edge(((1, 1), (2, 2))))
+        self.assertEqual(g.get_vertex((0, 0)).degree, 2)
+        self.assertEqual(g.get_vertex((1, 1)).degree, 4)
+        self.assertIsInstance(g_directed, DirectedGraph)
+        self.assertEqual(g_directed.num_edges, 2 * (3 * 3 + 2 * 4))
+        self.assertTrue(g_directed.has_edge(((1, 2), (1, 1))))
+        self.assertTrue(g_directed.is_strongly_connected)
+
+        with self.assertRaises(ValueError):
+            grid_graph(0, 4)
+
+    def test_barabasi_albert_graph(self):
+        """ Generate graphs by preferential attachment """
+        g = barabasi_albert_graph(1000, 3, seed=0)
+        g_directed = barabasi_albert_graph(1000, 3, directed=True, seed=0)
+
+        self.assertEqual(g.num_vertices, 1000)
+        self.assertEqual(g.num_edges, 3 * (1000 - 3))
+        self.assertTrue(g.is_connected)
+        self.assertTrue(max(v.degree for v in g) > 30)
+        self.assertTrue(all(v.out_degree == 3 for v in g_directed
+                            if v.val >= 3))
+        self.assertTrue(all(e.v_from.val > e.v_to.val
+                            for e in g_directed.edges))
+
+        with self.assertRaises(ValueError):
+            barabasi_albert_graph(3, 3)
+
+    def test_rmat_graph(self):
+        """ Generate recursive matrix graphs """
+        g = rmat_graph(8, edge_factor=8, seed=0)
+        g_undirected = rmat_graph(8, edge_factor=8, directed=False, seed=0)
+
+        self.assertIsInstance(g, DirectedGraph)
+        self.assertEqual(g.num_vertices, 256)
+        self.assertTrue(0 < g.num_edges <= 8 * 256)
+        self.assertFalse(any(e.v_from == e.v_to for e in g.edges))
+        self.assertTrue(g.get_vertex(0).out_degree >
+                        g.get_vertex(255).out_degree)
+        self.assertIsInstance(g_undirected, UndirectedGraph)
+        self.assertTrue(0 < g_undirected.num_edges <= 8 * 256)
+
+        with self.assertRaises(ValueError):
+            rmat_graph(8, probabilities=(0.5, 0.3, 0.3))
+
+    def test_watts_strogatz_graph(self):
+        """ Generate small-world graphs """
+        g_ring = watts_strogatz_graph(100, 4, 0.0)
+        g = watts_strogatz_graph(100, 4, 0.2, seed=0)
+
+        self.assertEqual(g_ring.num_edges, 200)
+        self.assertTrue(all(v.degree == 4 for v in g_ring))
+        self.assertTrue(g_ring.has_edge((99, 1)))
+        self.assertEqual(g.num_edges, 200)
+        self.assertFalse(any(e.is_self_edge for e in g.edges))
+        self.assertTrue(any(v.degree != 4 for v in g))
+
+        with self.assertRaises(ValueError):
+            watts_strogatz_graph(100, 3, 0.2)
+
+    def test_weighted_and_seeded_generators(self):
+        """ Generate graphs with random weights, reproducibly from a seed """
+        g = barabasi_albert_graph(200, 2, weight_range=(1, 10), seed=3)
+        g_same_seed = barabasi_albert_graph(200, 2, weight_range=(1, 10),
+                                            seed=3)
+        g_float = grid_graph(5, 5, weight_range=(0.5, 1.5), seed=3)
+
+        weights = lambda g: dict((frozenset(v.val for v in e.vertices),
+                                  e.get('weight')) for e in g.edges)
+        self.assertEqual(weights(g), weights(g_same_seed))
+        self.assertTrue(all(isinstance(w, int) and 1 <= w <= 10
+                            for w in weights(g).values()))
+        self.assertTrue(all(isinstance(w, float) and 0.5 <= w <= 1.5
+                            for w in weights(g_float).values()))
+        self.assertEqual(len(g.dijkstra(0, return_distances=True)), 200)
+
+        with self.assertRaises(ValueError):
+            grid_graph(5, 5, weight_range=(-1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,12 @@ Tests for graph.py
 
 
 from graphpy.graph import UndirectedGraph, DirectedGraph
+from graphpy.generators import grid_graph
+from graphpy.heuristics import euclidean
+from graphpy.helpers import (PriorityQueue, HeapqPriorityQueue,
+                             PairingPriorityQueue, RadixPriorityQueue)
 
+import random
 import unittest
 
 
@@ -169,6 +174,22 @@ class TestUndirectedGraph(unittest.TestCase):
         self.assertEqual(g_zero.num_edges, 0)
         self.assertEqual(g_one.num_edges, max_edges)
 
+    def test_create_seeded_random_undirected_graph(self):
+        """ Create reproducible random undirected graphs from a seed """
+        num_vertices = 200
+        v_vals = ['v' + str(i) for i in xrange(num_vertices)]
+        g_seeded = UndirectedGraph.random_graph(v_vals, 0.1, seed=7)
+        g_same_seed = UndirectedGraph.random_graph(v_vals, 0.1, seed=7)
+        g_rng = UndirectedGraph.random_graph(v_vals, 0.1, seed=random.Random(7))
+
+        edge_vals = lambda g: set(frozenset(v.val for v in e.vertices)
+                                  for e in g.edges)
+        max_edges = n_choose_2(num_vertices)
+        self.assertEqual(edge_vals(g_seeded), edge_vals(g_same_seed))
+        self.assertEqual(edge_vals(g_seeded), edge_vals(g_rng))
+        self.assertTrue(0.08 * max_edges < g_seeded.num_edges <
+                        0.12 * max_edges)
+
     def test_create_complete_undirected_graph(self):
         """ Create an undirected graph with edges between all nodes """
         num_vertices = 10
@@ -232,6 +253,7 @@ class TestUndirectedGraph(unittest.TestCase):
 
         self.assertTrue(g_connected.is_connected)
         self.assertFalse(g_disconnected.is_connected)
+        self.assertTrue(UndirectedGraph().is_connected)
         with self.assertRaises(AttributeError):
             g_connected.is_connected = False
         with self.assertRaises(AttributeError):
@@ -261,6 +283,15 @@ class TestUndirectedGraph(unittest.TestCase):
         self.assertNotEqual(v0, v0_prime)
         self.assertNotEqual(e01, e01_prime)
         self.assertEqual(v0.attrs, v0_prime.attrs)
+        # cloning doesn't allocate attrs dicts for anything without attrs
+        self.assertIsNone(g.get_vertex('v2')._attrs)
+        self.assertIsNone(g.get_edge(('v1', 'v3'))._attrs)
+        self.assertIsNone(g_prime.get_vertex('v2')._attrs)
+        self.assertIsNone(g_prime.get_edge(('v1', 'v3'))._attrs)
+        g.induced_subgraph(['v1', 'v2', 'v3'])
+        g.largest_component()
+        self.assertIsNone(g.get_vertex('v2')._attrs)
+        self.assertIsNone(g.get_edge(('v1', 'v3'))._attrs)
 
         g.add_vertex('v5', {'city': 'Jamestown'})
 
@@ -310,6 +341,48 @@ class TestUndirectedGraph(unittest.TestCase):
         self.assertEqual(e00.get('weight'), 5)
         self.assertEqual(e01.get('weight'), 7)
 
+    def test_undirected_graph_add_vertices(self):
+        """ Add many vertices to an undirected graph at once """
+        g = UndirectedGraph()
+        g.add_vertex('v0')
+        v_vals = g.add_vertices([('v1', {'city': 'Modena'}), ('v2',)])
+
+        self.assertEqual(v_vals, ['v1', 'v2'])
+        self.assertEqual(g.num_vertices, 3)
+        self.assertEqual(g.get_vertex('v1').get('city'), 'Modena')
+        with self.assertRaises(ValueError):
+            g.add_vertices([('v3',), 'v4'])
+        with self.assertRaises(TypeError):
+            g.add_vertices([('v3',), ([],)])
+        with self.assertRaises(ValueError):
+            g.add_vertices([('v3',), ('v0',), ('v4',), ('v4',)])
+        self.assertEqual(g.num_vertices, 3)
+        self.assertFalse(g.has_vertex('v3'))
+
+    def test_undirected_graph_add_edges(self):
+        """ Add many edges to an undirected graph at once """
+        g = UndirectedGraph.from_lists([('v0',), ('v1',), ('v2',)], [])
+        g.add_edges([(('v0', 'v0'),), (('v0', 'v1'), {'weight': 3})])
+
+        self.assertEqual(g.num_edges, 2)
+        self.assertTrue(g.has_edge(('v0', 'v0')))
+        self.assertEqual(g.get_edge(('v0', 'v1')).get('weight'), 3)
+        with self.assertRaises(ValueError):
+            g.add_edges([(('v1', 'v2'),), ('v0', 'v2')])
+        with self.assertRaises(ValueError):
+            g.add_edges([(('v1', 'v2'),), (('v0', 'v3'),)])
+        with self.assertRaises(ValueError):
+            g.add_edges([(('v1', 'v2'),), ((('v1', 'v0')),)])
+        with self.assertRaises(ValueError):
+            g.add_edges([(('v1', 'v2'),), (('v2', 'v1'),), (('v1', 'v2'),)])
+        with self.assertRaises(ValueError) as context:
+            g.add_edges([(('v1', 'v2'),), (('v0', 'v1', 'v2'),)])
+        self.assertIn("('v0', 'v1', 'v2')", str(context.exception))
+        with self.assertRaises(ValueError):
+            g.add_edge(('v0', 'v1', 'v2'))
+        self.assertEqual(g.num_edges, 2)
+        self.assertFalse(g.has_edge(('v1', 'v2')))
+
     def test_undirected_graph_remove_vertex(self):
         """ Remove vertices from an undirected graph """
         g = UndirectedGraph()
@@ -337,6 +410,28 @@ class TestUndirectedGraph(unittest.TestCase):
         self.assertFalse(g.has_edge(('v1', 'v0')))
         self.assertFalse(g.has_edge(('v1', 'v2')))
 
+    def test_undirected_graph_readd_removed_vertex(self):
+        """ Remove vertices from an undirected graph and add new ones in their
+            place """
+        g = UndirectedGraph.from_lists([('v0',), ('v1',), ('v2',)],
+                                       [(('v0', 'v1'),), (('v1', 'v2'),)])
+
+        g.remove_vertex('v1')
+        g.add_vertex('v3')
+        g.add_vertex('v1')
+        g.add_edge(('v3', 'v0'))
+        anonymous_val = g.add_vertex()
+
+        self.assertEqual(g.num_vertices, 5)
+        self.assertEqual(g.num_edges, 1)
+        self.assertTrue(g.has_edge(('v0', 'v3')))
+        self.assertFalse(g.has_edge(('v0', 'v1')))
+        self.assertFalse(g.has_edge(('v1', 'v2')))
+        self.assertEqual(g.get_vertex('v1').degree, 0)
+        self.assertEqual(g.get_vertex(anonymous_val).val, anonymous_val)
+        self.assertEqual(set(v.val for v in g),
+                         set(['v0', 'v1', 'v2', 'v3', anonymous_val]))
+
     def test_undirected_graph_remove_edge(self):
         """ Remove edges from an undirected graph """
         g = UndirectedGraph()
@@ -357,6 +452,10 @@ class TestUndirectedGraph(unittest.TestCase):
         self.assertFalse(g.has_edge(('v0', 'v1')))
         self.assertFalse(g.has_edge(('v1', 'v0')))
         self.assertFalse(g.has_edge(('v0', 'v2')))
+        for v_vals in [('v0', 'v1'), ('v0', 'v3')]:
+            with self.assertRaises(KeyError) as context:
+                g.remove_edge(v_vals)
+            self.assertEqual(context.exception.args, (v_vals,))
 
     def test_undirected_graph_search(self):
         """ Search for paths from an undirected vertex to all vertices reachable
@@ -403,6 +502,648 @@ class TestUndirectedGraph(unittest.TestCase):
                           'v2': ['v0', 'v2'],
                           'v3': ['v0', 'v1', 'v3']})
 
+    def test_undirected_graph_iter_bfs_and_iter_dfs(self):
+        """ Lazily traverse an undirected graph breadth first and depth
+            first """
+
+        """ __
+           | /
+           v0 - v1 - v3
+             \
+              v2 - v4    v5
+        """
+        g = UndirectedGraph.from_lists([('v0',), ('v1',), ('v2',), ('v3',),
+                                        ('v4',), ('v5',)],
+                                       [(('v0', 'v0'),),
+                                        (('v0', 'v1'),),
+                                        (('v0', 'v2'),),
+                                        (('v1', 'v3'),),
+                                        (('v2', 'v4'),)])
+
+        bfs = list(g.iter_bfs('v0'))
+        self.assertEqual(bfs[0], ('v0', 0, None))
+        self.assertEqual(set(bfs[1:3]),
+                         set([('v1', 1, 'v0'), ('v2', 1, 'v0')]))
+        self.assertEqual(set(bfs[3:]),
+                         set([('v3', 2, 'v1'), ('v4', 2, 'v2')]))
+        dfs = list(g.iter_dfs('v0'))
+        self.assertEqual(dfs[0], ('v0', 0, None))
+        self.assertEqual(set(dfs), set(bfs))
+        first_branch = dfs[1][0]
+        self.assertEqual(dfs[2][2], first_branch)
+
+        finished = []
+        list(g.iter_dfs('v0', on_finish=finished.append))
+        self.assertEqual(finished[-1], 'v0')
+        self.assertLess(finished.index('v3'), finished.index('v1'))
+        self.assertLess(finished.index('v4'), finished.index('v2'))
+
+        examined = []
+        on_edge = lambda v_val, next_val: examined.append((v_val, next_val))
+        list(g.iter_bfs('v3', on_edge=on_edge))
+        self.assertIn(('v0', 'v0'), examined)
+        self.assertIn(('v1', 'v3'), examined)
+
+        for iter_method in [g.iter_bfs, g.iter_dfs]:
+            pruned = iter_method('v0', on_discover=lambda v_val, depth, parent:
+                                 v_val != 'v2')
+            self.assertEqual(set(v_val for v_val, _, _ in pruned),
+                             set(['v0', 'v1', 'v2', 'v3']))
+            skipped = iter_method('v0', on_edge=lambda v_val, next_val:
+                                  next_val != 'v1')
+            self.assertEqual(set(v_val for v_val, _, _ in skipped),
+                             set(['v0', 'v2', 'v4']))
+            discovered = []
+            on_discover = lambda v_val, depth, parent: discovered.append(v_val)
+            for v_val, _, _ in iter_method('v0', on_discover=on_discover):
+                if v_val == 'v1':
+                    break
+            self.assertEqual(discovered[-1], 'v1')
+            self.assertTrue(len(discovered) < 5)
+            self.assertEqual(list(iter_method('v5')), [('v5', 0, None)])
+            with self.assertRaises(KeyError):
+                iter_method('v6')
+
+    def test_undirected_graph_dijkstra_explores_locally(self):
+        """ Perform Dijkstra's algorithm on an undirected graph, only exploring
+            the vertices needed """
+        num_vertices = 1000
+        vertices = [(i,) for i in xrange(num_vertices)]
+        edges = [((i, i + 1), {'weight': 1})
+                 for i in xrange(num_vertices - 1)]
+        g = UndirectedGraph.from_lists(vertices + [('island',)], edges)
+        inserted = []
+
+        class RecordingQueue(PriorityQueue):
+            def insert(self, item, priority):
+                inserted.append(item.val)
+                PriorityQueue.insert(self, item, priority)
+
+        self.assertEqual(g.dijkstra(0, goal_val=3,
+                                    priority_queue=RecordingQueue),
+                         [0, 1, 2, 3])
+        self.assertTrue(len(inserted) <= 4)
+        self.assertEqual(g.dijkstra(0, goal_val=3, return_distances=True), 3)
+        self.assertEqual(g.dijkstra(0, goal_val='island',
+                                    return_distances=True), float('inf'))
+        self.assertIsNone(g.dijkstra(0, goal_val='island'))
+        with self.assertRaises(KeyError):
+            g.dijkstra(0, goal_val='nowhere')
+
+        distances = g.dijkstra(0, return_distances=True)
+        self.assertEqual(len(distances), num_vertices + 1)
+        self.assertEqual(distances[num_vertices - 1], num_vertices - 1)
+        self.assertEqual(distances['island'], float('inf'))
+        g.add_vertex('late')
+        g.remove_vertex('island')
+        self.assertEqual(len(distances), num_vertices + 1)
+        self.assertEqual(distances['island'], float('inf'))
+        with self.assertRaises(KeyError):
+            distances['late']
+        g.remove_vertex('late')
+        g.add_vertex('island')
+        paths = g.dijkstra(0)
+        self.assertEqual(paths[5], [0, 1, 2, 3, 4, 5])
+        self.assertIsNone(paths['island'])
+        with self.assertRaises(KeyError):
+            paths['nowhere']
+
+    def test_undirected_graph_dijkstra_with_other_queues(self):
+        """ Perform Dijkstra's algorithm on an undirected graph with each
+            alternative priority queue, and with Dial's algorithm """
+        rng = random.Random(0)
+        vertices = [(i,) for i in xrange(200)]
+        edge_keys = set(tuple(sorted([rng.randrange(200),
+                                      rng.randrange(200)]))
+                        for _ in xrange(800))
+        edges = [(edge_key, {'weight': rng.randint(0, 20)})
+                 for edge_key in edge_keys]
+        g = UndirectedGraph.from_lists(vertices, edges)
+        distances = g.dijkstra(0, return_distances=True)
+
+        for queue_cls in [HeapqPriorityQueue, PairingPriorityQueue,
+                          RadixPriorityQueue]:
+            self.assertEqual(g.dijkstra(0, return_distances=True,
+                                        priority_queue=queue_cls), distances)
+            path = g.dijkstra(0, goal_val=199, priority_queue=queue_cls)
+            self.assertEqual(sum(g.get_edge(edge_key).get('weight')
+                                 for edge_key in zip(path, path[1:])),
+                             distances[199])
+
+        self.assertEqual(g.dijkstra(0, return_distances=True, method='dial'),
+                         distances)
+        self.assertEqual(g.dijkstra(0, return_distances=True, method='dial',
+                                    max_weight=20), distances)
+        self.assertEqual(g.dijkstra(0, goal_val=199, return_distances=True,
+                                    method='dial'), distances[199])
+        with self.assertRaises(ValueError):
+            g.dijkstra(0, method='dial', max_weight=5)
+        with self.assertRaises(ValueError):
+            g.dijkstra(0, method='dial',
+                       priority_queue=HeapqPriorityQueue)
+
+        g.get_edge(edges[0][0]).set('weight', 1.5)
+        with self.assertRaises(ValueError):
+            g.dijkstra(0, method='dial')
+
+    def test_undirected_graph_shortest_path(self):
+        """ Find shortest paths on an undirected graph with bidirectional
+            Dijkstra """
+        rng = random.Random(1)
+        vertices = [(i,) for i in xrange(100)] + [('island',)]
+        edge_keys = set((rng.randrange(100), rng.randrange(100))
+                        for _ in xrange(300))
+        g = UndirectedGraph.from_lists(vertices, [(edge_key,
+                                         {'weight': rng.randint(0, 20)})
+                                        for edge_key in edge_keys
+                                        if edge_key[::-1] not in edge_keys
+                                        or edge_key[0] <= edge_key[1]])
+
+        for _ in xrange(50):
+            start_val, goal_val = rng.randrange(100), rng.randrange(100)
+            distance = g.dijkstra(start_val, goal_val=goal_val,
+                                  return_distances=True)
+            path = g.shortest_path(start_val, goal_val)
+            self.assertEqual(g.shortest_path(start_val, goal_val,
+                                             return_distances=True), distance)
+            if distance == float('inf'):
+                self.assertIsNone(path)
+                continue
+            self.assertEqual((path[0], path[-1]), (start_val, goal_val))
+            self.assertEqual(sum(g.get_edge(edge_key).get('weight')
+                                 for edge_key in zip(path, path[1:])),
+                             distance)
+        self.assertEqual(g.shortest_path(0, 0), [0])
+        self.assertIsNone(g.shortest_path(0, 'island'))
+        self.assertEqual(g.shortest_path(0, 'island', return_distances=True),
+                         float('inf'))
+        with self.assertRaises(KeyError):
+            g.shortest_path(0, 'nowhere')
+        with self.assertRaises(KeyError):
+            g.shortest_path('nowhere', 0)
+
+        g.add_edge((0, 'island'))
+        with self.assertRaises(ValueError):
+            g.shortest_path(0, 1)
+
+    def test_undirected_graph_shortest_path_explores_less(self):
+        """ Settle fewer vertices finding a shortest path on an undirected
+            graph with bidirectional Dijkstra than with Dijkstra """
+        g = grid_graph(41, 41, directed=False, weight_range=(1, 1))
+        popped = []
+
+        class RecordingQueue(PriorityQueue):
+            def pop_min(self):
+                entry = PriorityQueue.pop_min(self)
+                popped.append(entry)
+                return entry
+
+        self.assertEqual(g.dijkstra((20, 10), goal_val=(20, 30),
+                                    return_distances=True,
+                                    priority_queue=RecordingQueue), 20)
+        num_popped_by_dijkstra = len(popped)
+        del popped[:]
+        path = g.shortest_path((20, 10), (20, 30),
+                               priority_queue=RecordingQueue)
+
+        self.assertEqual(len(path), 21)
+        self.assertTrue(len(popped) < 0.6 * num_popped_by_dijkstra)
+
+    def test_undirected_graph_astar(self):
+        """ Find shortest paths on an undirected graph with A* """
+        g = grid_graph(41, 41, directed=False, weight_range=(1, 3), seed=0)
+        for v in g:
+            v.set('x', v.val[1])
+            v.set('y', v.val[0])
+        g.add_vertex('island', attrs={'x': 100, 'y': 100})
+        popped = []
+
+        class RecordingQueue(PriorityQueue):
+            def pop_min(self):
+                entry = PriorityQueue.pop_min(self)
+                popped.append(entry)
+                return entry
+
+        for start_val, goal_val in [((20, 10), (20, 30)), ((0, 0), (40, 40)),
+                                    ((5, 35), (30, 2)), ((7, 7), (7, 7))]:
+            distance = g.dijkstra(start_val, goal_val=goal_val,
+                                  return_distances=True)
+            path = g.astar(start_val, goal_val, euclidean())
+            self.assertEqual(g.astar(start_val, goal_val, euclidean(),
+                                     return_distances=True), distance)
+            self.assertEqual((path[0], path[-1]), (start_val, goal_val))
+            self.assertEqual(sum(g.get_edge(edge_key).get('weight')
+                                 for edge_key in zip(path, path[1:])),
+                             distance)
+
+        g.dijkstra((20, 10), goal_val=(20, 30), priority_queue=RecordingQueue)
+        num_popped_by_dijkstra = len(popped)
+        del popped[:]
+        g.astar((20, 10), (20, 30), euclidean(), priority_queue=RecordingQueue)
+        self.assertTrue(len(popped) < 0.5 * num_popped_by_dijkstra)
+
+        # a heuristic that knows nothing is just Dijkstra's algorithm
+        self.assertEqual(g.astar((0, 0), (40, 40), lambda v, goal: 0,
+                                 return_distances=True),
+                         g.dijkstra((0, 0), goal_val=(40, 40),
+                                    return_distances=True))
+        self.assertIsNone(g.astar((0, 0), 'island', euclidean()))
+        self.assertEqual(g.astar((0, 0), 'island', euclidean(),
+                                 return_distances=True), float('inf'))
+        with self.assertRaises(KeyError):
+            g.astar((0, 0), 'nowhere', euclidean())
+
+        # a heuristic that never overestimates, but overestimates A to B
+        g_inconsistent = UndirectedGraph.from_lists(
+            [('S',), ('A',), ('B',), ('G',)],
+            [(('S', 'A'), {'weight': 1}),
+             (('A', 'B'), {'weight': 1}),
+             (('S', 'B'), {'weight': 3}),
+             (('B', 'G'), {'weight': 3})])
+        estimates = {'S': 0, 'A': 4, 'B': 0, 'G': 0}
+        self.assertEqual(g_inconsistent.astar('S', 'G',
+                                              lambda v, goal: estimates[v.val]),
+                         ['S', 'A', 'B', 'G'])
+
+    def test_undirected_graph_dijkstra_cutoffs(self):
+        """ Perform Dijkstra's algorithm on an undirected graph, stopping at a
+            maximum distance, a maximum number of results, or a set of
+            goals """
+        num_vertices = 1000
+        vertices = [(i,) for i in xrange(num_vertices)]
+        edges = [((i, i + 1), {'weight': 1})
+                 for i in xrange(num_vertices - 1)]
+        edges.append(((0, 'far'), {'weight': 100}))
+        g = UndirectedGraph.from_lists(vertices + [('far',)], edges)
+        inserted = []
+
+        class RecordingQueue(PriorityQueue):
+            def insert(self, item, priority):
+                inserted.append(item.val)
+                PriorityQueue.insert(self, item, priority)
+
+        distances = g.dijkstra(0, return_distances=True, max_distance=5,
+                               priority_queue=RecordingQueue)
+        self.assertEqual(distances, dict((i, i) for i in xrange(6)))
+        self.assertTrue(len(inserted) <= 6)
+        self.assertEqual(g.dijkstra(0, return_distances=True, max_distance=4.5),
+                         dict((i, i) for i in xrange(5)))
+        paths = g.dijkstra(0, max_distance=5)
+        self.assertEqual(set(paths), set(xrange(6)))
+        self.assertEqual(paths[3], [0, 1, 2, 3])
+        with self.assertRaises(KeyError):
+            paths[6]
+        self.assertEqual(g.dijkstra(0, return_distances=True, max_results=3),
+                         {0: 0, 1: 1, 2: 2})
+        self.assertEqual(g.dijkstra(0, return_distances=True,
+                                    max_results=2 * num_vertices),
+                         g.dijkstra(0, return_distances=True))
+        self.assertEqual(g.dijkstra(0, return_distances=True,
+                                    goal_vals=[4, 2]),
+                         dict((i, i) for i in xrange(5)))
+        self.assertEqual(g.dijkstra(0, goal_vals=[4, 2])[4], [0, 1, 2, 3, 4])
+        self.assertEqual(g.dijkstra(0, goal_val=3, max_distance=5),
+                         [0, 1, 2, 3])
+        self.assertIsNone(g.dijkstra(0, goal_val=10, max_distance=5))
+        self.assertEqual(g.dijkstra(0, goal_val='far', return_distances=True,
+                                    max_distance=99), float('inf'))
+        self.assertEqual(g.dijkstra(0, goal_val='far', return_distances=True,
+                                    max_distance=100), 100)
+        self.assertEqual(g.dijkstra(0, return_distances=True, max_distance=5,
+                                    method='dial'),
+                         dict((i, i) for i in xrange(6)))
+
+        with self.assertRaises(KeyError):
+            g.dijkstra(0, goal_vals=[4, 'nowhere'])
+        with self.assertRaises(ValueError):
+            g.dijkstra(0, max_results=0)
+
+    def test_undirected_graph_multi_source_dijkstra_and_search(self):
+        """ Perform Dijkstra's algorithm and search on an undirected graph from
+            many starts at once """
+        rng = random.Random(2)
+        edge_keys = set(tuple(sorted([rng.randrange(200),
+                                      rng.randrange(200)]))
+                        for _ in xrange(600))
+        g = UndirectedGraph.from_lists([(i,) for i in xrange(200)],
+                             [(edge_key, {'weight': rng.randint(0, 20)})
+                              for edge_key in edge_keys])
+        start_vals = rng.sample(xrange(200), 5)
+        distances_by_start = dict(
+            (start_val, g.dijkstra(start_val, return_distances=True))
+            for start_val in start_vals)
+        paths_by_start = dict((start_val, g.search(start_val))
+                              for start_val in start_vals)
+
+        distances, sources = g.dijkstra(start_vals=start_vals,
+                                        return_distances=True)
+        for v in g:
+            distance = min(distances_by_start[start_val][v.val]
+                           for start_val in start_vals)
+            self.assertEqual(distances[v.val], distance)
+            if distance == float('inf'):
+                self.assertFalse(v.val in sources)
+            else:
+                self.assertEqual(
+                    distances_by_start[sources[v.val]][v.val], distance)
+        paths, sources = g.dijkstra(start_vals=start_vals)
+        self.assertTrue(all(paths[v_val][0] == source
+                            for v_val, source in sources.iteritems()))
+        goal_val = max(sources)
+        path, _ = g.dijkstra(start_vals=start_vals, goal_val=goal_val)
+        self.assertEqual(path[-1], goal_val)
+        self.assertEqual(g.dijkstra(start_vals=start_vals, goal_val=goal_val,
+                                    return_distances=True)[0],
+                         distances[goal_val])
+        nearest, sources = g.dijkstra(start_vals=start_vals,
+                                      return_distances=True, max_distance=3)
+        self.assertEqual(set(nearest), set(sources))
+        self.assertTrue(all(distance <= 3 for distance in nearest.values()))
+
+        paths, sources = g.search(start_vals=start_vals)
+        for v_val, source in sources.iteritems():
+            self.assertEqual(paths[v_val][0], source)
+            self.assertEqual(len(paths[v_val]),
+                             min(len(paths_by_start[start_val][v_val])
+                                 for start_val in start_vals
+                                 if v_val in paths_by_start[start_val]))
+        self.assertEqual(set(paths),
+                         set(v_val for start_val in start_vals
+                             for v_val in paths_by_start[start_val]))
+        self.assertEqual(g.search(start_vals=[], goal_val=0), (None, {}))
+
+        with self.assertRaises(ValueError):
+            g.dijkstra(0, start_vals=start_vals)
+        with self.assertRaises(ValueError):
+            g.search()
+        with self.assertRaises(KeyError):
+            g.dijkstra(start_vals=[0, 'nowhere'])
+
+    def test_undirected_graph_tracks_connectivity(self):
+        """ Keep track of the connected components of an undirected graph as
+            vertices and edges are added and removed """
+        rng = random.Random(3)
+        g = UndirectedGraph.from_lists([(i,) for i in xrange(30)], [])
+        g_tracked = g.clone()
+        g_tracked.track_connectivity()
+
+        for _ in xrange(300):
+            v0_val, v1_val = rng.randrange(40), rng.randrange(40)
+            if rng.random() < 0.1:
+                if g.has_vertex(v0_val):
+                    g.remove_vertex(v0_val)
+                    g_tracked.remove_vertex(v0_val)
+                else:
+                    g.add_vertex(v0_val)
+                    g_tracked.add_vertex(v0_val)
+            elif not (g.has_vertex(v0_val) and g.has_vertex(v1_val)):
+                continue
+            elif g.has_edge((v0_val, v1_val)):
+                if rng.random() < 0.3:
+                    g.remove_edge((v0_val, v1_val))
+                    g_tracked.remove_edge((v0_val, v1_val))
+            elif rng.random() < 0.5:
+                g.add_edge((v0_val, v1_val))
+                g_tracked.add_edge((v0_val, v1_val))
+            else:
+                g.add_edges([((v0_val, v1_val),)])
+                g_tracked.add_edges([((v0_val, v1_val),)])
+
+            if g.num_vertices:
+                self.assertEqual(g_tracked.is_connected,
+                                 g.is_connected)
+            v_vals = [v.val for v in g]
+            for _ in xrange(3):
+                v0_val, v1_val = rng.choice(v_vals), rng.choice(v_vals)
+                self.assertEqual(
+                    g_tracked.are_connected(v0_val, v1_val),
+                    g.are_connected(v0_val, v1_val))
+
+        g_full = UndirectedGraph.complete_graph(range(10))
+        g_full.track_connectivity()
+        self.assertTrue(g_full.is_connected)
+        self.assertTrue(g_full.clone().is_connected)
+        g_full.add_vertex('island')
+        self.assertFalse(g_full.is_connected)
+        self.assertFalse(g_full.are_connected(0, 'island'))
+        g_full.track_connectivity(False)
+        self.assertFalse(g_full.are_connected(0, 'island'))
+        with self.assertRaises(KeyError):
+            g_full.are_connected(0, 'nowhere')
+
+    def test_undirected_graph_connected_components(self):
+        """ Label the connected components of an undirected graph, and get
+            the largest one as a new graph """
+        vertices = [('v0', {'city': 'Paris'}), ('v1',), ('v2',), ('v3',),
+                    ('v4',), ('v5',), ('v6',)]
+        edges = [(('v0', 'v1'), {'weight': 1}),
+                 (('v2', 'v1'), {'weight': 2}),
+                 (('v3', 'v4'),),
+                 (('v5', 'v5'),)]
+        g = UndirectedGraph.from_lists(vertices, edges)
+        g_tracked = g.clone()
+        g_tracked.track_connectivity()
+
+        for graph in [g, g_tracked]:
+            labels, sizes = graph.connected_components()
+            self.assertEqual(len(labels), 7)
+            self.assertEqual(len(sizes), 4)
+            self.assertEqual(labels['v0'], labels['v1'])
+            self.assertEqual(labels['v0'], labels['v2'])
+            self.assertEqual(labels['v3'], labels['v4'])
+            self.assertEqual(len(set(labels[v_val]
+                                     for v_val in ['v0', 'v3', 'v5', 'v6'])),
+                             4)
+            self.assertEqual(sorted(sizes), [1, 1, 2, 3])
+            self.assertEqual(sizes[labels['v0']], 3)
+            self.assertEqual(sorted(labels.values()), sorted(
+                label for label, size in enumerate(sizes)
+                for _ in xrange(size)))
+
+            largest = graph.largest_component()
+            self.assertEqual(set(v.val for v in largest),
+                             set(['v0', 'v1', 'v2']))
+            self.assertEqual(largest.num_edges, 2)
+            self.assertEqual(largest.get_edge(('v2', 'v1')).get('weight'), 2)
+            self.assertEqual(largest.get_vertex('v0').get('city'), 'Paris')
+            self.assertIsNot(largest.get_vertex('v0').attrs,
+                             graph.get_vertex('v0').attrs)
+            self.assertTrue(largest.is_connected)
+
+        g.remove_edge(('v2', 'v1'))
+        g_tracked.remove_edge(('v2', 'v1'))
+        labels, sizes = g.connected_components()
+        self.assertEqual(sorted(sizes), [1, 1, 1, 2, 2])
+        self.assertEqual(g_tracked.connected_components(), (labels, sizes))
+        self.assertEqual(set(v.val for v in g.largest_component()),
+                         set(['v0', 'v1']))
+        self.assertEqual(UndirectedGraph().connected_components(), ({}, []))
+        self.assertEqual(UndirectedGraph().largest_component().num_vertices, 0)
+
+    def test_undirected_graph_subgraph_view(self):
+        """ View the vertices and edges of an undirected graph that pass some
+            filters, without copying them """
+        g = UndirectedGraph.from_lists([('A', {'region': 0}),
+                                        ('B', {'region': 0}),
+                                        ('C', {'region': 0}),
+                                        ('D', {'region': 1})],
+                                       [(('A', 'B'), {'weight': 1}),
+                                        (('B', 'C'), {'weight': 1}),
+                                        (('A', 'C'), {'weight': 5,
+                                                      'toll': True}),
+                                        (('C', 'D'), {'weight': 1}),
+                                        (('D', 'D'), {'weight': -1})])
+        sv = g.subgraph_view(vertex_filter=lambda v: v.get('region') == 0,
+                             edge_filter=lambda e: not e.get('toll'))
+
+        self.assertIsInstance(sv, UndirectedGraph)
+        self.assertEqual(len(sv), 3)
+        self.assertEqual(sv.num_edges, 2)
+        self.assertEqual(set(v.val for v in sv), set(['A', 'B', 'C']))
+        self.assertTrue(sv.has_vertex('A'))
+        self.assertFalse(sv.has_vertex('D'))
+        self.assertIsNone(sv.get_vertex('D'))
+        self.assertTrue(sv.has_edge(('B', 'A')))
+        self.assertFalse(sv.has_edge(('A', 'C')))
+        self.assertIsNone(sv.get_edge(('C', 'D')))
+        self.assertEqual(set(v.val for v in sv.get_vertex('C').neighbors),
+                         set(['B']))
+        self.assertEqual(sv.get_vertex('C').degree, 1)
+        self.assertEqual(sv.search('A', goal_val='C'), ['A', 'B', 'C'])
+        self.assertEqual(sv.dijkstra('A', return_distances=True),
+                         {'A': 0, 'B': 1, 'C': 2})
+        self.assertTrue(sv.is_connected)
+        self.assertTrue(sv.are_connected('A', 'C'))
+        with self.assertRaises(KeyError):
+            sv.are_connected('A', 'D')
+        with self.assertRaises(ValueError):
+            g.dijkstra('A')
+        with self.assertRaises(TypeError):
+            sv.add_edge(('A', 'C'))
+
+        sv_copy = sv.clone()
+        self.assertEqual(type(sv_copy), UndirectedGraph)
+        self.assertEqual(sv_copy.num_edges, 2)
+        self.assertEqual(sv_copy.get_vertex('A').get('region'), 0)
+        self.assertEqual(g.subgraph_view().num_edges, g.num_edges)
+        self.assertEqual(sv.subgraph_view(lambda v: v.val != 'B').num_edges,
+                         0)
+
+        g.get_vertex('D').set('region', 0)
+        with self.assertRaises(ValueError):
+            sv.dijkstra('A')
+        g.get_edge(('D', 'D')).set('weight', 1)
+        self.assertEqual(sv.dijkstra('A', goal_val='D'),
+                         ['A', 'B', 'C', 'D'])
+
+    def test_undirected_graph_induced_subgraph(self):
+        """ Create a new undirected graph of some vertices and the edges
+            between them """
+        g = UndirectedGraph.from_lists([('A', {'city': 'Paris'}), ('B',),
+                                        ('C',), ('D',)],
+                                       [(('A', 'A'), {'weight': 1}),
+                                        (('A', 'B'), {'weight': 2}),
+                                        (('B', 'C'), {'weight': 3}),
+                                        (('A', 'C'),),
+                                        (('C', 'D'),)])
+        g.track_connectivity()
+        h = g.induced_subgraph(['A', 'C', 'B', 'A'])
+
+        self.assertEqual(set(v.val for v in h), set(['A', 'B', 'C']))
+        self.assertEqual(h.num_edges, 4)
+        self.assertTrue(h.has_edge(('A', 'A')))
+        self.assertFalse(h.has_vertex('D'))
+        self.assertEqual(h.get_edge(('B', 'A')).get('weight'), 2)
+        self.assertEqual(h.get_vertex('A').get('city'), 'Paris')
+        self.assertIsNot(h.get_vertex('A').attrs, g.get_vertex('A').attrs)
+        self.assertIsNot(h.get_edge(('A', 'B')), g.get_edge(('A', 'B')))
+        self.assertTrue(h.is_connected)
+        self.assertEqual(g.induced_subgraph([]).num_vertices, 0)
+        self.assertEqual(g.subgraph_view(edge_filter=lambda e: e.has_attr(
+            'weight')).induced_subgraph(['A', 'B', 'C']).num_edges, 3)
+        with self.assertRaises(KeyError):
+            g.induced_subgraph(['A', 'E'])
+
+    def test_undirected_graph_tracks_invalid_weights(self):
+        """ Keep track of which edges of an undirected graph have invalid
+            weights as edges are added, removed, and reweighted """
+        g = UndirectedGraph.from_lists([('A',), ('B',), ('C',)],
+                                       [(('A', 'B'), {'weight': 1}),
+                                        (('B', 'C'), {'weight': 2})])
+
+        self.assertEqual(g.dijkstra('A', goal_val='C'), ['A', 'B', 'C'])
+
+        g.get_edge(('A', 'B')).set('weight', -1)
+        with self.assertRaises(ValueError):
+            g.dijkstra('A')
+
+        g.get_edge(('A', 'B')).set('weight', 3)
+        self.assertEqual(g.dijkstra('A', goal_val='C', return_distances=True),
+                         5)
+
+        g.get_edge(('B', 'C')).del_attr('weight')
+        with self.assertRaises(ValueError):
+            g.dijkstra('A')
+
+        g.remove_edge(('B', 'C'))
+        self.assertIsNone(g.dijkstra('A', goal_val='C'))
+
+        g.add_edge(('A', 'C'))
+        with self.assertRaises(ValueError):
+            g.dijkstra('A')
+
+        g.get_edge(('A', 'C')).set('weight', 1)
+        self.assertEqual(g.dijkstra('A', goal_val='C'), ['A', 'C'])
+
+        g.add_edges([(('C', 'B'), {'weight': None})])
+        removed_edge = g.get_edge(('C', 'B'))
+        with self.assertRaises(ValueError):
+            g.dijkstra('A')
+
+        g.remove_vertex('B')
+        removed_edge.set('weight', -5)
+        self.assertEqual(g.dijkstra('A', goal_val='C'), ['A', 'C'])
+
+        # weights written straight into attrs are checked as they're relaxed
+        g.get_edge(('A', 'C')).attrs['weight'] = -1
+        with self.assertRaises(ValueError) as context:
+            g.dijkstra('A')
+        self.assertIn("V(C)", str(context.exception))
+        with self.assertRaises(ValueError):
+            g.dijkstra('A', method='dial', max_weight=1)
+        with self.assertRaises(ValueError):
+            g.shortest_path('A', 'C')
+        with self.assertRaises(ValueError):
+            g.astar('A', 'C', lambda v, goal: 0)
+
+        # weights fixed without set are found valid once checked again
+        attrs = {'weight': None}
+        g = UndirectedGraph.from_lists([('A',), ('B',), ('C',)],
+                                       [(('A', 'B'), attrs), (('B', 'C'),)])
+        attrs['weight'] = 2
+        g.get_edge(('B', 'C')).attrs['weight'] = 5
+        self.assertEqual(g.dijkstra('A', goal_val='C', return_distances=True),
+                         7)
+        self.assertEqual(g.shortest_path('A', 'C'), ['A', 'B', 'C'])
+        g.get_edge(('B', 'C')).attrs['weight'] = None
+        with self.assertRaises(ValueError) as context:
+            g.dijkstra('A')
+        self.assertIn("must have a weight", str(context.exception))
+
+    def test_undirected_graph_search_long_chain(self):
+        """ Search a long chain of undirected vertices """
+        num_vertices = 20000
+        vertices = [(i,) for i in xrange(num_vertices)]
+        edges = [((i, i + 1),) for i in xrange(num_vertices - 1)]
+        g = UndirectedGraph.from_lists(vertices, edges)
+
+        for method in ['breadth_first', 'depth_first']:
+            paths = g.search(0, method=method)
+            self.assertEqual(len(paths), num_vertices)
+            self.assertEqual(paths[num_vertices - 1], range(num_vertices))
+            self.assertEqual(g.search(0, goal_val=num_vertices - 1,
+                                      method=method), range(num_vertices))
+
     def test_undirected_graph_dijkstra(self):
         """ Perform Dijkstra's algorithm on an undirected graph """
 
@@ -680,6 +1421,22 @@ class TestDirectedGraph(unittest.TestCase):
         self.assertEqual(g_zero.num_edges, 0)
         self.assertEqual(g_one.num_edges, max_edges)
 
+    def test_create_seeded_random_directed_graph(self):
+        """ Create reproducible random directed graphs from a seed """
+        num_vertices = 200
+        v_vals = ['v' + str(i) for i in xrange(num_vertices)]
+        g_seeded = DirectedGraph.random_graph(v_vals, 0.1, seed=7)
+        g_same_seed = DirectedGraph.random_graph(v_vals, 0.1, seed=7)
+        g_rng = DirectedGraph.random_graph(v_vals, 0.1, seed=random.Random(7))
+
+        edge_vals = lambda g: set((e.v_from.val, e.v_to.val)
+                                  for e in g.edges)
+        max_edges = num_vertices ** 2
+        self.assertEqual(edge_vals(g_seeded), edge_vals(g_same_seed))
+        self.assertEqual(edge_vals(g_seeded), edge_vals(g_rng))
+        self.assertTrue(0.08 * max_edges < g_seeded.num_edges <
+                        0.12 * max_edges)
+
     def test_create_complete_directed_graph(self):
         """ Create a directed graph with edges between all nodes """
         num_vertices = 10
@@ -748,6 +1505,8 @@ class TestDirectedGraph(unittest.TestCase):
 
         self.assertTrue(g_connected.is_weakly_connected)
         self.assertFalse(g_disconnected.is_weakly_connected)
+        self.assertTrue(DirectedGraph().is_weakly_connected)
+        self.assertTrue(DirectedGraph().reversed().as_undirected().is_connected)
         with self.assertRaises(AttributeError):
             g_connected.is_weakly_connected = False
         with self.assertRaises(AttributeError):
@@ -770,6 +1529,62 @@ class TestDirectedGraph(unittest.TestCase):
         with self.assertRaises(AttributeError):
             g_disconnected.is_strongly_connected = True
 
+    def test_directed_graph_strongly_connected_components(self):
+        """ Find the strongly connected components of a directed graph, and
+            the directed acyclic graph of them """
+        g = DirectedGraph.from_dict({'v0': [('v1',)],
+                                     'v1': [('v2',), ('v3',)],
+                                     'v2': [('v0',)],
+                                     'v3': [('v4',)],
+                                     'v4': [('v3',), ('v4',)],
+                                     'v5': [('v4',)],
+                                     'v6': []})
+
+        components = g.strongly_connected_components()
+        self.assertEqual(sorted(sorted(component) for component in components),
+                         [['v0', 'v1', 'v2'], ['v3', 'v4'], ['v5'], ['v6']])
+        positions = dict((v_val, idx)
+                         for idx, component in enumerate(components)
+                         for v_val in component)
+        self.assertTrue(all(positions[e.v_from.val] <= positions[e.v_to.val]
+                            for e in g.edges))
+
+        dag = g.condensation()
+        self.assertEqual(dag.num_vertices, 4)
+        self.assertEqual(dag.num_edges, 2)
+        self.assertEqual([dag.get_vertex(idx).get('members')
+                          for idx in xrange(4)], components)
+        self.assertTrue(dag.has_edge((positions['v0'], positions['v3'])))
+        self.assertTrue(dag.has_edge((positions['v5'], positions['v3'])))
+        self.assertEqual(DirectedGraph().strongly_connected_components(), [])
+
+    def test_directed_graph_strongly_connected_components_random(self):
+        """ Find the strongly connected components of random directed graphs,
+            matching those found from every vertex's reachable set """
+        rng = random.Random(4)
+        for p in [0.01, 0.03, 0.1]:
+            g = DirectedGraph.random_graph(range(60), p, seed=rng)
+            reachable = dict((v.val, set(g.search(v.val))) for v in g)
+            expected = set(frozenset(w_val for w_val in reachable[v.val]
+                                     if v.val in reachable[w_val])
+                           for v in g)
+            components = g.strongly_connected_components()
+            self.assertEqual(set(frozenset(component)
+                                 for component in components), expected)
+            self.assertEqual(sum(len(component) for component in components),
+                             60)
+            self.assertEqual(g.is_strongly_connected, len(expected) == 1)
+
+        # long cycles and chains don't hit the recursion limit
+        g_cycle = DirectedGraph.from_lists(
+            [(i,) for i in xrange(10000)],
+            [((i, (i + 1) % 10000),) for i in xrange(10000)])
+        self.assertTrue(g_cycle.is_strongly_connected)
+        g_cycle.remove_edge((9999, 0))
+        self.assertFalse(g_cycle.is_strongly_connected)
+        self.assertEqual(len(g_cycle.strongly_connected_components()), 10000)
+        self.assertEqual(g_cycle.condensation().num_edges, 9999)
+
     def test_directed_graph_clone(self):
         """ Clone a directed graph """
         vertices = [('v0', {'city': 'Paris'}),
@@ -794,6 +1609,18 @@ class TestDirectedGraph(unittest.TestCase):
         self.assertNotEqual(v0, v0_prime)
         self.assertNotEqual(e01, e01_prime)
         self.assertEqual(v0.attrs, v0_prime.attrs)
+        # cloning doesn't allocate attrs dicts for anything without attrs
+        self.assertIsNone(g.get_vertex('v2')._attrs)
+        self.assertIsNone(g.get_edge(('v1', 'v3'))._attrs)
+        self.assertIsNone(g_prime.get_vertex('v2')._attrs)
+        self.assertIsNone(g_prime.get_edge(('v1', 'v3'))._attrs)
+        g.induced_subgraph(['v1', 'v2', 'v3'])
+        g.largest_component()
+        g.reversed().clone()
+        g.as_undirected().clone()
+        g.subgraph_view(lambda v: v.val != 'v4').clone()
+        self.assertIsNone(g.get_vertex('v2')._attrs)
+        self.assertIsNone(g.get_edge(('v1', 'v3'))._attrs)
 
         g.add_vertex('v5', {'city': 'Jamestown'})
 
@@ -843,6 +1670,48 @@ class TestDirectedGraph(unittest.TestCase):
         self.assertEqual(e00.get('weight'), 5)
         self.assertEqual(e01.get('weight'), 7)
 
+    def test_directed_graph_add_vertices(self):
+        """ Add many vertices to a directed graph at once """
+        g = DirectedGraph()
+        g.add_vertex('v0')
+        v_vals = g.add_vertices([('v1', {'city': 'Modena'}), ('v2',)])
+
+        self.assertEqual(v_vals, ['v1', 'v2'])
+        self.assertEqual(g.num_vertices, 3)
+        self.assertEqual(g.get_vertex('v1').get('city'), 'Modena')
+        with self.assertRaises(ValueError):
+            g.add_vertices([('v3',), 'v4'])
+        with self.assertRaises(TypeError):
+            g.add_vertices([('v3',), ([],)])
+        with self.assertRaises(ValueError):
+            g.add_vertices([('v3',), ('v0',), ('v4',), ('v4',)])
+        self.assertEqual(g.num_vertices, 3)
+        self.assertFalse(g.has_vertex('v3'))
+
+    def test_directed_graph_add_edges(self):
+        """ Add many edges to a directed graph at once """
+        g = DirectedGraph.from_lists([('v0',), ('v1',), ('v2',)], [])
+        g.add_edges([(('v0', 'v0'),), (('v0', 'v1'), {'weight': 3})])
+
+        self.assertEqual(g.num_edges, 2)
+        self.assertTrue(g.has_edge(('v0', 'v0')))
+        self.assertEqual(g.get_edge(('v0', 'v1')).get('weight'), 3)
+        with self.assertRaises(ValueError):
+            g.add_edges([(('v1', 'v2'),), ('v0', 'v2')])
+        with self.assertRaises(ValueError):
+            g.add_edges([(('v1', 'v2'),), (('v0', 'v3'),)])
+        with self.assertRaises(ValueError):
+            g.add_edges([(('v1', 'v2'),), ((('v0', 'v1')),)])
+        with self.assertRaises(ValueError):
+            g.add_edges([(('v1', 'v2'),), (('v2', 'v1'),), (('v1', 'v2'),)])
+        with self.assertRaises(ValueError) as context:
+            g.add_edges([(('v1', 'v2'),), (('v0', 'v1', 'v2'),)])
+        self.assertIn("('v0', 'v1', 'v2')", str(context.exception))
+        with self.assertRaises(ValueError):
+            g.add_edge(('v0', 'v1', 'v2'))
+        self.assertEqual(g.num_edges, 2)
+        self.assertFalse(g.has_edge(('v1', 'v2')))
+
     def test_directed_graph_remove_vertex(self):
         """ Remove vertices from a directed graph """
         g = DirectedGraph()
@@ -870,6 +1739,28 @@ class TestDirectedGraph(unittest.TestCase):
         self.assertFalse(g.has_edge(('v1', 'v1')))
         self.assertFalse(g.has_edge(('v1', 'v2')))
 
+    def test_directed_graph_readd_removed_vertex(self):
+        """ Remove vertices from a directed graph and add new ones in their
+            place """
+        g = DirectedGraph.from_lists([('v0',), ('v1',), ('v2',)],
+                                     [(('v0', 'v1'),), (('v1', 'v2'),)])
+
+        g.remove_vertex('v1')
+        g.add_vertex('v3')
+        g.add_vertex('v1')
+        g.add_edge(('v3', 'v0'))
+        anonymous_val = g.add_vertex()
+
+        self.assertEqual(g.num_vertices, 5)
+        self.assertEqual(g.num_edges, 1)
+        self.assertTrue(g.has_edge(('v3', 'v0')))
+        self.assertFalse(g.has_edge(('v0', 'v3')))
+        self.assertFalse(g.has_edge(('v0', 'v1')))
+        self.assertEqual(g.get_vertex('v1').degree, 0)
+        self.assertEqual(g.get_vertex(anonymous_val).val, anonymous_val)
+        self.assertEqual(set(v.val for v in g),
+                         set(['v0', 'v1', 'v2', 'v3', anonymous_val]))
+
     def test_directed_graph_remove_edge(self):
         """ Remove edges from a directed graph """
         g = DirectedGraph()
@@ -890,6 +1781,10 @@ class TestDirectedGraph(unittest.TestCase):
         self.assertFalse(g.has_edge(('v0', 'v1')))
         self.assertFalse(g.has_edge(('v1', 'v0')))
         self.assertFalse(g.has_edge(('v0', 'v2')))
+        for v_vals in [('v0', 'v1'), ('v0', 'v3')]:
+            with self.assertRaises(KeyError) as context:
+                g.remove_edge(v_vals)
+            self.assertEqual(context.exception.args, (v_vals,))
 
     def test_directed_graph_search(self):
         """ Search for paths from a directed vertex to all vertices reachable
@@ -935,6 +1830,767 @@ class TestDirectedGraph(unittest.TestCase):
                           'v1': ['v0', 'v1'],
                           'v3': ['v0', 'v1', 'v3']})
 
+    def test_directed_graph_iter_bfs_and_iter_dfs(self):
+        """ Lazily traverse a directed graph breadth first and depth first """
+
+        """
+            v0 -> v1 -> v3
+            ^
+            |
+            v2 -> v4
+        """
+        g = DirectedGraph.from_lists([('v0',), ('v1',), ('v2',), ('v3',),
+                                      ('v4',)],
+                                     [(('v0', 'v1'),),
+                                      (('v1', 'v3'),),
+                                      (('v2', 'v0'),),
+                                      (('v2', 'v4'),)])
+
+        self.assertEqual(list(g.iter_bfs('v0')),
+                         [('v0', 0, None), ('v1', 1, 'v0'), ('v3', 2, 'v1')])
+        self.assertEqual(list(g.iter_dfs('v0')),
+                         [('v0', 0, None), ('v1', 1, 'v0'), ('v3', 2, 'v1')])
+        self.assertEqual(set(g.iter_bfs('v2')),
+                         set([('v2', 0, None), ('v0', 1, 'v2'),
+                              ('v4', 1, 'v2'), ('v1', 2, 'v0'),
+                              ('v3', 3, 'v1')]))
+
+        finished = []
+        list(g.iter_dfs('v0', on_finish=finished.append))
+        self.assertEqual(finished, ['v3', 'v1', 'v0'])
+
+        pruned = g.iter_dfs('v2', on_discover=lambda v_val, depth, parent:
+                            v_val != 'v0')
+        self.assertEqual(set(v_val for v_val, _, _ in pruned),
+                         set(['v2', 'v0', 'v4']))
+        for iter_method in [g.iter_bfs, g.iter_dfs]:
+            with self.assertRaises(KeyError):
+                iter_method('v5')
+
+    def test_directed_graph_dijkstra_explores_locally(self):
+        """ Perform Dijkstra's algorithm on a directed graph, only exploring
+            the vertices needed """
+        num_vertices = 1000
+        vertices = [(i,) for i in xrange(num_vertices)]
+        edges = [((i, i + 1), {'weight': 1})
+                 for i in xrange(num_vertices - 1)]
+        g = DirectedGraph.from_lists(vertices + [('island',)], edges)
+        inserted = []
+
+        class RecordingQueue(PriorityQueue):
+            def insert(self, item, priority):
+                inserted.append(item.val)
+                PriorityQueue.insert(self, item, priority)
+
+        self.assertEqual(g.dijkstra(0, goal_val=3,
+                                    priority_queue=RecordingQueue),
+                         [0, 1, 2, 3])
+        self.assertTrue(len(inserted) <= 4)
+        self.assertEqual(g.dijkstra(0, goal_val=3, return_distances=True), 3)
+        self.assertEqual(g.dijkstra(0, goal_val='island',
+                                    return_distances=True), float('inf'))
+        self.assertIsNone(g.dijkstra(0, goal_val='island'))
+        with self.assertRaises(KeyError):
+            g.dijkstra(0, goal_val='nowhere')
+
+        distances = g.dijkstra(0, return_distances=True)
+        self.assertEqual(len(distances), num_vertices + 1)
+        self.assertEqual(distances[num_vertices - 1], num_vertices - 1)
+        self.assertEqual(distances['island'], float('inf'))
+        g.add_vertex('late')
+        g.remove_vertex('island')
+        self.assertEqual(len(distances), num_vertices + 1)
+        self.assertEqual(distances['island'], float('inf'))
+        with self.assertRaises(KeyError):
+            distances['late']
+        g.remove_vertex('late')
+        g.add_vertex('island')
+        paths = g.dijkstra(0)
+        self.assertEqual(paths[5], [0, 1, 2, 3, 4, 5])
+        self.assertIsNone(paths['island'])
+        with self.assertRaises(KeyError):
+            paths['nowhere']
+
+    def test_directed_graph_dijkstra_with_other_queues(self):
+        """ Perform Dijkstra's algorithm on a directed graph with each
+            alternative priority queue, and with Dial's algorithm """
+        rng = random.Random(0)
+        vertices = [(i,) for i in xrange(200)]
+        edge_keys = set(tuple(sorted([rng.randrange(200),
+                                      rng.randrange(200)]))
+                        for _ in xrange(800))
+        edges = [(edge_key, {'weight': rng.randint(0, 20)})
+                 for edge_key in edge_keys]
+        g = DirectedGraph.from_lists(vertices, edges)
+        distances = g.dijkstra(0, return_distances=True)
+
+        for queue_cls in [HeapqPriorityQueue, PairingPriorityQueue,
+                          RadixPriorityQueue]:
+            self.assertEqual(g.dijkstra(0, return_distances=True,
+                                        priority_queue=queue_cls), distances)
+            path = g.dijkstra(0, goal_val=199, priority_queue=queue_cls)
+            self.assertEqual(sum(g.get_edge(edge_key).get('weight')
+                                 for edge_key in zip(path, path[1:])),
+                             distances[199])
+
+        self.assertEqual(g.dijkstra(0, return_distances=True, method='dial'),
+                         distances)
+        self.assertEqual(g.dijkstra(0, return_distances=True, method='dial',
+                                    max_weight=20), distances)
+        self.assertEqual(g.dijkstra(0, goal_val=199, return_distances=True,
+                                    method='dial'), distances[199])
+        with self.assertRaises(ValueError):
+            g.dijkstra(0, method='dial', max_weight=5)
+        with self.assertRaises(ValueError):
+            g.dijkstra(0, method='dial',
+                       priority_queue=HeapqPriorityQueue)
+
+        g.get_edge(edges[0][0]).set('weight', 1.5)
+        with self.assertRaises(ValueError):
+            g.dijkstra(0, method='dial')
+
+    def test_directed_graph_shortest_path(self):
+        """ Find shortest paths on a directed graph with bidirectional
+            Dijkstra """
+        rng = random.Random(1)
+        vertices = [(i,) for i in xrange(100)] + [('island',)]
+        edge_keys = set((rng.randrange(100), rng.randrange(100))
+                        for _ in xrange(300))
+        g = DirectedGraph.from_lists(vertices, [(edge_key,
+                                         {'weight': rng.randint(0, 20)})
+                                        for edge_key in edge_keys
+                                        if edge_key[::-1] not in edge_keys
+                                        or edge_key[0] <= edge_key[1]])
+
+        for _ in xrange(50):
+            start_val, goal_val = rng.randrange(100), rng.randrange(100)
+            distance = g.dijkstra(start_val, goal_val=goal_val,
+                                  return_distances=True)
+            path = g.shortest_path(start_val, goal_val)
+            self.assertEqual(g.shortest_path(start_val, goal_val,
+                                             return_distances=True), distance)
+            if distance == float('inf'):
+                self.assertIsNone(path)
+                continue
+            self.assertEqual((path[0], path[-1]), (start_val, goal_val))
+            self.assertEqual(sum(g.get_edge(edge_key).get('weight')
+                                 for edge_key in zip(path, path[1:])),
+                             distance)
+        self.assertEqual(g.shortest_path(0, 0), [0])
+        self.assertIsNone(g.shortest_path(0, 'island'))
+        self.assertEqual(g.shortest_path(0, 'island', return_distances=True),
+                         float('inf'))
+        with self.assertRaises(KeyError):
+            g.shortest_path(0, 'nowhere')
+        with self.assertRaises(KeyError):
+            g.shortest_path('nowhere', 0)
+
+        g.add_edge((0, 'island'))
+        with self.assertRaises(ValueError):
+            g.shortest_path(0, 1)
+
+    def test_directed_graph_shortest_path_explores_less(self):
+        """ Settle fewer vertices finding a shortest path on a directed
+            graph with bidirectional Dijkstra than with Dijkstra """
+        g = grid_graph(41, 41, directed=True, weight_range=(1, 1))
+        popped = []
+
+        class RecordingQueue(PriorityQueue):
+            def pop_min(self):
+                entry = PriorityQueue.pop_min(self)
+                popped.append(entry)
+                return entry
+
+        self.assertEqual(g.dijkstra((20, 10), goal_val=(20, 30),
+                                    return_distances=True,
+                                    priority_queue=RecordingQueue), 20)
+        num_popped_by_dijkstra = len(popped)
+        del popped[:]
+        path = g.shortest_path((20, 10), (20, 30),
+                               priority_queue=RecordingQueue)
+
+        self.assertEqual(len(path), 21)
+        self.assertTrue(len(popped) < 0.6 * num_popped_by_dijkstra)
+
+    def test_directed_graph_astar(self):
+        """ Find shortest paths on a directed graph with A* """
+        g = grid_graph(41, 41, directed=True, weight_range=(1, 3), seed=0)
+        for v in g:
+            v.set('x', v.val[1])
+            v.set('y', v.val[0])
+        g.add_vertex('island', attrs={'x': 100, 'y': 100})
+        popped = []
+
+        class RecordingQueue(PriorityQueue):
+            def pop_min(self):
+                entry = PriorityQueue.pop_min(self)
+                popped.append(entry)
+                return entry
+
+        for start_val, goal_val in [((20, 10), (20, 30)), ((0, 0), (40, 40)),
+                                    ((5, 35), (30, 2)), ((7, 7), (7, 7))]:
+            distance = g.dijkstra(start_val, goal_val=goal_val,
+                                  return_distances=True)
+            path = g.astar(start_val, goal_val, euclidean())
+            self.assertEqual(g.astar(start_val, goal_val, euclidean(),
+                                     return_distances=True), distance)
+            self.assertEqual((path[0], path[-1]), (start_val, goal_val))
+            self.assertEqual(sum(g.get_edge(edge_key).get('weight')
+                                 for edge_key in zip(path, path[1:])),
+                             distance)
+
+        g.dijkstra((20, 10), goal_val=(20, 30), priority_queue=RecordingQueue)
+        num_popped_by_dijkstra = len(popped)
+        del popped[:]
+        g.astar((20, 10), (20, 30), euclidean(), priority_queue=RecordingQueue)
+        self.assertTrue(len(popped) < 0.5 * num_popped_by_dijkstra)
+
+        # a heuristic that knows nothing is just Dijkstra's algorithm
+        self.assertEqual(g.astar((0, 0), (40, 40), lambda v, goal: 0,
+                                 return_distances=True),
+                         g.dijkstra((0, 0), goal_val=(40, 40),
+                                    return_distances=True))
+        self.assertIsNone(g.astar((0, 0), 'island', euclidean()))
+        self.assertEqual(g.astar((0, 0), 'island', euclidean(),
+                                 return_distances=True), float('inf'))
+        with self.assertRaises(KeyError):
+            g.astar((0, 0), 'nowhere', euclidean())
+
+    def test_directed_graph_dijkstra_cutoffs(self):
+        """ Perform Dijkstra's algorithm on a directed graph, stopping at a
+            maximum distance, a maximum number of results, or a set of
+            goals """
+        num_vertices = 1000
+        vertices = [(i,) for i in xrange(num_vertices)]
+        edges = [((i, i + 1), {'weight': 1})
+                 for i in xrange(num_vertices - 1)]
+        edges.append(((0, 'far'), {'weight': 100}))
+        g = DirectedGraph.from_lists(vertices + [('far',)], edges)
+        inserted = []
+
+        class RecordingQueue(PriorityQueue):
+            def insert(self, item, priority):
+                inserted.append(item.val)
+                PriorityQueue.insert(self, item, priority)
+
+        distances = g.dijkstra(0, return_distances=True, max_distance=5,
+                               priority_queue=RecordingQueue)
+        self.assertEqual(distances, dict((i, i) for i in xrange(6)))
+        self.assertTrue(len(inserted) <= 6)
+        self.assertEqual(g.dijkstra(0, return_distances=True, max_distance=4.5),
+                         dict((i, i) for i in xrange(5)))
+        paths = g.dijkstra(0, max_distance=5)
+        self.assertEqual(set(paths), set(xrange(6)))
+        self.assertEqual(paths[3], [0, 1, 2, 3])
+        with self.assertRaises(KeyError):
+            paths[6]
+        self.assertEqual(g.dijkstra(0, return_distances=True, max_results=3),
+                         {0: 0, 1: 1, 2: 2})
+        self.assertEqual(g.dijkstra(0, return_distances=True,
+                                    max_results=2 * num_vertices),
+                         g.dijkstra(0, return_distances=True))
+        self.assertEqual(g.dijkstra(0, return_distances=True,
+                                    goal_vals=[4, 2]),
+                         dict((i, i) for i in xrange(5)))
+        self.assertEqual(g.dijkstra(0, goal_vals=[4, 2])[4], [0, 1, 2, 3, 4])
+        self.assertEqual(g.dijkstra(0, goal_val=3, max_distance=5),
+                         [0, 1, 2, 3])
+        self.assertIsNone(g.dijkstra(0, goal_val=10, max_distance=5))
+        self.assertEqual(g.dijkstra(0, goal_val='far', return_distances=True,
+                                    max_distance=99), float('inf'))
+        self.assertEqual(g.dijkstra(0, goal_val='far', return_distances=True,
+                                    max_distance=100), 100)
+        self.assertEqual(g.dijkstra(0, return_distances=True, max_distance=5,
+                                    method='dial'),
+                         dict((i, i) for i in xrange(6)))
+
+        with self.assertRaises(KeyError):
+            g.dijkstra(0, goal_vals=[4, 'nowhere'])
+        with self.assertRaises(ValueError):
+            g.dijkstra(0, max_results=0)
+
+    def test_directed_graph_multi_source_dijkstra_and_search(self):
+        """ Perform Dijkstra's algorithm and search on a directed graph from
+            many starts at once """
+        rng = random.Random(2)
+        edge_keys = set(tuple(sorted([rng.randrange(200),
+                                      rng.randrange(200)]))
+                        for _ in xrange(600))
+        g = DirectedGraph.from_lists([(i,) for i in xrange(200)],
+                             [(edge_key, {'weight': rng.randint(0, 20)})
+                              for edge_key in edge_keys])
+        start_vals = rng.sample(xrange(200), 5)
+        distances_by_start = dict(
+            (start_val, g.dijkstra(start_val, return_distances=True))
+            for start_val in start_vals)
+        paths_by_start = dict((start_val, g.search(start_val))
+                              for start_val in start_vals)
+
+        distances, sources = g.dijkstra(start_vals=start_vals,
+                                        return_distances=True)
+        for v in g:
+            distance = min(distances_by_start[start_val][v.val]
+                           for start_val in start_vals)
+            self.assertEqual(distances[v.val], distance)
+            if distance == float('inf'):
+                self.assertFalse(v.val in sources)
+            else:
+                self.assertEqual(
+                    distances_by_start[sources[v.val]][v.val], distance)
+        paths, sources = g.dijkstra(start_vals=start_vals)
+        self.assertTrue(all(paths[v_val][0] == source
+                            for v_val, source in sources.iteritems()))
+        goal_val = max(sources)
+        path, _ = g.dijkstra(start_vals=start_vals, goal_val=goal_val)
+        self.assertEqual(path[-1], goal_val)
+        self.assertEqual(g.dijkstra(start_vals=start_vals, goal_val=goal_val,
+                                    return_distances=True)[0],
+                         distances[goal_val])
+        nearest, sources = g.dijkstra(start_vals=start_vals,
+                                      return_distances=True, max_distance=3)
+        self.assertEqual(set(nearest), set(sources))
+        self.assertTrue(all(distance <= 3 for distance in nearest.values()))
+
+        paths, sources = g.search(start_vals=start_vals)
+        for v_val, source in sources.iteritems():
+            self.assertEqual(paths[v_val][0], source)
+            self.assertEqual(len(paths[v_val]),
+                             min(len(paths_by_start[start_val][v_val])
+                                 for start_val in start_vals
+                                 if v_val in paths_by_start[start_val]))
+        self.assertEqual(set(paths),
+                         set(v_val for start_val in start_vals
+                             for v_val in paths_by_start[start_val]))
+        self.assertEqual(g.search(start_vals=[], goal_val=0), (None, {}))
+
+        with self.assertRaises(ValueError):
+            g.dijkstra(0, start_vals=start_vals)
+        with self.assertRaises(ValueError):
+            g.search()
+        with self.assertRaises(KeyError):
+            g.dijkstra(start_vals=[0, 'nowhere'])
+
+    def test_directed_graph_tracks_connectivity(self):
+        """ Keep track of the weakly connected components of a directed graph
+            as vertices and edges are added and removed """
+        rng = random.Random(3)
+        g = DirectedGraph.from_lists([(i,) for i in xrange(30)], [])
+        g_tracked = g.clone()
+        g_tracked.track_connectivity()
+
+        for _ in xrange(300):
+            v0_val, v1_val = rng.randrange(40), rng.randrange(40)
+            if rng.random() < 0.1:
+                if g.has_vertex(v0_val):
+                    g.remove_vertex(v0_val)
+                    g_tracked.remove_vertex(v0_val)
+                else:
+                    g.add_vertex(v0_val)
+                    g_tracked.add_vertex(v0_val)
+            elif not (g.has_vertex(v0_val) and g.has_vertex(v1_val)):
+                continue
+            elif g.has_edge((v0_val, v1_val)):
+                if rng.random() < 0.3:
+                    g.remove_edge((v0_val, v1_val))
+                    g_tracked.remove_edge((v0_val, v1_val))
+            elif rng.random() < 0.5:
+                g.add_edge((v0_val, v1_val))
+                g_tracked.add_edge((v0_val, v1_val))
+            else:
+                g.add_edges([((v0_val, v1_val),)])
+                g_tracked.add_edges([((v0_val, v1_val),)])
+
+            if g.num_vertices:
+                self.assertEqual(g_tracked.is_weakly_connected,
+                                 g.is_weakly_connected)
+            v_vals = [v.val for v in g]
+            for _ in xrange(3):
+                v0_val, v1_val = rng.choice(v_vals), rng.choice(v_vals)
+                self.assertEqual(
+                    g_tracked.are_weakly_connected(v0_val, v1_val),
+                    g.are_weakly_connected(v0_val, v1_val))
+
+        g_full = DirectedGraph.complete_graph(range(10))
+        g_full.track_connectivity()
+        self.assertTrue(g_full.is_weakly_connected)
+        self.assertTrue(g_full.clone().is_weakly_connected)
+        g_full.add_vertex('island')
+        self.assertFalse(g_full.is_weakly_connected)
+        self.assertFalse(g_full.are_weakly_connected(0, 'island'))
+        g_full.track_connectivity(False)
+        self.assertFalse(g_full.are_weakly_connected(0, 'island'))
+        with self.assertRaises(KeyError):
+            g_full.are_weakly_connected(0, 'nowhere')
+
+    def test_directed_graph_weakly_connected_components(self):
+        """ Label the weakly connected components of a directed graph, and get
+            the largest one as a new graph """
+        vertices = [('v0', {'city': 'Paris'}), ('v1',), ('v2',), ('v3',),
+                    ('v4',), ('v5',), ('v6',)]
+        edges = [(('v0', 'v1'), {'weight': 1}),
+                 (('v2', 'v1'), {'weight': 2}),
+                 (('v3', 'v4'),),
+                 (('v5', 'v5'),)]
+        g = DirectedGraph.from_lists(vertices, edges)
+        g_tracked = g.clone()
+        g_tracked.track_connectivity()
+
+        for graph in [g, g_tracked]:
+            labels, sizes = graph.weakly_connected_components()
+            self.assertEqual(len(labels), 7)
+            self.assertEqual(len(sizes), 4)
+            self.assertEqual(labels['v0'], labels['v1'])
+            self.assertEqual(labels['v0'], labels['v2'])
+            self.assertEqual(labels['v3'], labels['v4'])
+            self.assertEqual(len(set(labels[v_val]
+                                     for v_val in ['v0', 'v3', 'v5', 'v6'])),
+                             4)
+            self.assertEqual(sorted(sizes), [1, 1, 2, 3])
+            self.assertEqual(sizes[labels['v0']], 3)
+            self.assertEqual(sorted(labels.values()), sorted(
+                label for label, size in enumerate(sizes)
+                for _ in xrange(size)))
+
+            largest = graph.largest_component()
+            self.assertEqual(set(v.val for v in largest),
+                             set(['v0', 'v1', 'v2']))
+            self.assertEqual(largest.num_edges, 2)
+            self.assertEqual(largest.get_edge(('v2', 'v1')).get('weight'), 2)
+            self.assertEqual(largest.get_vertex('v0').get('city'), 'Paris')
+            self.assertIsNot(largest.get_vertex('v0').attrs,
+                             graph.get_vertex('v0').attrs)
+            self.assertTrue(largest.is_weakly_connected)
+
+        g.remove_edge(('v2', 'v1'))
+        g_tracked.remove_edge(('v2', 'v1'))
+        labels, sizes = g.weakly_connected_components()
+        self.assertEqual(sorted(sizes), [1, 1, 1, 2, 2])
+        self.assertEqual(g_tracked.weakly_connected_components(),
+                         (labels, sizes))
+        self.assertEqual(set(v.val for v in g.largest_component()),
+                         set(['v0', 'v1']))
+        self.assertEqual(DirectedGraph().weakly_connected_components(),
+                         ({}, []))
+        self.assertEqual(DirectedGraph().largest_component().num_vertices, 0)
+
+    def test_directed_graph_reversed(self):
+        """ View a directed graph with its edges reversed, without copying
+            it """
+        g = DirectedGraph.from_lists([('A',), ('B',), ('C',), ('D',)],
+                                     [(('A', 'B'), {'weight': 1}),
+                                      (('B', 'C'), {'weight': 2}),
+                                      (('C', 'A'), {'weight': 7}),
+                                      (('A', 'C'), {'weight': 3}),
+                                      (('D', 'D'), {'weight': 1})])
+        r = g.reversed()
+
+        self.assertIsInstance(r, DirectedGraph)
+        self.assertEqual(len(r), 4)
+        self.assertEqual(r.num_edges, 5)
+        self.assertTrue(r.has_edge(('B', 'A')))
+        self.assertFalse(r.has_edge(('A', 'B')))
+        self.assertEqual(r.get_edge(('B', 'A')).get('weight'), 1)
+        self.assertIsNone(r.get_edge(('A', 'B')))
+        self.assertIsNone(r.get_vertex('E'))
+        self.assertEqual(set(v.val for v in r.get_vertex('A').outs),
+                         set(['C']))
+        self.assertEqual(set(v.val for v in r.get_vertex('A').ins),
+                         set(['B', 'C']))
+        self.assertEqual(r.search('C', goal_val='B'), ['C', 'B'])
+        self.assertEqual(r.dijkstra('C', return_distances=True),
+                         {'A': 3, 'B': 2, 'C': 0, 'D': float('inf')})
+        self.assertEqual(r.dijkstra('C', goal_val='B'), ['C', 'B'])
+        self.assertEqual(r.shortest_path('B', 'A'), ['B', 'A'])
+        self.assertEqual(sorted(map(sorted, r.strongly_connected_components())),
+                         [['A', 'B', 'C'], ['D']])
+        self.assertIs(r.reversed(), g)
+
+        r_copy = r.clone()
+        self.assertEqual(type(r_copy), DirectedGraph)
+        self.assertEqual(set((e.v_from.val, e.v_to.val) for e in r_copy.edges),
+                         set([('B', 'A'), ('C', 'B'), ('A', 'C'), ('C', 'A'),
+                              ('D', 'D')]))
+        self.assertEqual(r_copy.get_edge(('C', 'B')).get('weight'), 2)
+
+        g.add_edge(('D', 'A'), attrs={'weight': 1})
+        self.assertEqual(r.dijkstra('A', goal_val='D'), ['A', 'D'])
+        with self.assertRaises(TypeError):
+            r.add_vertex('E')
+        with self.assertRaises(TypeError):
+            r.remove_edge(('B', 'A'))
+        self.assertEqual(g.num_edges, 6)
+
+    def test_directed_graph_as_undirected(self):
+        """ View a directed graph as undirected, without copying it """
+        g = DirectedGraph.from_lists([('A',), ('B',), ('C',), ('D',)],
+                                     [(('A', 'B'), {'weight': 1}),
+                                      (('B', 'C'), {'weight': 2}),
+                                      (('C', 'A'), {'weight': 7}),
+                                      (('A', 'C'), {'weight': 3}),
+                                      (('D', 'D'), {'weight': 1})])
+        u = g.as_undirected()
+
+        self.assertIsInstance(u, UndirectedGraph)
+        self.assertEqual(len(u), 4)
+        self.assertEqual(u.num_edges, 4)
+        self.assertTrue(u.has_edge(('B', 'A')))
+        self.assertTrue(u.has_edge(('C', 'A')))
+        self.assertFalse(u.has_edge(('D', 'A')))
+        self.assertEqual(u.get_edge(('C', 'A')).get('weight'), 3)
+        self.assertEqual(set(v.val for v in u.get_vertex('A').neighbors),
+                         set(['B', 'C']))
+        self.assertEqual(u.get_vertex('A').degree, 2)
+        self.assertEqual(u.get_vertex('D').degree, 2)
+        self.assertEqual(u.search('C', goal_val='B'), ['C', 'B'])
+        self.assertEqual(u.dijkstra('C', return_distances=True),
+                         {'A': 3, 'B': 2, 'C': 0, 'D': float('inf')})
+        self.assertFalse(u.is_connected)
+        self.assertFalse(u.are_connected('A', 'D'))
+        self.assertEqual(u.connected_components(),
+                         g.weakly_connected_components())
+
+        u_copy = u.clone()
+        self.assertEqual(type(u_copy), UndirectedGraph)
+        self.assertEqual(u_copy.num_edges, 4)
+        self.assertEqual(u_copy.get_edge(('A', 'C')).get('weight'), 3)
+        self.assertEqual(g.reversed().as_undirected().dijkstra(
+            'C', return_distances=True), u.dijkstra('C',
+                                                    return_distances=True))
+
+        g.add_edge(('D', 'A'), attrs={'weight': 1})
+        self.assertTrue(u.are_connected('A', 'D'))
+        with self.assertRaises(TypeError):
+            u.add_edge(('B', 'D'))
+
+    def test_directed_graph_as_undirected_ties(self):
+        """ View a directed graph with edges both ways of equal or missing
+            weights as undirected, choosing the same edge every time """
+        g = DirectedGraph.from_lists([('a',), ('b',), ('c',), ('d',)],
+                                     [(('a', 'b'), {'weight': 2, 'id': 0}),
+                                      (('b', 'a'), {'weight': 2, 'id': 1}),
+                                      (('b', 'c'), {'id': 2}),
+                                      (('c', 'b'), {'id': 3}),
+                                      (('c', 'd'), {'id': 4}),
+                                      (('d', 'c'), {'weight': 5, 'id': 5})])
+
+        # ties go to the edge from the lesser val, as the view sees it
+        for u, ids in [(g.as_undirected(), [0, 2, 5]),
+                       (g.reversed().as_undirected(), [1, 3, 5]),
+                       (g.reversed().reversed().as_undirected(), [0, 2, 5])]:
+            for _ in xrange(20):
+                self.assertEqual(u.num_edges, 3)
+                self.assertEqual(sorted(e.get('id') for e in u.edges), ids)
+                self.assertEqual(u.get_edge(('b', 'a')).get('id'), ids[0])
+                self.assertEqual(u.get_edge(('c', 'd')).get('weight'), 5)
+                self.assertEqual(set((v.val, e.get('id')) for v, e in
+                                     u.get_vertex('b').neighbors_with_edges),
+                                 set([('a', ids[0]), ('c', ids[1])]))
+                self.assertEqual(u.clone().num_edges, 3)
+
+        # only edges the view chooses need valid weights, so the unweighted
+        # c -> d losing to d -> c doesn't stop dijkstra on the view
+        g.remove_edge(('b', 'c'))
+        g.remove_edge(('c', 'b'))
+        with self.assertRaises(ValueError):
+            g.dijkstra('c')
+        u = g.as_undirected()
+        self.assertEqual(u.dijkstra('c', return_distances=True),
+                         {'a': float('inf'), 'b': float('inf'), 'c': 0,
+                          'd': 5})
+        self.assertEqual(u.shortest_path('c', 'd'), ['c', 'd'])
+        g.get_edge(('d', 'c')).del_attr('weight')
+        with self.assertRaises(ValueError):
+            u.dijkstra('c')
+
+    def test_directed_graph_subgraph_view(self):
+        """ View the vertices and edges of a directed graph that pass some
+            filters, without copying them """
+        g = DirectedGraph.from_lists([('A', {'region': 0}),
+                                      ('B', {'region': 0}),
+                                      ('C', {'region': 0}),
+                                      ('D', {'region': 1})],
+                                     [(('A', 'B'), {'weight': 1}),
+                                      (('B', 'C'), {'weight': 1}),
+                                      (('C', 'A'), {'weight': 1}),
+                                      (('A', 'C'), {'weight': 5,
+                                                    'toll': True}),
+                                      (('C', 'D'), {'weight': 1}),
+                                      (('D', 'D'), {'weight': -1})])
+        sv = g.subgraph_view(vertex_filter=lambda v: v.get('region') == 0,
+                             edge_filter=lambda e: not e.get('toll'))
+
+        self.assertIsInstance(sv, DirectedGraph)
+        self.assertEqual(len(sv), 3)
+        self.assertEqual(sv.num_edges, 3)
+        self.assertTrue(sv.has_edge(('A', 'B')))
+        self.assertFalse(sv.has_edge(('A', 'C')))
+        self.assertFalse(sv.has_vertex('D'))
+        self.assertIsNone(sv.get_edge(('C', 'D')))
+        self.assertEqual(set(v.val for v in sv.get_vertex('C').outs),
+                         set(['A']))
+        self.assertEqual(set(v.val for v in sv.get_vertex('C').ins),
+                         set(['B']))
+        self.assertEqual(sv.get_vertex('A').out_degree, 1)
+        self.assertEqual(sv.search('A', goal_val='C'), ['A', 'B', 'C'])
+        self.assertEqual(sv.dijkstra('A', return_distances=True),
+                         {'A': 0, 'B': 1, 'C': 2})
+        self.assertTrue(sv.is_strongly_connected)
+        self.assertTrue(sv.is_weakly_connected)
+        self.assertTrue(sv.are_weakly_connected('C', 'B'))
+        with self.assertRaises(KeyError):
+            sv.are_weakly_connected('A', 'D')
+        self.assertEqual(sv.reversed().search('A', goal_val='C'),
+                         ['A', 'C'])
+        self.assertEqual(sv.as_undirected().num_edges, 3)
+        with self.assertRaises(TypeError):
+            sv.remove_vertex('A')
+
+        sv_copy = sv.clone()
+        self.assertEqual(type(sv_copy), DirectedGraph)
+        self.assertEqual(sv_copy.num_edges, 3)
+        self.assertEqual(g.reversed().subgraph_view(
+            edge_filter=lambda e: e.v_from.val == 'C').num_edges, 2)
+
+        g.get_vertex('D').set('region', 0)
+        with self.assertRaises(ValueError):
+            sv.dijkstra('A')
+        g.get_edge(('D', 'D')).set('weight', 1)
+        self.assertEqual(sv.dijkstra('A', goal_val='D'),
+                         ['A', 'B', 'C', 'D'])
+
+    def test_directed_graph_composed_views(self):
+        """ View subgraphs of a directed graph as undirected or reversed, and
+            the other way around, with edges both ways of equal weights """
+        g = DirectedGraph.from_lists([('a',), ('b',), ('c',), ('d',)],
+                                     [(('a', 'b'), {'weight': 1}),
+                                      (('b', 'a'), {'weight': 1}),
+                                      (('b', 'c'), {'weight': 1}),
+                                      (('c', 'b'), {'weight': 1}),
+                                      (('c', 'd'), {'weight': 1}),
+                                      (('d', 'a'), {'weight': 1})])
+        keep_vertex = lambda v: v.val != 'd'
+
+        views = [g.subgraph_view(keep_vertex).as_undirected(),
+                 g.reversed().subgraph_view(keep_vertex).as_undirected(),
+                 g.as_undirected().subgraph_view(keep_vertex)]
+        for u in views:
+            for _ in xrange(20):
+                self.assertEqual(u.num_edges, 2)
+                self.assertEqual(u.clone().num_edges, 2)
+                self.assertEqual(u.dijkstra('a', return_distances=True),
+                                 {'a': 0, 'b': 1, 'c': 2})
+                self.assertEqual(u.get_vertex('b').degree, 2)
+
+        r = g.subgraph_view(keep_vertex).reversed()
+        self.assertEqual(r.num_edges, 4)
+        self.assertEqual(r.search('c', goal_val='a'), ['c', 'b', 'a'])
+        self.assertEqual(r.clone().num_edges, 4)
+
+    def test_directed_graph_induced_subgraph(self):
+        """ Create a new directed graph of some vertices and the edges between
+            them """
+        g = DirectedGraph.from_lists([('A', {'city': 'Paris'}), ('B',),
+                                      ('C',), ('D',)],
+                                     [(('A', 'A'), {'weight': 1}),
+                                      (('A', 'B'), {'weight': 2}),
+                                      (('B', 'A'), {'weight': 3}),
+                                      (('B', 'C'),),
+                                      (('C', 'D'),)])
+        h = g.induced_subgraph(['A', 'B', 'C'])
+
+        self.assertEqual(set(v.val for v in h), set(['A', 'B', 'C']))
+        self.assertEqual(h.num_edges, 4)
+        self.assertEqual(h.get_edge(('B', 'A')).get('weight'), 3)
+        self.assertTrue(h.has_edge(('A', 'A')))
+        self.assertFalse(h.has_edge(('C', 'B')))
+        self.assertEqual(h.get_vertex('A').get('city'), 'Paris')
+        self.assertIsNot(h.get_vertex('A').attrs, g.get_vertex('A').attrs)
+        h_reversed = g.reversed().induced_subgraph(['B', 'C'])
+        self.assertEqual([(e.v_from.val, e.v_to.val) for e in h_reversed.edges],
+                         [('C', 'B')])
+        with self.assertRaises(KeyError):
+            g.induced_subgraph(['E'])
+
+    def test_directed_graph_tracks_invalid_weights(self):
+        """ Keep track of which edges of a directed graph have invalid weights
+            as edges are added, removed, and reweighted """
+        g = DirectedGraph.from_lists([('A',), ('B',), ('C',)],
+                                     [(('A', 'B'), {'weight': 1}),
+                                      (('B', 'C'), {'weight': 2})])
+
+        self.assertEqual(g.dijkstra('A', goal_val='C'), ['A', 'B', 'C'])
+
+        g.get_edge(('A', 'B')).set('weight', -1)
+        with self.assertRaises(ValueError):
+            g.dijkstra('A')
+
+        g.get_edge(('A', 'B')).set('weight', 3)
+        self.assertEqual(g.dijkstra('A', goal_val='C', return_distances=True),
+                         5)
+
+        g.get_edge(('B', 'C')).del_attr('weight')
+        with self.assertRaises(ValueError):
+            g.dijkstra('A')
+
+        g.remove_edge(('B', 'C'))
+        self.assertIsNone(g.dijkstra('A', goal_val='C'))
+
+        g.add_edge(('A', 'C'))
+        with self.assertRaises(ValueError):
+            g.dijkstra('A')
+
+        g.get_edge(('A', 'C')).set('weight', 1)
+        self.assertEqual(g.dijkstra('A', goal_val='C'), ['A', 'C'])
+
+        g.add_edges([(('C', 'B'), {'weight': None})])
+        removed_edge = g.get_edge(('C', 'B'))
+        with self.assertRaises(ValueError):
+            g.dijkstra('A')
+
+        g.remove_vertex('B')
+        removed_edge.set('weight', -5)
+        self.assertEqual(g.dijkstra('A', goal_val='C'), ['A', 'C'])
+
+        # weights written straight into attrs are checked as they're relaxed
+        g.get_edge(('A', 'C')).attrs['weight'] = -1
+        with self.assertRaises(ValueError) as context:
+            g.dijkstra('A')
+        self.assertIn("V(C)", str(context.exception))
+        with self.assertRaises(ValueError):
+            g.dijkstra('A', method='dial', max_weight=1)
+        with self.assertRaises(ValueError):
+            g.shortest_path('A', 'C')
+        with self.assertRaises(ValueError):
+            g.astar('A', 'C', lambda v, goal: 0)
+
+        # weights fixed without set are found valid once checked again
+        attrs = {'weight': None}
+        g = DirectedGraph.from_lists([('A',), ('B',), ('C',)],
+                                     [(('A', 'B'), attrs), (('B', 'C'),)])
+        attrs['weight'] = 2
+        g.get_edge(('B', 'C')).attrs['weight'] = 5
+        self.assertEqual(g.dijkstra('A', goal_val='C', return_distances=True),
+                         7)
+        self.assertEqual(g.shortest_path('A', 'C'), ['A', 'B', 'C'])
+        g.get_edge(('B', 'C')).attrs['weight'] = None
+        with self.assertRaises(ValueError) as context:
+            g.dijkstra('A')
+        self.assertIn("must have a weight", str(context.exception))
+
+    def test_directed_graph_search_long_chain(self):
+        """ Search a long chain of directed vertices """
+        num_vertices = 20000
+        vertices = [(i,) for i in xrange(num_vertices)]
+        edges = [((i, i + 1),) for i in xrange(num_vertices - 1)]
+        g = DirectedGraph.from_lists(vertices, edges)
+
+        for method in ['breadth_first', 'depth_first']:
+            paths = g.search(0, method=method)
+            self.assertEqual(len(paths), num_vertices)
+            self.assertEqual(paths[num_vertices - 1], range(num_vertices))
+            self.assertEqual(g.search(0, goal_val=num_vertices - 1,
+                                      method=method), range(num_vertices))
+
     def test_directed_graph_dijkstra(self):
         """ Perform Dijkstra's algorithm on a directed graph """
 
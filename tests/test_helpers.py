@@ -5,6 +5,8 @@ Tests for helpers.py
 
 from graphpy.helpers import *
 
+import functools
+import random
 import unittest
 
 
@@ -38,6 +40,95 @@ class TestMiscellaneous(unittest.TestCase):
         self.assertEqual(default_square[2], 4)
         self.assertEqual(default_square[5], 7)
 
+    def test_lazy_paths(self):
+        """ Make a mapping of vals to paths from a map of predecessors """
+        paths = LazyPaths({'v0': None, 'v1': 'v0', 'v2': 'v0', 'v3': 'v1'})
+
+        self.assertEqual(paths['v0'], ['v0'])
+        self.assertEqual(paths['v3'], ['v0', 'v1', 'v3'])
+        self.assertEqual(len(paths), 4)
+        self.assertIn('v2', paths)
+        self.assertNotIn('v4', paths)
+        self.assertIsNone(paths.get('v4'))
+        self.assertEqual(paths, {'v0': ['v0'],
+                                 'v1': ['v0', 'v1'],
+                                 'v2': ['v0', 'v2'],
+                                 'v3': ['v0', 'v1', 'v3']})
+        with self.assertRaises(KeyError):
+            paths['v4']
+
+    def test_lazy_distances(self):
+        """ Make a mapping of vals to distances which defaults to infinity """
+        distances = LazyDistances({'v0': 0, 'v1': 2.5}, set(['v0', 'v1', 'v2']))
+
+        self.assertEqual(distances['v1'], 2.5)
+        self.assertEqual(distances['v2'], float('inf'))
+        self.assertEqual(len(distances), 3)
+        self.assertIn('v2', distances)
+        self.assertNotIn('v3', distances)
+        self.assertEqual(distances, {'v0': 0, 'v1': 2.5, 'v2': float('inf')})
+        with self.assertRaises(KeyError):
+            distances['v3']
+
+    def test_make_rng(self):
+        """ Make a source of randomness from a seed """
+        rng = random.Random(3)
+
+        self.assertIs(make_rng(), random)
+        self.assertIs(make_rng(rng), rng)
+        self.assertEqual(make_rng(3).random(), random.Random(3).random())
+
+    def test_bernoulli_indices(self):
+        """ Choose each of a range of indices independently with some
+            probability """
+        indices = list(bernoulli_indices(10000, 0.2, random.Random(0)))
+
+        self.assertEqual(indices, sorted(set(indices)))
+        self.assertTrue(0 <= indices[0] and indices[-1] < 10000)
+        self.assertTrue(1800 < len(indices) < 2200)
+        self.assertEqual(list(bernoulli_indices(10, 0.0)), [])
+        self.assertEqual(list(bernoulli_indices(10, 1.0)), range(10))
+
+
+################################################################################
+#                                                                              #
+#                                  Union-Find                                  #
+#                                                                              #
+################################################################################
+
+
+class TestUnionFind(unittest.TestCase):
+
+    def test_union_find(self):
+        """ Merge and look up disjoint sets of ids """
+        uf = UnionFind()
+        for x in [0, 1, 2, 3, 5]:
+            uf.add(x)
+
+        self.assertEqual(uf.num_sets, 5)
+        self.assertTrue(5 in uf)
+        self.assertFalse(4 in uf)
+        self.assertFalse(9 in uf)
+        self.assertTrue(uf.union(0, 1))
+        self.assertTrue(uf.union(2, 1))
+        self.assertFalse(uf.union(0, 2))
+        self.assertEqual(uf.num_sets, 3)
+        self.assertEqual(uf.find(0), uf.find(2))
+        self.assertNotEqual(uf.find(0), uf.find(3))
+        self.assertEqual(uf.set_size(1), 3)
+        self.assertEqual(uf.set_size(5), 1)
+
+        uf.remove(5)
+        self.assertFalse(5 in uf)
+        self.assertEqual(uf.num_sets, 2)
+        uf.add(5)
+        self.assertEqual(uf.num_sets, 3)
+        with self.assertRaises(ValueError):
+            uf.add(0)
+        with self.assertRaises(ValueError):
+            uf.remove(0)
+        with self.assertRaises(ValueError):
+            uf.remove(4)
 
 ################################################################################
 #                                                                              #
@@ -113,5 +204,135 @@ class TestPriorityQueue(unittest.TestCase):
             pq.decrease_key('E', 7)
 
 
+class TestAlternativePriorityQueues(unittest.TestCase):
+
+    QUEUES = [HeapqPriorityQueue, PairingPriorityQueue, RadixPriorityQueue,
+              functools.partial(BucketPriorityQueue, max_span=1000)]
+
+    def test_alternative_priority_queues(self):
+        """ Use each alternative priority queue the same way as a
+            PriorityQueue """
+        for queue_cls in self.QUEUES:
+            pq = queue_cls(data=[(5, 'E'), (2, 'B'), (4, 'D')])
+            empty_pq = queue_cls()
+
+            self.assertEqual(len(pq), 3)
+            self.assertTrue('B' in pq)
+            self.assertEqual(pq['D'], (4, 'D'))
+            self.assertEqual(pq.find_min(), (2, 'B'))
+            self.assertEqual(pq.pop_min(), (2, 'B'))
+            self.assertFalse('B' in pq)
+
+            pq.insert('C', 3)
+            pq.decrease_key('E', 3)
+            pq.decrease_key('D', 4)
+
+            self.assertEqual(len(pq), 3)
+            self.assertEqual(pq['E'], (3, 'E'))
+            self.assertEqual(sorted([pq.pop_min(), pq.pop_min()]),
+                             [(3, 'C'), (3, 'E')])
+            self.assertEqual(pq.pop_min(), (4, 'D'))
+            self.assertEqual(len(pq), 0)
+            with self.assertRaises(IndexError):
+                pq.pop_min()
+            with self.assertRaises(IndexError):
+                empty_pq.find_min()
+
+            pq.insert('A', 6)
+            with self.assertRaises(ValueError):
+                pq.insert('A', 7)
+            with self.assertRaises(KeyError):
+                pq.decrease_key('F', 3)
+            with self.assertRaises(ValueError):
+                pq.decrease_key('A', 7)
+            with self.assertRaises(ValueError):
+                queue_cls(data=[(1, 'A'), (2, 'A')])
+
+    def test_alternative_priority_queues_match_priority_queue(self):
+        """ Pop items in the same order from each alternative priority queue
+            as from a PriorityQueue, through random inserts, decreases, and
+            pops """
+        rng = random.Random(0)
+        ops = []
+        for i in xrange(2000):
+            ops.append((rng.choice(['insert', 'decrease_key', 'pop_min']), i,
+                        rng.randint(0, 1000)))
+
+        def run(queue_cls):
+            pq = queue_cls()
+            popped = []
+            floor = 0
+            for op, item, priority in ops:
+                # keep priorities monotone, as RadixPriorityQueue requires
+                if op == 'insert':
+                    pq.insert(item, floor + priority)
+                elif op == 'decrease_key' and len(pq):
+                    current_priority, target = pq.find_min()
+                    for _ in xrange(3):
+                        target = (target * 7 + priority) % len(ops)
+                        if target in pq:
+                            current_priority, _ = pq[target]
+                            break
+                    else:
+                        continue
+                    pq.decrease_key(target, max(floor, current_priority -
+                                                       priority))
+                elif op == 'pop_min' and len(pq):
+                    floor, popped_item = pq.pop_min()
+                    popped.append(floor)
+            while len(pq):
+                popped.append(pq.pop_min()[0])
+            return popped
+
+        expected = run(PriorityQueue)
+        self.assertTrue(len(expected) > 500)
+        for queue_cls in self.QUEUES:
+            self.assertEqual(run(queue_cls), expected)
+
+    def test_radix_priority_queue_is_monotone(self):
+        """ Reject priorities below the last popped, or that aren't integers,
+            from a radix priority queue """
+        pq = RadixPriorityQueue(data=[(5, 'E'), (2, 'B')])
+        pq.insert('C', 3.0)
+        pq.pop_min()
+
+        self.assertEqual(pq.pop_min(), (3.0, 'C'))
+        with self.assertRaises(ValueError):
+            pq.insert('A', 1)
+        with self.assertRaises(ValueError):
+            pq.decrease_key('E', 2)
+        with self.assertRaises(ValueError):
+            pq.insert('F', 4.5)
+        pq.insert('D', 3)
+        self.assertEqual(pq.pop_min(), (3, 'D'))
+        self.assertEqual(pq.pop_min(), (5, 'E'))
+
+
+    def test_bucket_priority_queue_spans_max_span(self):
+        """ Reject priorities more than max_span past the last popped, below
+            it, or that aren't integers, from a bucket priority queue """
+        pq = BucketPriorityQueue(data=[(5, 'E'), (2, 'B')], max_span=5)
+        pq.insert('C', 3.0)
+        pq.pop_min()
+
+        self.assertEqual(pq.find_min(), (3.0, 'C'))
+        self.assertEqual(pq.pop_min(), (3.0, 'C'))
+        with self.assertRaises(ValueError):
+            pq.insert('A', 1)
+        with self.assertRaises(ValueError):
+            pq.insert('F', 9)
+        with self.assertRaises(ValueError):
+            pq.insert('F', 4.5)
+        pq.insert('F', 8)
+        pq.decrease_key('E', 4)
+        self.assertEqual(pq.pop_min(), (4, 'E'))
+        self.assertEqual(pq.pop_min(), (8, 'F'))
+        pq.insert('G', 13)
+        self.assertEqual(pq.pop_min(), (13, 'G'))
+        with self.assertRaises(IndexError):
+            pq.pop_min()
+        with self.assertRaises(ValueError):
+            BucketPriorityQueue()
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,46 @@
+"""
+Tests for heuristics.py
+"""
+
+
+from graphpy.vertex import UndirectedVertex
+from graphpy.heuristics import *
+
+import unittest
+
+
+class TestHeuristics(unittest.TestCase):
+
+    def test_euclidean(self):
+        """ Estimate distances between vertices as straight lines """
+        v0 = UndirectedVertex(val='v0', attrs={'x': 0, 'y': 0, 'col': 1})
+        v1 = UndirectedVertex(val='v1', attrs={'x': 3, 'y': 4, 'col': 4})
+
+        self.assertEqual(euclidean()(v0, v1), 5)
+        self.assertEqual(euclidean()(v1, v0), 5)
+        self.assertEqual(euclidean()(v0, v0), 0)
+        self.assertEqual(euclidean(scale=2)(v0, v1), 10)
+        self.assertEqual(euclidean(x_attr='col')(v0, v1), 5)
+
+    def test_haversine(self):
+        """ Estimate distances between vertices as great circles """
+        paris = UndirectedVertex(val='Paris',
+                                 attrs={'lat': 48.8566, 'lon': 2.3522})
+        london = UndirectedVertex(val='London',
+                                  attrs={'lat': 51.5074, 'lon': -0.1278})
+        north_pole = UndirectedVertex(val='North Pole',
+                                      attrs={'latitude': 90, 'longitude': 0})
+        south_pole = UndirectedVertex(val='South Pole',
+                                      attrs={'latitude': -90, 'longitude': 0})
+
+        self.assertAlmostEqual(haversine()(paris, london), 343.5, places=0)
+        self.assertAlmostEqual(haversine()(london, paris),
+                               haversine()(paris, london))
+        self.assertEqual(haversine()(paris, paris), 0)
+        self.assertAlmostEqual(
+            haversine(lat_attr='latitude', lon_attr='longitude',
+                      radius=1)(north_pole, south_pole), 3.14159, places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
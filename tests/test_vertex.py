@@ -25,6 +25,12 @@ class TestUndirectedVertex(unittest.TestCase):
         self.assertEqual(v0.val, 'v0')
         self.assertEqual(set(v0.edges), set())
 
+    def test_create_undirected_vertex_with_falsy_val(self):
+        """ Create a undirected vertex whose val is falsy but not None """
+        v0 = UndirectedVertex(val=0)
+
+        self.assertEqual(v0.val, 0)
+
     def test_undirected_vertex_val(self):
         """ Get an undirected vertex's val property """
         v0 = UndirectedVertex(val='v0')
@@ -104,6 +110,49 @@ class TestUndirectedVertex(unittest.TestCase):
         self.assertEqual(set(v0.neighbors), set([v0, v1, v2]))
         self.assertEqual(v0.degree, 4)
 
+    def test_undirected_vertex_neighbors_with_edges_and_weights(self):
+        """ Get undirected vertices' neighbors along with the edges to them or
+            those edges' weights """
+        v0 = UndirectedVertex(val='v0')
+        v1 = UndirectedVertex(val='v1')
+        v2 = UndirectedVertex(val='v2')
+        e00 = UndirectedEdge((v0, v0), attrs={'weight': 1})
+        e01 = UndirectedEdge((v0, v1), attrs={'weight': 2})
+        e02 = UndirectedEdge((v0, v2))
+        v0.add_edge(e00)
+        v0.add_edge(e01)
+        v0.add_edge(e02)
+        v1.add_edge(e01)
+
+        self.assertEqual(set(v0.neighbors_with_edges),
+                         set([(v0, e00), (v1, e01), (v2, e02)]))
+        self.assertEqual(set(v0.neighbors_with_weights),
+                         set([(v0, 1), (v1, 2), (v2, None)]))
+        self.assertEqual(list(v1.neighbors_with_weights), [(v0, 2)])
+
+    def test_undirected_vertex_neighbors_after_remove_edge(self):
+        """ Undirected vertices' neighbors and degree properties stay up to
+            date as edges, including self edges, are removed """
+        v0 = UndirectedVertex(val='v0')
+        v1 = UndirectedVertex(val='v1')
+        e00 = UndirectedEdge((v0, v0))
+        e01 = UndirectedEdge((v0, v1))
+        v0.add_edge(e00)
+        v0.add_edge(e01)
+        v1.add_edge(e01)
+
+        v0.remove_edge(e00)
+
+        self.assertEqual(set(v0.neighbors), set([v1]))
+        self.assertEqual(v0.degree, 1)
+        self.assertEqual(set(v0.edges), set([e01]))
+
+        v0.remove_edge(UndirectedEdge((v1, v0)))
+
+        self.assertEqual(set(v0.neighbors), set())
+        self.assertEqual(v0.degree, 0)
+        self.assertEqual(set(v1.neighbors), set([v0]))
+
     def test_undirected_vertex_add_edge(self):
         """ Add an edge to an undirected vertex """
         v0 = UndirectedVertex(val='v0')
@@ -144,6 +193,19 @@ class TestUndirectedVertex(unittest.TestCase):
         self.assertFalse(e10 in v0)
         self.assertFalse(e02 in v0)
 
+    def test_undirected_vertex_compact_layout(self):
+        """ An undirected vertex has no instance dict, and only allocates an
+            attrs dict once it is needed """
+        v0 = UndirectedVertex(val='v0')
+
+        self.assertFalse(hasattr(v0, '__dict__'))
+        self.assertIsNone(v0.get('city'))
+        self.assertFalse(v0.has_attr('city'))
+
+        v0.set('city', 'Modena')
+
+        self.assertEqual(v0.get('city'), 'Modena')
+
     def test_undirected_vertex_get(self):
         """ Get an attribute of an undirected vertex """
         v0 = UndirectedVertex(val='v0', attrs={'city': 'Modena'})
@@ -230,6 +292,12 @@ class TestDirectedVertex(unittest.TestCase):
         self.assertEqual(v0.val, 'v0')
         self.assertEqual(set(v0.edges), set())
 
+    def test_create_directed_vertex_with_falsy_val(self):
+        """ Create a directed vertex whose val is falsy but not None """
+        v0 = DirectedVertex(val=0)
+
+        self.assertEqual(v0.val, 0)
+
     def test_directed_vertex_val(self):
         """ Get a directed vertex's val property """
         v0 = DirectedVertex(val='v0')
@@ -279,6 +347,50 @@ class TestDirectedVertex(unittest.TestCase):
         self.assertEqual(v0.in_degree, 2)
         self.assertEqual(v0.degree, 5)
 
+    def test_directed_vertex_outs_and_ins_with_edges_and_weights(self):
+        """ Get directed vertices' outs and ins along with the edges to or from
+            them or those edges' weights """
+        v0 = DirectedVertex(val='v0')
+        v1 = DirectedVertex(val='v1')
+        v2 = DirectedVertex(val='v2')
+        e00 = DirectedEdge((v0, v0), attrs={'weight': 1})
+        e01 = DirectedEdge((v0, v1), attrs={'weight': 2})
+        e20 = DirectedEdge((v2, v0), attrs={'weight': 3})
+        v0.add_edge(e00)
+        v0.add_edge(e01)
+        v0.add_edge(e20)
+
+        self.assertEqual(set(v0.outs_with_edges), set([(v0, e00), (v1, e01)]))
+        self.assertEqual(set(v0.ins_with_edges), set([(v0, e00), (v2, e20)]))
+        self.assertEqual(set(v0.outs_with_weights), set([(v0, 1), (v1, 2)]))
+        self.assertEqual(set(v0.ins_with_weights), set([(v0, 1), (v2, 3)]))
+
+    def test_directed_vertex_outs_and_ins_after_remove_edge(self):
+        """ Directed vertices' outs, ins, and degrees stay up to date as edges,
+            including self edges, are removed """
+        v0 = DirectedVertex(val='v0')
+        v1 = DirectedVertex(val='v1')
+        e00 = DirectedEdge((v0, v0))
+        e01 = DirectedEdge((v0, v1))
+        e10 = DirectedEdge((v1, v0))
+        v0.add_edge(e00)
+        v0.add_edge(e01)
+        v0.add_edge(e10)
+
+        v0.remove_edge(e00)
+
+        self.assertEqual(set(v0.outs), set([v1]))
+        self.assertEqual(set(v0.ins), set([v1]))
+        self.assertEqual(v0.degree, 2)
+        self.assertEqual(set(v0.edges), set([e01, e10]))
+
+        v0.remove_edge(e10)
+
+        self.assertEqual(set(v0.outs), set([v1]))
+        self.assertEqual(set(v0.ins), set())
+        self.assertEqual(v0.out_degree, 1)
+        self.assertEqual(v0.in_degree, 0)
+
     def test_directed_vertex_add_edge(self):
         """ Add an edge to a directed vertex """
         v0 = DirectedVertex(val='v0')
@@ -0,0 +1,172 @@
+"""
+Tests for views.py
+"""
+
+
+from graphpy.edge import UndirectedEdge, DirectedEdge
+from graphpy.vertex import UndirectedVertex, DirectedVertex
+from graphpy.views import *
+
+import unittest
+
+
+def _connect(v_from, v_to, weight=None):
+    e = DirectedEdge((v_from, v_to),
+                     attrs={'weight': weight} if weight is not None else None)
+    v_from.add_edge(e)
+    if v_to != v_from:
+        v_to.add_edge(e)
+    return e
+
+
+################################################################################
+#                                                                              #
+#                                   Reversed                                   #
+#                                                                              #
+################################################################################
+
+
+class TestReversedViews(unittest.TestCase):
+
+    def test_reversed_vertex_view(self):
+        """ See a directed vertex with its edges reversed """
+        v0 = DirectedVertex(val='v0', attrs={'color': 'red'})
+        v1 = DirectedVertex(val='v1')
+        v2 = DirectedVertex(val='v2')
+        _connect(v0, v1, weight=1)
+        _connect(v2, v0, weight=2)
+        rv0 = ReversedVertexView(v0)
+
+        self.assertEqual(rv0.val, 'v0')
+        self.assertEqual(rv0.get('color'), 'red')
+        self.assertEqual(rv0, ReversedVertexView(v0))
+        self.assertNotEqual(rv0, v0)
+        self.assertEqual(len(set([rv0, ReversedVertexView(v0)])), 1)
+        self.assertEqual(set(v.val for v in rv0.outs), set(['v2']))
+        self.assertEqual(set(v.val for v in rv0.ins), set(['v1']))
+        self.assertEqual(set((v.val, w) for v, w in rv0.outs_with_weights),
+                         set([('v2', 2)]))
+        self.assertEqual(set((v.val, w) for v, w in rv0.ins_with_weights),
+                         set([('v1', 1)]))
+        self.assertEqual((rv0.out_degree, rv0.in_degree, rv0.degree),
+                         (1, 1, 2))
+
+    def test_reversed_edge_view(self):
+        """ See a directed edge pointing the other way """
+        v0 = DirectedVertex(val='v0')
+        v1 = DirectedVertex(val='v1')
+        re01 = ReversedEdgeView(_connect(v0, v1, weight=3))
+
+        self.assertEqual((re01.v_from.val, re01.v_to.val), ('v1', 'v0'))
+        self.assertEqual(re01.get('weight'), 3)
+        self.assertTrue(re01.has_valid_weight)
+        self.assertEqual(str(re01), "E(V(v1), V(v0))")
+        self.assertEqual(list(ReversedVertexView(v1).outs_with_edges),
+                         [(ReversedVertexView(v0), re01)])
+
+
+################################################################################
+#                                                                              #
+#                                  Undirected                                  #
+#                                                                              #
+################################################################################
+
+
+class TestUndirectedViews(unittest.TestCase):
+
+    def test_undirected_vertex_view(self):
+        """ See a directed vertex as undirected """
+        v0 = DirectedVertex(val='v0')
+        v1 = DirectedVertex(val='v1')
+        v2 = DirectedVertex(val='v2')
+        _connect(v0, v0, weight=1)
+        _connect(v0, v1, weight=5)
+        _connect(v1, v0, weight=2)
+        _connect(v2, v0, weight=4)
+        uv0 = UndirectedVertexView(v0)
+
+        self.assertEqual(sorted(v.val for v in uv0.neighbors),
+                         ['v0', 'v1', 'v2'])
+        self.assertEqual(sorted((v.val, w) for v, w in
+                                uv0.neighbors_with_weights),
+                         [('v0', 1), ('v1', 2), ('v2', 4)])
+        self.assertEqual(uv0.degree, 4)
+        self.assertTrue(uv0.has_self_edge)
+        self.assertFalse(UndirectedVertexView(v2).has_self_edge)
+        self.assertEqual(UndirectedVertexView(v1).degree, 1)
+
+    def test_undirected_edge_view(self):
+        """ See a directed edge as undirected """
+        v0 = DirectedVertex(val='v0')
+        v1 = DirectedVertex(val='v1')
+        ue01 = UndirectedEdgeView(_connect(v0, v1, weight=3))
+        ue10 = UndirectedEdgeView(_connect(v1, v0, weight=3))
+
+        self.assertEqual(set(v.val for v in ue01.vertices), set(['v0', 'v1']))
+        self.assertEqual(ue01, ue10)
+        self.assertEqual(hash(ue01), hash(ue10))
+        self.assertFalse(ue01.is_self_edge)
+        self.assertEqual(ue01.get('weight'), 3)
+
+
+################################################################################
+#                                                                              #
+#                                   Subgraph                                   #
+#                                                                              #
+################################################################################
+
+
+class TestSubgraphViews(unittest.TestCase):
+
+    def test_subgraph_undirected_vertex_view(self):
+        """ See an undirected vertex without the neighbors and edges that
+            fail some filters """
+        v0 = UndirectedVertex(val='v0')
+        v1 = UndirectedVertex(val='v1')
+        v2 = UndirectedVertex(val='v2')
+        e00 = UndirectedEdge((v0, v0), attrs={'weight': 1})
+        e01 = UndirectedEdge((v0, v1), attrs={'weight': 2})
+        e02 = UndirectedEdge((v0, v2), attrs={'weight': 3})
+        for e in [e00, e01, e02]:
+            for v in set(e.endpoints):
+                v.add_edge(e)
+        keep_vertex = lambda v: v.val != 'v2'
+        keep_edge = lambda e: e.get('weight') > 1
+        sv0 = SubgraphUndirectedVertexView(v0, keep_vertex, keep_edge)
+
+        self.assertEqual([v.val for v in sv0.neighbors], ['v1'])
+        self.assertEqual([(v.val, w) for v, w in sv0.neighbors_with_weights],
+                         [('v1', 2)])
+        self.assertEqual(sv0.degree, 1)
+        self.assertFalse(sv0.has_self_edge)
+        self.assertEqual(list(sv0.edges),
+                         [SubgraphUndirectedEdgeView(e01, keep_vertex,
+                                                     keep_edge)])
+        sv1 = next(sv0.neighbors)
+        self.assertEqual([v.val for v in sv1.neighbors], ['v0'])
+
+    def test_subgraph_directed_vertex_view(self):
+        """ See a directed vertex without the outs, ins, and edges that fail
+            some filters """
+        v0 = DirectedVertex(val='v0')
+        v1 = DirectedVertex(val='v1')
+        v2 = DirectedVertex(val='v2')
+        _connect(v0, v0, weight=1)
+        _connect(v0, v1, weight=2)
+        _connect(v1, v0, weight=1)
+        _connect(v2, v0, weight=3)
+        keep_vertex = lambda v: v.val != 'v2'
+        keep_edge = lambda e: e.get('weight') < 3
+        sv0 = SubgraphDirectedVertexView(v0, keep_vertex, keep_edge)
+
+        self.assertEqual(set(v.val for v in sv0.outs), set(['v0', 'v1']))
+        self.assertEqual(set(v.val for v in sv0.ins), set(['v0', 'v1']))
+        self.assertEqual((sv0.out_degree, sv0.in_degree, sv0.degree),
+                         (2, 2, 4))
+        self.assertEqual(len(list(sv0.edges)), 3)
+        e01 = next(e for out, e in sv0.outs_with_edges if out.val == 'v1')
+        self.assertEqual((e01.v_from, e01.v_to.val), (sv0, 'v1'))
+
+
+if __name__ == '__main__':
+    unittest.main()